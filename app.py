@@ -1,4 +1,5 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
 import plotly.express as px
@@ -13,13 +14,7 @@ from datetime import datetime, timedelta
 import json
 import re
 from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-# import spacy  # Removed for Streamlit Cloud compatibility
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.decomposition import LatentDirichletAllocation
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 import warnings
 warnings.filterwarnings('ignore')
 import requests
@@ -282,39 +277,25 @@ def get_live_career_insights():
 from counselor_core import (
     Base, engine, SessionLocal, User, Career, Skill, MarketTrend, 
     create_user_account, verify_user_credentials, get_career_data,
-    get_skill_data, recommend_careers_by_text, recommend_cf_for_user,
-    get_random_cf_recommendations, career_trend_timeseries, seed_sample_data
+    get_skill_data, get_random_cf_recommendations, career_trend_timeseries, init_db, warm_up,
+    best_covered_careers
 )
+from career_knowledge import (
+    COMPREHENSIVE_CAREER_KNOWLEDGE, analyze_career_match, get_personalized_career_insights,
+    get_career_recommendations_from_quiz, career_field_key, field_skill_set,
+    CAREER_ASSESSMENT_QUESTIONS, process_quiz_results
+)
+from skill_extraction import extract_skills_from_text
+# Recommenders run on the shared worker pool
+from recommendation_service import (
+    recommend_careers_by_text, recommend_cf_for_user, rank_careers, score_quiz, ServiceBusy
+)
+from interaction_log import log_interaction
+from credential_service import CredentialServiceBusy
+from session_store import SESSION_TTL_SECONDS, create_session, get_session_store, resolve_session, revoke_session
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-# Initialize NLTK components (replacing spaCy)
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('omw-1.4', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-    nltk.download('maxent_ne_chunker', quiet=True)
-    nltk.download('words', quiet=True)
-except:
-    pass
-
-# Initialize NLTK components
-from nltk.stem import WordNetLemmatizer
-from nltk.chunk import ne_chunk
-from nltk.tag import pos_tag
-
-lemmatizer = WordNetLemmatizer()
+# Browser cookie holding the login session token
+SESSION_COOKIE = 'dw_session'
 
 # Page configuration
 st.set_page_config(
@@ -376,6 +357,13 @@ if 'is_authenticated' not in st.session_state:
     st.session_state.is_authenticated = False
 if 'current_user_id' not in st.session_state:
     st.session_state.current_user_id = None
+if 'current_user_name' not in st.session_state:
+    st.session_state.current_user_name = None
+if 'session_token' not in st.session_state:
+    # Token of the browser's session cookie, read once per connection
+    st.session_state.session_token = st.context.cookies.get(SESSION_COOKIE)
+if 'session_cookie_pending' not in st.session_state:
+    st.session_state.session_cookie_pending = False
 if 'quiz_answers' not in st.session_state:
     st.session_state.quiz_answers = []
 if 'current_question' not in st.session_state:
@@ -386,425 +374,22 @@ if 'user_skills' not in st.session_state:
     st.session_state.user_skills = []
 if 'user_personality' not in st.session_state:
     st.session_state.user_personality = []
+if 'quiz_insights' not in st.session_state:
+    st.session_state.quiz_insights = None
+if 'viewed_careers' not in st.session_state:
+    st.session_state.viewed_careers = set()
 
-# Quiz questions and logic
-CAREER_ASSESSMENT_QUESTIONS = [
-    {
-        "question": "What type of work environment do you prefer?",
-        "options": ["Team collaboration", "Independent work", "Leadership role", "Creative freedom"],
-        "category": "work_style"
-    },
-    {
-        "question": "Which of these activities interests you most?",
-        "options": ["Solving complex problems", "Helping others", "Creating new things", "Analyzing data"],
-        "category": "interests"
-    },
-    {
-        "question": "What's your preferred learning method?",
-        "options": ["Hands-on experience", "Reading and research", "Visual learning", "Group discussions"],
-        "category": "learning_style"
-    },
-    {
-        "question": "How do you handle stress and deadlines?",
-        "options": ["Plan ahead and organize", "Work under pressure", "Adapt and adjust", "Seek support"],
-        "category": "stress_management"
-    },
-    {
-        "question": "What motivates you most in a job?",
-        "options": ["Financial rewards", "Making a difference", "Personal growth", "Recognition"],
-        "category": "motivation"
-    },
-    {
-        "question": "What type of problems do you enjoy solving?",
-        "options": ["Technical/Mathematical", "Human/Emotional", "Creative/Artistic", "Strategic/Business"],
-        "category": "problem_solving"
-    },
-    {
-        "question": "How do you prefer to communicate?",
-        "options": ["Written communication", "Verbal presentations", "Visual demonstrations", "One-on-one discussions"],
-        "category": "communication_style"
-    },
-    {
-        "question": "What's your approach to new challenges?",
-        "options": ["Research and plan thoroughly", "Jump in and learn by doing", "Seek expert advice", "Collaborate with others"],
-        "category": "challenge_approach"
-    },
-    {
-        "question": "What role do you typically take in group projects?",
-        "options": ["Leader/Coordinator", "Creative contributor", "Technical specialist", "Support/Helper"],
-        "category": "team_role"
-    },
-    {
-        "question": "How do you measure success?",
-        "options": ["Achieving goals and targets", "Helping others succeed", "Learning new skills", "Recognition from peers"],
-        "category": "success_measure"
-    },
-    {
-        "question": "What type of work schedule do you prefer?",
-        "options": ["Regular 9-5 schedule", "Flexible hours", "Project-based deadlines", "Shift work"],
-        "category": "work_schedule"
-    },
-    {
-        "question": "How do you stay updated in your field?",
-        "options": ["Reading industry publications", "Attending conferences", "Online courses", "Networking with professionals"],
-        "category": "learning_approach"
-    }
-]
-
-def process_quiz_results(answers):
-    """Process quiz answers and extract skills/personality traits"""
-    skills = []
-    personality = []
-    
-    for answer in answers:
-        if answer['category'] == 'work_style':
-            if answer['answer'] == 'Team collaboration':
-                skills.extend(['communication', 'teamwork', 'collaboration'])
-            elif answer['answer'] == 'Independent work':
-                skills.extend(['self-motivation', 'time management', 'autonomy'])
-            elif answer['answer'] == 'Leadership role':
-                skills.extend(['leadership', 'decision making', 'mentoring'])
-            elif answer['answer'] == 'Creative freedom':
-                skills.extend(['creativity', 'innovation', 'problem solving'])
-        
-        elif answer['category'] == 'interests':
-            if answer['answer'] == 'Solving complex problems':
-                skills.extend(['analytical thinking', 'problem solving', 'critical thinking'])
-            elif answer['answer'] == 'Helping others':
-                skills.extend(['empathy', 'communication', 'interpersonal skills'])
-            elif answer['answer'] == 'Creating new things':
-                skills.extend(['creativity', 'innovation', 'design thinking'])
-            elif answer['answer'] == 'Analyzing data':
-                skills.extend(['data analysis', 'statistics', 'research'])
-        
-        elif answer['category'] == 'learning_style':
-            if answer['answer'] == 'Hands-on experience':
-                skills.extend(['practical skills', 'experimentation', 'learning by doing'])
-            elif answer['answer'] == 'Reading and research':
-                skills.extend(['research skills', 'information literacy', 'critical reading'])
-            elif answer['answer'] == 'Visual learning':
-                skills.extend(['visual thinking', 'design skills', 'spatial awareness'])
-            elif answer['answer'] == 'Group discussions':
-                skills.extend(['communication', 'active listening', 'group facilitation'])
-        
-        elif answer['category'] == 'stress_management':
-            if answer['answer'] == 'Plan ahead and organize':
-                skills.extend(['planning', 'organization', 'time management'])
-            elif answer['answer'] == 'Work under pressure':
-                skills.extend(['stress management', 'adaptability', 'resilience'])
-            elif answer['answer'] == 'Adapt and adjust':
-                skills.extend(['flexibility', 'adaptability', 'change management'])
-            elif answer['answer'] == 'Seek support':
-                skills.extend(['communication', 'collaboration', 'emotional intelligence'])
-        
-        elif answer['category'] == 'motivation':
-            if answer['answer'] == 'Financial rewards':
-                personality.extend(['goal-oriented', 'results-driven', 'achievement-focused'])
-            elif answer['answer'] == 'Making a difference':
-                personality.extend(['altruistic', 'purpose-driven', 'socially conscious'])
-            elif answer['answer'] == 'Personal growth':
-                personality.extend(['growth mindset', 'continuous learning', 'self-improvement'])
-            elif answer['answer'] == 'Recognition':
-                personality.extend(['achievement-oriented', 'recognition-seeking', 'performance-driven'])
-        
-        elif answer['category'] == 'problem_solving':
-            if answer['answer'] == 'Technical/Mathematical':
-                skills.extend(['analytical thinking', 'mathematical skills', 'technical problem solving', 'logical reasoning'])
-            elif answer['answer'] == 'Human/Emotional':
-                skills.extend(['emotional intelligence', 'empathy', 'interpersonal skills', 'conflict resolution'])
-            elif answer['answer'] == 'Creative/Artistic':
-                skills.extend(['creative thinking', 'artistic skills', 'innovation', 'design thinking'])
-            elif answer['answer'] == 'Strategic/Business':
-                skills.extend(['strategic thinking', 'business acumen', 'market analysis', 'competitive intelligence'])
-        
-        elif answer['category'] == 'communication_style':
-            if answer['answer'] == 'Written communication':
-                skills.extend(['writing skills', 'documentation', 'report writing', 'email communication'])
-            elif answer['answer'] == 'Verbal presentations':
-                skills.extend(['public speaking', 'presentation skills', 'verbal communication', 'persuasion'])
-            elif answer['answer'] == 'Visual demonstrations':
-                skills.extend(['visual communication', 'presentation design', 'demonstration skills', 'visual storytelling'])
-            elif answer['answer'] == 'One-on-one discussions':
-                skills.extend(['active listening', 'interpersonal communication', 'mentoring', 'coaching'])
-        
-        elif answer['category'] == 'challenge_approach':
-            if answer['answer'] == 'Research and plan thoroughly':
-                skills.extend(['research skills', 'planning', 'analysis', 'methodical approach'])
-            elif answer['answer'] == 'Jump in and learn by doing':
-                skills.extend(['adaptability', 'hands-on learning', 'experimentation', 'risk-taking'])
-            elif answer['answer'] == 'Seek expert advice':
-                skills.extend(['networking', 'mentorship seeking', 'collaboration', 'learning from others'])
-            elif answer['answer'] == 'Collaborate with others':
-                skills.extend(['teamwork', 'collaboration', 'facilitation', 'group dynamics'])
-        
-        elif answer['category'] == 'team_role':
-            if answer['answer'] == 'Leader/Coordinator':
-                skills.extend(['leadership', 'project coordination', 'team management', 'decision making'])
-            elif answer['answer'] == 'Creative contributor':
-                skills.extend(['creativity', 'innovation', 'idea generation', 'artistic skills'])
-            elif answer['answer'] == 'Technical specialist':
-                skills.extend(['technical expertise', 'specialized knowledge', 'problem solving', 'analytical skills'])
-            elif answer['answer'] == 'Support/Helper':
-                skills.extend(['support skills', 'helping others', 'patience', 'service orientation'])
-        
-        elif answer['category'] == 'success_measure':
-            if answer['answer'] == 'Achieving goals and targets':
-                personality.extend(['goal-oriented', 'results-driven', 'achievement-focused', 'performance-oriented'])
-            elif answer['answer'] == 'Helping others succeed':
-                personality.extend(['altruistic', 'supportive', 'mentoring', 'team-oriented'])
-            elif answer['answer'] == 'Learning new skills':
-                personality.extend(['growth mindset', 'continuous learning', 'curious', 'self-improvement'])
-            elif answer['answer'] == 'Recognition from peers':
-                personality.extend(['recognition-seeking', 'social validation', 'peer appreciation', 'team recognition'])
-        
-        elif answer['category'] == 'work_schedule':
-            if answer['answer'] == 'Regular 9-5 schedule':
-                personality.extend(['structured', 'routine-oriented', 'time-conscious', 'organized'])
-            elif answer['answer'] == 'Flexible hours':
-                personality.extend(['flexible', 'autonomous', 'self-managing', 'adaptable'])
-            elif answer['answer'] == 'Project-based deadlines':
-                personality.extend(['deadline-oriented', 'project-focused', 'time management', 'goal-driven'])
-            elif answer['answer'] == 'Shift work':
-                personality.extend(['adaptable', 'flexible', 'resilient', 'schedule-flexible'])
-        
-        elif answer['category'] == 'learning_approach':
-            if answer['answer'] == 'Reading industry publications':
-                skills.extend(['research skills', 'information literacy', 'staying current', 'analytical reading'])
-            elif answer['answer'] == 'Attending conferences':
-                skills.extend(['networking', 'professional development', 'industry knowledge', 'presentation skills'])
-            elif answer['answer'] == 'Online courses':
-                skills.extend(['e-learning', 'self-directed learning', 'digital literacy', 'continuous education'])
-            elif answer['answer'] == 'Networking with professionals':
-                skills.extend(['networking', 'relationship building', 'professional communication', 'industry connections'])
-    
-    return list(set(skills)), list(set(personality))
-
-# Enhanced Career Knowledge Base for Intelligent Offline Analysis
-COMPREHENSIVE_CAREER_KNOWLEDGE = {
-    "technology": {
-        "skills": ["programming", "coding", "software", "computer", "digital", "technical", "analytical", "problem-solving", "logic", "mathematics", "data", "web", "mobile", "database", "cloud", "ai", "machine learning", "cybersecurity", "networking", "python", "java", "javascript", "sql", "html", "css", "react", "node.js", "docker", "kubernetes", "aws", "azure", "git", "agile", "scrum", "devops", "api", "rest", "graphql", "microservices", "blockchain", "iot", "robotics"],
-        "careers": [
-            {"name": "Software Engineer", "description": "Design, develop, and maintain software applications", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["Programming", "Problem Solving", "Software Design", "Testing", "Version Control"]},
-            {"name": "Data Scientist", "description": "Analyze complex data to help organizations make decisions", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Statistics", "Machine Learning", "Python/R", "Data Visualization", "SQL"]},
-            {"name": "Web Developer", "description": "Create and maintain websites and web applications", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["HTML/CSS", "JavaScript", "Frontend Frameworks", "Backend Development", "Database"]},
-            {"name": "AI Engineer", "description": "Develop artificial intelligence and machine learning systems", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 400,000+", "skills_required": ["Machine Learning", "Deep Learning", "Python", "Neural Networks", "AI Frameworks"]},
-            {"name": "Cybersecurity Analyst", "description": "Protect systems from cyber threats and attacks", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Security", "Networking", "Incident Response", "Risk Assessment", "Security Tools"]},
-            {"name": "DevOps Engineer", "description": "Bridge development and operations for efficient software delivery", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["CI/CD", "Cloud Platforms", "Automation", "Monitoring", "Infrastructure"]},
-            {"name": "Product Manager", "description": "Lead product strategy and development from concept to launch", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 90,000 - 350,000+", "skills_required": ["Product Strategy", "Market Research", "User Experience", "Agile", "Leadership"]},
-            {"name": "UX Designer", "description": "Create user-centered design solutions for digital products", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["User Research", "Wireframing", "Prototyping", "Visual Design", "User Testing"]},
-            {"name": "Cloud Architect", "description": "Design and implement cloud infrastructure solutions", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 120,000 - 400,000+", "skills_required": ["Cloud Platforms", "Architecture Design", "Networking", "Security", "Automation"]},
-            {"name": "Blockchain Developer", "description": "Build decentralized applications and smart contracts", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Blockchain", "Smart Contracts", "Cryptography", "Web3", "Solidity"]},
-            {"name": "Frontend Developer", "description": "Build user-facing web applications and interfaces", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 220,000+", "skills_required": ["HTML/CSS", "JavaScript", "React/Vue", "Responsive Design", "User Experience"]},
-            {"name": "Backend Developer", "description": "Develop server-side logic and database systems", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 65,000 - 250,000+", "skills_required": ["Python/Java/Node.js", "Databases", "APIs", "Server Architecture", "Security"]}
-        ],
-        "personality_traits": ["analytical", "logical", "detail-oriented", "problem-solver", "innovative", "curious", "patient", "systematic"],
-        "growth_areas": ["Artificial Intelligence", "Cloud Computing", "Cybersecurity", "Data Science", "Mobile Development", "Web Development", "DevOps", "Blockchain", "IoT", "Robotics"],
-        "salary_range": "PKR 50,000 - 200,000+",
-        "demand_level": "Very High",
-        "work_environment": "Office/Remote, Collaborative, Fast-paced",
-        "market_trends": [85, 88, 92, 95, 98, 96, 94, 97, 99, 96, 93, 95],
-        "growth_rate": "25% annually",
-        "emerging_technologies": ["AI/ML", "Edge Computing", "Quantum Computing", "5G", "AR/VR"]
-    },
-    "healthcare": {
-        "skills": ["medical", "health", "care", "patient", "clinical", "diagnostic", "treatment", "nursing", "pharmacy", "therapy", "rehabilitation", "research", "laboratory", "surgery", "emergency", "preventive", "wellness"],
-        "careers": [
-            {"name": "Medical Doctor", "description": "Diagnose and treat patients' illnesses and injuries", "experience": "5+ years (after medical school)", "salary": "PKR 150,000 - 500,000+", "skills_required": ["Medical Knowledge", "Patient Care", "Diagnosis", "Treatment Planning", "Communication"]},
-            {"name": "Nurse", "description": "Provide patient care and support in healthcare settings", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Patient Care", "Medical Procedures", "Communication", "Critical Thinking", "Compassion"]},
-            {"name": "Pharmacist", "description": "Dispense medications and provide pharmaceutical care", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Pharmacy", "Medication Management", "Patient Counseling", "Drug Interactions", "Regulatory Compliance"]},
-            {"name": "Physiotherapist", "description": "Help patients recover movement and manage pain", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 220,000+", "skills_required": ["Physical Therapy", "Patient Assessment", "Treatment Planning", "Exercise Prescription", "Manual Therapy"]},
-            {"name": "Medical Laboratory Technologist", "description": "Perform laboratory tests for disease diagnosis", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["Laboratory Techniques", "Medical Testing", "Quality Control", "Equipment Operation", "Safety Protocols"]},
-            {"name": "Radiologist", "description": "Interpret medical images for diagnosis", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 200,000 - 600,000+", "skills_required": ["Medical Imaging", "Diagnosis", "Radiology Equipment", "Patient Safety", "Medical Knowledge"]},
-            {"name": "Surgeon", "description": "Perform surgical procedures to treat conditions", "experience": "5+ years (after medical school + residency)", "salary": "PKR 300,000 - 800,000+", "skills_required": ["Surgical Skills", "Medical Knowledge", "Hand-Eye Coordination", "Decision Making", "Team Leadership"]},
-            {"name": "Dentist", "description": "Provide oral health care and dental treatments", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 350,000+", "skills_required": ["Dental Procedures", "Patient Care", "Dental Equipment", "Treatment Planning", "Communication"]},
-            {"name": "Psychologist", "description": "Help patients with mental health and behavioral issues", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Psychology", "Therapy", "Assessment", "Research", "Empathy"]},
-            {"name": "Healthcare Administrator", "description": "Manage healthcare facilities and operations", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Healthcare Management", "Operations", "Leadership", "Regulatory Compliance", "Financial Management"]}
-        ],
-        "personality_traits": ["empathetic", "caring", "patient", "detail-oriented", "responsible", "calm", "communicative", "team-oriented"],
-        "growth_areas": ["Telemedicine", "Preventive Healthcare", "Mental Health", "Geriatric Care", "Pediatric Care", "Emergency Medicine"],
-        "salary_range": "PKR 80,000 - 300,000+",
-        "demand_level": "Very High",
-        "work_environment": "Hospitals/Clinics, Shift work, High-stress",
-        "market_trends": [78, 82, 85, 88, 90, 92, 94, 92, 90, 88, 85, 82],
-        "growth_rate": "18% annually",
-        "emerging_technologies": ["Telemedicine", "AI Diagnostics", "Robotic Surgery", "Wearable Health Tech", "Precision Medicine"]
-    },
-    "business": {
-        "skills": ["management", "leadership", "strategy", "marketing", "sales", "finance", "accounting", "entrepreneurship", "communication", "negotiation", "planning", "organization", "analysis", "decision-making", "teamwork", "customer service", "excel", "powerpoint", "word", "project management", "risk management", "quality assurance", "supply chain", "logistics", "operations", "business development", "market research", "competitive analysis", "budgeting", "forecasting", "performance metrics", "kpi", "roi", "swot analysis"],
-        "careers": [
-            {"name": "Business Manager", "description": "Oversee business operations and lead teams", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Leadership", "Strategic Planning", "Operations Management", "Team Management", "Financial Acumen"]},
-            {"name": "Marketing Manager", "description": "Develop and execute marketing strategies", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Marketing Strategy", "Digital Marketing", "Brand Management", "Market Research", "Campaign Management"]},
-            {"name": "Sales Manager", "description": "Lead sales teams and drive revenue growth", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 75,000 - 280,000+", "skills_required": ["Sales Leadership", "Customer Relationship", "Team Management", "Sales Strategy", "Performance Metrics"]},
-            {"name": "Financial Analyst", "description": "Analyze financial data and provide insights", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Financial Analysis", "Excel", "Financial Modeling", "Accounting", "Data Analysis"]},
-            {"name": "Marketing Specialist", "description": "Plan and execute targeted marketing campaigns across channels", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["SEO/SEM", "Content Marketing", "Analytics", "Social Media", "Campaigns"]},
-            {"name": "Digital Marketing Specialist", "description": "Focus on online marketing channels and digital campaigns", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 220,000+", "skills_required": ["Digital Marketing", "SEO/SEM", "Social Media", "Email Marketing", "Analytics"]},
-            {"name": "Accountant", "description": "Manage financial records and ensure compliance", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["Accounting", "Financial Reporting", "Tax Preparation", "Compliance", "Attention to Detail"]},
-            {"name": "Entrepreneur", "description": "Start and grow new business ventures", "experience": "Varies", "salary": "Variable (can be very high)", "skills_required": ["Business Planning", "Risk Taking", "Innovation", "Leadership", "Financial Management"]},
-            {"name": "Business Consultant", "description": "Provide expert advice to improve business performance", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 400,000+", "skills_required": ["Business Strategy", "Problem Solving", "Communication", "Industry Knowledge", "Analytical Thinking"]},
-            {"name": "HR Manager", "description": "Manage human resources and employee relations", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["HR Management", "Employee Relations", "Recruitment", "Compliance", "Communication"]},
-            {"name": "Operations Manager", "description": "Optimize business processes and efficiency", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 75,000 - 280,000+", "skills_required": ["Operations Management", "Process Improvement", "Supply Chain", "Quality Control", "Leadership"]},
-            {"name": "Project Manager", "description": "Lead projects from initiation to completion", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Project Management", "Leadership", "Risk Management", "Communication", "Planning"]}
-        ],
-        "personality_traits": ["leadership", "communicative", "strategic", "organized", "results-driven", "confident", "adaptable", "team-oriented"],
-        "growth_areas": ["Digital Marketing", "E-commerce", "Fintech", "Consulting", "Startups", "International Business", "Business Intelligence", "Process Automation", "Sustainability"],
-        "salary_range": "PKR 60,000 - 250,000+",
-        "demand_level": "High",
-        "work_environment": "Office/Corporate, Client-facing, Performance-driven",
-        "market_trends": [72, 75, 78, 80, 82, 85, 88, 85, 82, 80, 78, 75],
-        "growth_rate": "15% annually",
-        "emerging_technologies": ["Business Intelligence", "Process Automation", "Digital Transformation", "Sustainability", "Remote Work Solutions"]
-    },
-    "education": {
-        "skills": ["teaching", "education", "learning", "instruction", "curriculum", "mentoring", "training", "academic", "research", "communication", "patience", "creativity", "organization", "assessment", "guidance", "motivation", "learn", "knowledge", "curious", "explore", "discover", "understand", "grow", "study", "curiosity"],
-        "careers": [
-            {"name": "Teacher", "description": "Educate students in various subjects and grade levels", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Teaching", "Curriculum Development", "Classroom Management", "Assessment", "Communication"]},
-            {"name": "Professor", "description": "Teach at university level and conduct research", "experience": "5+ years (PhD required)", "salary": "PKR 80,000 - 200,000+", "skills_required": ["Research", "Teaching", "Academic Writing", "Mentoring", "Subject Expertise"]},
-            {"name": "Educational Administrator", "description": "Manage educational institutions and programs", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 180,000+", "skills_required": ["Educational Leadership", "Administration", "Policy Development", "Budget Management", "Strategic Planning"]},
-            {"name": "Curriculum Developer", "description": "Design and develop educational programs", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 150,000+", "skills_required": ["Curriculum Design", "Educational Theory", "Assessment Design", "Content Development", "Research"]},
-            {"name": "Educational Consultant", "description": "Provide expert advice on educational matters", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 200,000+", "skills_required": ["Educational Expertise", "Consulting", "Problem Solving", "Communication", "Industry Knowledge"]},
-            {"name": "Special Education Teacher", "description": "Work with students who have special needs", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 130,000+", "skills_required": ["Special Education", "Patience", "Adaptability", "Individualized Instruction", "Collaboration"]},
-            {"name": "Librarian", "description": "Manage library resources and assist users", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Information Management", "Customer Service", "Research Skills", "Technology", "Organization"]},
-            {"name": "Corporate Trainer", "description": "Train employees in professional skills", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 180,000+", "skills_required": ["Training", "Adult Learning", "Presentation Skills", "Content Development", "Assessment"]},
-            {"name": "Online Educator", "description": "Teach courses through digital platforms", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["Online Teaching", "Technology", "Content Creation", "Student Engagement", "Digital Tools"]},
-            {"name": "Guidance Counselor", "description": "Provide career and academic guidance to students", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 150,000+", "skills_required": ["Counseling", "Career Guidance", "Student Support", "Communication", "Empathy"]}
-        ],
-        "personality_traits": ["patient", "communicative", "creative", "organized", "empathic", "motivational", "knowledgeable", "adaptable", "learning", "curious", "inspiring"],
-        "growth_areas": ["Online Education", "Special Education", "STEM Education", "Early Childhood Education", "Adult Education", "Educational Technology", "Personalized Learning", "Lifelong Learning"],
-        "salary_range": "PKR 40,000 - 150,000+",
-        "demand_level": "High",
-        "work_environment": "Schools/Universities, Structured, Student-focused",
-        "market_trends": [68, 70, 72, 75, 78, 80, 82, 80, 78, 75, 72, 70],
-        "growth_rate": "12% annually",
-        "emerging_technologies": ["EdTech", "Virtual Reality Learning", "AI Tutoring", "Adaptive Learning", "Digital Assessment"]
-    },
-    "creative_arts": {
-        "skills": ["creative", "artistic", "design", "visual", "graphic", "multimedia", "photography", "video", "animation", "illustration", "branding", "typography", "color", "composition", "storytelling", "innovation", "aesthetics"],
-        "careers": [
-            {"name": "Graphic Designer", "description": "Create visual content for print and digital media", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 35,000 - 120,000+", "skills_required": ["Design Software", "Typography", "Color Theory", "Layout Design", "Creativity"]},
-            {"name": "UI/UX Designer", "description": "Design user interfaces and user experiences", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["User Research", "Wireframing", "Prototyping", "Visual Design", "User Testing"]},
-            {"name": "Web Designer", "description": "Create visually appealing and functional websites", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 150,000+", "skills_required": ["Web Design", "HTML/CSS", "Design Software", "Responsive Design", "User Experience"]},
-            {"name": "Illustrator", "description": "Create original artwork and illustrations", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 30,000 - 120,000+", "skills_required": ["Drawing", "Digital Art", "Creativity", "Artistic Skills", "Software Proficiency"]},
-            {"name": "Photographer", "description": "Capture images for various purposes", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 25,000 - 100,000+", "skills_required": ["Photography", "Composition", "Lighting", "Equipment", "Post-processing"]},
-            {"name": "Video Editor", "description": "Edit and produce video content", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 150,000+", "skills_required": ["Video Editing", "Storytelling", "Software Proficiency", "Creativity", "Attention to Detail"]},
-            {"name": "Animator", "description": "Create animated content and characters", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 180,000+", "skills_required": ["Animation", "Character Design", "Storyboarding", "Software Skills", "Creativity"]},
-            {"name": "Art Director", "description": "Lead creative projects and artistic vision", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Creative Leadership", "Project Management", "Artistic Vision", "Team Management", "Communication"]},
-            {"name": "Creative Director", "description": "Oversee creative strategy and brand development", "experience": "5+ years senior", "salary": "PKR 100,000 - 300,000+", "skills_required": ["Creative Strategy", "Brand Development", "Leadership", "Innovation", "Business Acumen"]},
-            {"name": "Brand Designer", "description": "Create and maintain brand identities", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["Brand Strategy", "Logo Design", "Visual Identity", "Marketing", "Creativity"]},
-            {"name": "Product Designer", "description": "Design user-centered products and experiences", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["User Research", "Prototyping", "Visual Design", "User Testing", "Collaboration"]}
-        ],
-        "personality_traits": ["creative", "artistic", "innovative", "detail-oriented", "expressive", "imaginative", "collaborative", "trend-aware"],
-        "growth_areas": ["Digital Design", "User Experience Design", "Brand Design", "Motion Graphics", "3D Design", "Social Media Design"],
-        "salary_range": "PKR 35,000 - 150,000+",
-        "demand_level": "Medium-High",
-        "work_environment": "Creative Studios, Flexible, Project-based",
-        "market_trends": [65, 68, 70, 72, 75, 78, 80, 78, 75, 72, 70, 68],
-        "growth_rate": "10% annually",
-        "emerging_technologies": ["3D Design", "Virtual Reality", "AI Art", "Motion Graphics", "Digital Illustration"]
-    },
-    "science_research": {
-        "skills": ["research", "scientific", "laboratory", "experiment", "analysis", "data", "statistics", "methodology", "hypothesis", "investigation", "discovery", "innovation", "critical thinking", "observation", "documentation", "collaboration"],
-        "careers": [
-            {"name": "Research Scientist", "description": "Conduct scientific research and experiments", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Research Methods", "Data Analysis", "Scientific Writing", "Laboratory Skills", "Critical Thinking"]},
-            {"name": "Laboratory Technician", "description": "Support research by performing lab tests", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Laboratory Techniques", "Equipment Operation", "Safety Protocols", "Data Recording", "Attention to Detail"]},
-            {"name": "Data Scientist", "description": "Analyze complex data sets for insights", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Statistics", "Machine Learning", "Programming", "Data Visualization", "Problem Solving"]},
-            {"name": "Biologist", "description": "Study living organisms and their interactions", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Biology", "Research Methods", "Laboratory Skills", "Data Analysis", "Scientific Writing"]},
-            {"name": "Chemist", "description": "Study chemical substances and reactions", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 65,000 - 220,000+", "skills_required": ["Chemistry", "Laboratory Skills", "Analytical Methods", "Safety Protocols", "Research"]},
-            {"name": "Physicist", "description": "Study matter, energy, and their interactions", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 280,000+", "skills_required": ["Physics", "Mathematics", "Research Methods", "Theoretical Analysis", "Problem Solving"]},
-            {"name": "Environmental Scientist", "description": "Study environmental issues and solutions", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 180,000+", "skills_required": ["Environmental Science", "Field Research", "Data Analysis", "Policy Knowledge", "Problem Solving"]},
-            {"name": "Research Analyst", "description": "Analyze research data and prepare reports", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 150,000+", "skills_required": ["Data Analysis", "Research Methods", "Report Writing", "Statistical Analysis", "Critical Thinking"]},
-            {"name": "Clinical Researcher", "description": "Conduct clinical trials and medical research", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Clinical Research", "Medical Knowledge", "Data Collection", "Regulatory Compliance", "Patient Safety"]},
-            {"name": "Quality Control Specialist", "description": "Ensure products meet quality standards", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 160,000+", "skills_required": ["Quality Control", "Testing Methods", "Documentation", "Attention to Detail", "Problem Solving"]}
-        ],
-        "personality_traits": ["analytical", "curious", "patient", "detail-oriented", "logical", "innovative", "persistent", "collaborative"],
-        "growth_areas": ["Biotechnology", "Environmental Science", "Data Science", "Medical Research", "Renewable Energy", "Artificial Intelligence"],
-        "salary_range": "PKR 50,000 - 200,000+",
-        "demand_level": "High",
-        "work_environment": "Laboratories/Research Centers, Structured, Discovery-focused",
-        "market_trends": [70, 72, 75, 78, 80, 82, 85, 82, 80, 78, 75, 72],
-        "growth_rate": "20% annually",
-        "emerging_technologies": ["CRISPR Gene Editing", "Quantum Computing", "Nanotechnology", "Biotechnology", "Clean Energy"]
-    }
-}
-
-# Helper functions
-def extract_skills_from_text(text):
-    """Extract skills from text using NLP"""
-    if not text:
-        return []
-    
-    # Tokenize and remove stopwords
-    tokens = word_tokenize(text.lower())
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
-    
-    # Use NLTK for named entity recognition (replacing spaCy)
-    try:
-        tokens = word_tokenize(text)
-        pos_tags = pos_tag(tokens)
-        chunks = ne_chunk(pos_tags)
-        entities = []
-        for chunk in chunks:
-            if hasattr(chunk, 'label'):
-                if chunk.label() in ['ORGANIZATION', 'PERSON', 'GPE']:
-                    entities.append(' '.join([token for token, pos in chunk.leaves()]))
-    except:
-        entities = []
-    
-    # Combine tokens and entities
-    all_skills = list(set(filtered_tokens + entities))
-    
-    return all_skills[:10]  # Return top 10 skills
+# ---- Interaction Logging ----
+def record_interaction(interaction_type, career_name, **data):
+    """Log a view, save or export of a career for the current user (written in batches)."""
+    log_interaction(st.session_state.current_user_id, interaction_type, str(career_name), **data)
 
-def analyze_career_match(user_skills, user_personality):
-    """Analyze career match using comprehensive knowledge base"""
-    career_scores = {}
-    
-    for field, data in COMPREHENSIVE_CAREER_KNOWLEDGE.items():
-        skill_match = sum(1 for skill in user_skills if skill.lower() in [s.lower() for s in data["skills"]])
-        personality_match = sum(1 for trait in user_personality if trait.lower() in [p.lower() for p in data["personality_traits"]])
-        
-        total_score = (skill_match * 0.7) + (personality_match * 0.3)
-        normalized_score = min(total_score / max(len(data["skills"]), 1), 1.0)
-        
-        career_scores[field] = {
-            "score": normalized_score,
-            "skill_match": skill_match,
-            "personality_match": personality_match,
-            "careers": data["careers"],
-            "growth_areas": data["growth_areas"],
-            "salary_range": data["salary_range"],
-            "demand_level": data["demand_level"],
-            "work_environment": data["work_environment"]
-        }
-    
-    return career_scores
-
-def get_personalized_career_insights(user_skills, user_personality):
-    """Get personalized career insights and recommendations"""
-    career_analysis = analyze_career_match(user_skills, user_personality)
-    
-    # Sort by score
-    sorted_careers = sorted(career_analysis.items(), key=lambda x: x[1]["score"], reverse=True)
-    
-    insights = {
-        "top_field": sorted_careers[0][0] if sorted_careers else None,
-        "recommended_careers": [],
-        "skill_gaps": [],
-        "growth_opportunities": []
-    }
-    
-    if sorted_careers:
-        top_field = sorted_careers[0]
-        insights["top_field"] = top_field[0]
-        insights["recommended_careers"] = top_field[1]["careers"][:5]
-        insights["growth_opportunities"] = top_field[1]["growth_areas"]
-        
-        # Identify skill gaps
-        top_skills = COMPREHENSIVE_CAREER_KNOWLEDGE[top_field[0]]["skills"]
-        missing_skills = [skill for skill in top_skills[:10] if skill.lower() not in [s.lower() for s in user_skills]]
-        insights["skill_gaps"] = missing_skills[:5]
-    
-    return insights
+def record_views(career_names, source):
+    """Log a view for each career shown in ``source`` for the first time this session."""
+    for name in career_names:
+        if (source, name) not in st.session_state.viewed_careers:
+            st.session_state.viewed_careers.add((source, name))
+            record_interaction('view', name, source=source)
 
 # ---- Export Utilities ----
 def build_recommendations_rows(recommended_careers, field_data):
@@ -989,51 +574,6 @@ def create_skills_radar_chart(user_skills, field_skills):
     
     return fig
 
-def get_career_recommendations_from_quiz(user_skills, user_personality, limit=5):
-    """Get career recommendations based on quiz results using comprehensive knowledge base"""
-    # Normalize inputs
-    safe_user_skills = [str(s).strip() for s in (user_skills or []) if s]
-    safe_user_personality = [str(p).strip() for p in (user_personality or []) if p]
-    
-    # Use the comprehensive career analysis
-    insights = get_personalized_career_insights(safe_user_skills, safe_user_personality)
-    
-    if not insights.get("top_field"):
-        return []
-    
-    # Get field data safely
-    field_key = insights["top_field"]
-    field_data = COMPREHENSIVE_CAREER_KNOWLEDGE.get(field_key, {})
-    field_skills = [str(s).lower() for s in field_data.get("skills", [])]
-    field_traits = [str(t).lower() for t in field_data.get("personality_traits", [])]
-    denom = max(len(field_skills), 1)
-    
-    recommendations = []
-    for i, career_name in enumerate((insights.get("recommended_careers") or [])[:limit]):
-        # Calculate match score based on skills and personality
-        skill_match = sum(1 for skill in safe_user_skills if str(skill).lower() in field_skills)
-        personality_match = sum(1 for trait in safe_user_personality if str(trait).lower() in field_traits)
-        
-        total_score = (skill_match * 0.7) + (personality_match * 0.3)
-        normalized_score = min(total_score / denom, 1.0)
-        
-        recommendations.append({
-            'career': {
-                'name': str(career_name),
-                'field': field_key,
-                'description': f"Career in {field_key} field",
-                'demand_level': field_data.get('demand_level', 'N/A'),
-                'salary_range': field_data.get('salary_range', 'N/A')
-            },
-            'similarity_score': float(normalized_score),
-            'skill_match': int(skill_match),
-            'personality_match': int(personality_match)
-        })
-    
-    # Sort by similarity score
-    recommendations.sort(key=lambda x: x.get('similarity_score', 0), reverse=True)
-    return recommendations
-
 def get_career_recommendations(user_skills, limit=5):
     """Get career recommendations based on user skills"""
     # Use the text-based recommendation system
@@ -1122,14 +662,19 @@ def render_auth_fullpage():
                 
                 if login_button:
                     if email and password:
-                        user_id = verify_user_credentials(email, password)
-                        if user_id:
-                            st.session_state.is_authenticated = True
-                            st.session_state.current_user_id = user_id
-                            st.success("Login successful!")
-                            st.rerun()
+                        try:
+                            user_id = verify_user_credentials(email, password)
+                        except (CredentialServiceBusy, FuturesTimeoutError):
+                            st.warning("Too many sign-ins right now, please try again in a moment")
                         else:
-                            st.error("Invalid email or password")
+                            if user_id:
+                                # The cookie lets a reconnecting browser resume the session
+                                set_session_token(create_session(user_id))
+                                restore_session()
+                                st.success("Login successful!")
+                                st.rerun()
+                            else:
+                                st.error("Invalid email or password")
                     else:
                         st.error("Please fill in all fields")
 
@@ -1145,7 +690,10 @@ def render_auth_fullpage():
                 if register_button:
                     if name and email and password and confirm_password:
                         if password == confirm_password:
-                            success, user_id, message = create_user_account(name, email, password)
+                            try:
+                                success, user_id, message = create_user_account(name, email, password)
+                            except (CredentialServiceBusy, FuturesTimeoutError):
+                                success, message = False, "Too many sign-ups right now, please try again in a moment"
                             if success:
                                 st.success("Account created successfully! Please login.")
                             else:
@@ -1179,9 +727,14 @@ def render_main_app():
     # Sidebar
     with st.sidebar:
         st.markdown("### Navigation")
+        if st.session_state.current_user_name:
+            st.caption(f"Signed in as {st.session_state.current_user_name}")
         if st.button("Logout"):
+            revoke_session(st.session_state.session_token)
+            set_session_token(None)
             st.session_state.is_authenticated = False
             st.session_state.current_user_id = None
+            st.session_state.current_user_name = None
             st.rerun()
         
         # Sidebar navigation removed as requested
@@ -1292,26 +845,31 @@ def render_main_app():
                 st.markdown("**💼 Recommended Careers:**")
                 # Build rows for export (handles dict or string career entries)
                 export_rows = build_recommendations_rows(insights["recommended_careers"], field_data)
+                record_views([row['Career'] for row in export_rows], 'dash')
                 export_col1, export_col2 = st.columns([1,1])
                 with export_col1:
                     csv_bytes = generate_recommendations_csv(export_rows)
-                    st.download_button(
+                    if st.download_button(
                         label="⬇️ Download CSV",
                         data=csv_bytes,
                         file_name="career_recommendations.csv",
                         mime="text/csv",
                         key="dl_rec_csv"
-                    )
+                    ):
+                        for row in export_rows:
+                            record_interaction('export', row['Career'], format='csv')
                 with export_col2:
                     pdf_bytes = generate_recommendations_pdf(export_rows, title=f"Recommendations - {insights['top_field'].title()}")
                     if pdf_bytes:
-                        st.download_button(
+                        if st.download_button(
                             label="⬇️ Download PDF",
                             data=pdf_bytes,
                             file_name="career_recommendations.pdf",
                             mime="application/pdf",
                             key="dl_rec_pdf"
-                        )
+                        ):
+                            for row in export_rows:
+                                record_interaction('export', row['Career'], format='pdf')
                     else:
                         st.caption("Export feature coming soon! You'll be able to download your recommendations as PDF or CSV.")
                 for i, career_item in enumerate(insights["recommended_careers"][:5]):
@@ -1345,6 +903,7 @@ def render_main_app():
                                     st.markdown(f"- {skill}")
 
                             if st.button(f"Save {career_name}", key=f"save_dash_{i}"):
+                                record_interaction('save', career_name, source='dash')
                                 st.success(f"Saved {career_name}!")
                                 st.rerun()
                         else:
@@ -1353,6 +912,7 @@ def render_main_app():
                             st.markdown(f"**Salary:** {field_data['salary_range']}")
 
                             if st.button(f"Save {career_name}", key=f"save_dash_{i}"):
+                                record_interaction('save', career_name, source='dash')
                                 st.success(f"Saved {career_name}!")
                                 st.rerun()
                 
@@ -1517,8 +1077,14 @@ def render_main_app():
                             # Check if quiz is completed
                             if st.session_state.current_question >= len(CAREER_ASSESSMENT_QUESTIONS):
                                 st.session_state.quiz_completed = True
-                                # Process results
-                                skills, personality = process_quiz_results(st.session_state.quiz_answers)
+                                # Process results on the recommendation workers
+                                try:
+                                    quiz_result = score_quiz(st.session_state.quiz_answers)
+                                    skills, personality = quiz_result['skills'], quiz_result['personality']
+                                    st.session_state.quiz_insights = quiz_result['insights']
+                                except (ServiceBusy, FuturesTimeoutError):
+                                    skills, personality = process_quiz_results(st.session_state.quiz_answers)
+                                    st.session_state.quiz_insights = None
                                 st.session_state.user_skills = skills
                                 st.session_state.user_personality = personality
                             
@@ -1550,6 +1116,7 @@ def render_main_app():
                         st.session_state.quiz_completed = False
                         st.session_state.user_skills = []
                         st.session_state.user_personality = []
+                        st.session_state.quiz_insights = None
                         st.rerun()
             else:
                 st.session_state.quiz_completed = True
@@ -1575,7 +1142,7 @@ def render_main_app():
             if st.session_state.user_skills or st.session_state.user_personality:
                 st.markdown("### Your Comprehensive Career Analysis")
                 
-                insights = get_personalized_career_insights(st.session_state.user_skills, st.session_state.user_personality)
+                insights = st.session_state.get('quiz_insights') or get_personalized_career_insights(st.session_state.user_skills, st.session_state.user_personality)
                 
                 if insights["top_field"]:
                     field_data = COMPREHENSIVE_CAREER_KNOWLEDGE[insights["top_field"]]
@@ -1596,6 +1163,10 @@ def render_main_app():
                     
                     # Show top careers (only name by default, details inside expander)
                     st.markdown("**💼 Top Career Recommendations:**")
+                    record_views([
+                        item.get('name', 'Career') if isinstance(item, dict) else str(item)
+                        for item in insights["recommended_careers"][:3]
+                    ], 'quiz')
                     for i, career_item in enumerate(insights["recommended_careers"][:3]):
                         # Normalize label to only the name
                         if isinstance(career_item, dict):
@@ -1609,6 +1180,7 @@ def render_main_app():
                             st.markdown(f"**Salary:** {field_data['salary_range']}")
 
                             if st.button(f"Save {career_name}", key=f"save_quiz_{i}"):
+                                record_interaction('save', career_name, source='quiz')
                                 st.success(f"Saved {career_name}!")
                                 st.rerun()
                     
@@ -1627,6 +1199,7 @@ def render_main_app():
                 st.session_state.quiz_completed = False
                 st.session_state.user_skills = []
                 st.session_state.user_personality = []
+                st.session_state.quiz_insights = None
                 st.rerun()
 
     with tab3:
@@ -1640,11 +1213,40 @@ def render_main_app():
         # Recommendation type selection
         recommendation_type = st.selectbox(
             "Choose recommendation type:",
-            ["Random Suggestions", "Popular Careers", "Trending Fields"],
+            ["Personalized Mix", "Random Suggestions", "Popular Careers", "Trending Fields"],
             key="cf_type"
         )
         
-        if recommendation_type == "Random Suggestions":
+        if recommendation_type == "Personalized Mix":
+            st.markdown("### Personalized Career Mix")
+            st.caption("Blends your quiz profile, your activity and similar users' choices into one ranking.")
+            try:
+                mixed_careers = rank_careers(
+                    text=" ".join(st.session_state.user_skills),
+                    user_id=st.session_state.current_user_id,
+                    user_skills=st.session_state.user_skills,
+                    user_personality=st.session_state.user_personality,
+                    top_k=6
+                )
+                
+                if not mixed_careers.empty:
+                    record_views(mixed_careers['name'], 'mix')
+                    cols = st.columns(2)
+                    for i, (_, career) in enumerate(mixed_careers.iterrows()):
+                        with cols[i % 2]:
+                            with st.expander(f"{career['name']} — match {career['score']:.0%}"):
+                                st.write(f"**Description:** {career.get('description', 'Career description not available')}")
+                                st.write(f"**Field:** {career.get('field', 'N/A')}")
+                                if st.button(f"Save {career['name']}", key=f"save_mix_{i}"):
+                                    record_interaction('save', career['name'], source='mix')
+                                    st.success(f"Saved {career['name']}!")
+                                    st.rerun()
+                else:
+                    st.info("Take the quiz to get a personalized mix.")
+            except Exception as e:
+                st.error(f"Error getting personalized careers: {str(e)}")
+        
+        elif recommendation_type == "Random Suggestions":
             st.markdown("### Random Career Suggestions")
             try:
                 random_careers = get_random_cf_recommendations(6)
@@ -1657,6 +1259,7 @@ def render_main_app():
                                 st.write(f"**Description:** {career.get('description', 'Career description not available')}")
                                 st.write(f"**Field:** {career.get('field', 'N/A')}")
                                 if st.button(f"Save {career['name']}", key=f"save_random_{i}"):
+                                    record_interaction('save', career['name'], source='random')
                                     st.success(f"Saved {career['name']}!")
                                     st.rerun()
                 else:
@@ -1726,12 +1329,12 @@ def render_main_app():
                         )
                 else:
                     # Fallback to core function
-                    trends_df = career_trend_timeseries()
+                    trends_df = career_trend_timeseries(granularity='month', group_by='field')
                     if not trends_df.empty:
                         fig = px.line(
                             trends_df,
                             x='date',
-                            y='demand_score',
+                            y='demand_index',
                             color='field',
                             title="Career Demand Trends Over Time"
                         )
@@ -1834,6 +1437,7 @@ def render_main_app():
                                 st.markdown(f"- {skill}")
                         
                         if st.button(f"Save {career_name}", key=f"save_roadmap_{i}"):
+                            record_interaction('save', career_name, source='roadmap')
                             st.success(f"Saved {career_name}!")
                             st.rerun()
                 else:
@@ -1844,6 +1448,7 @@ def render_main_app():
                         st.markdown(f"**Salary:** {field_data['salary_range']}")
                         
                         if st.button(f"Save {career}", key=f"save_roadmap_{i}"):
+                            record_interaction('save', career, source='roadmap')
                             st.success(f"Saved {career}!")
                             st.rerun()
             
@@ -1925,10 +1530,11 @@ def render_main_app():
             )
             field_info = COMPREHENSIVE_CAREER_KNOWLEDGE.get(selected_field, {})
             field_skills = [s.lower() for s in field_info.get("skills", [])]
+            user_skill_set = set(user_skills)
             
             # Compute coverage and gaps
-            covered = sorted(list(set([s for s in user_skills if s in field_skills])))
-            gaps = sorted(list(set([s for s in field_skills if s not in user_skills])))
+            covered = sorted(user_skill_set & field_skill_set(selected_field))
+            gaps = sorted(field_skill_set(selected_field) - user_skill_set)
             coverage_pct = round((len(covered) / max(len(field_skills), 1)) * 100, 1)
             
             colA, colB, colC = st.columns(3)
@@ -1948,7 +1554,7 @@ def render_main_app():
             st.markdown("### Intelligent Skill Gap Plan")
             if gaps:
                 # Simple priority: maintain original field skill order
-                ordered_gaps = [s for s in field_skills if s in gaps][:10]
+                ordered_gaps = [s for s in field_skills if s not in user_skill_set][:10]
                 gap_df = pd.DataFrame({
                     "Skill": [g.title() for g in ordered_gaps],
                     "Priority": list(range(len(ordered_gaps), 0, -1))
@@ -1968,15 +1574,23 @@ def render_main_app():
             suggested = []
             for c in field_info.get("careers", [])[:6]:
                 if isinstance(c, dict):
-                    req = [s.lower() for s in c.get("skills_required", [])]
+                    req = {s.lower() for s in c.get("skills_required", [])}
                     match = sum(1 for s in user_skills if s in req)
-                    suggested.append((c.get("name", "Career"), match, len(req)))
+                    suggested.append((c.get("name", "Career"), match, len(c.get("skills_required", []))))
             suggested.sort(key=lambda x: x[1], reverse=True)
             if suggested:
                 cols = st.columns(2)
                 for i, (name, m, total) in enumerate(suggested[:6]):
                     with cols[i % 2]:
                         st.info(f"{name} — skill match {m}/{total}")
+            
+            # Coverage against the catalog's weighted career_skill requirements
+            best_covered = best_covered_careers(st.session_state.user_skills, top_k=5, top_missing=3)
+            if not best_covered.empty:
+                st.markdown("### Catalog Careers by Skill Coverage")
+                for name, cov, missing in best_covered.itertuples(index=False):
+                    needs = ", ".join(missing) if missing else "nothing major"
+                    st.markdown(f"- **{name}** — {cov:.0%} covered; next: {needs}")
         else:
             st.info("Take the quiz first to analyze your skills!")
 
@@ -2003,50 +1617,9 @@ def render_main_app():
                     
                     # Helper to pull enriched info from knowledge base if available
                     def _get_field_info(career_row):
-                        field_key = str(career_row.get('field', '')).lower().replace(' ', '_')
-                        career_name = career_row.get('name', '').lower()
-                        
-                        # Specific career mappings for better coverage
-                        career_mapping = {
-                            'ux designer': 'technology',
-                            'graphic designer': 'creative_arts',
-                            'marketing specialist': 'business',
-                            'financial analyst': 'business',
-                            'ui/ux designer': 'creative_arts'
-                        }
-                        
-                        # Enhanced field mapping for better career coverage
-                        field_mapping = {
-                            'design': 'creative_arts',
-                            'marketing': 'business', 
-                            'finance': 'business',
-                            'technology': 'technology',
-                            'healthcare': 'healthcare',
-                            'education': 'education',
-                            'science': 'science_research',
-                            'research': 'science_research',
-                            'arts': 'creative_arts',
-                            'creative': 'creative_arts',
-                            'business': 'business',
-                            'management': 'business',
-                            'administration': 'business'
-                        }
-                        
-                        # Try specific career mapping first
-                        if career_name in career_mapping:
-                            return COMPREHENSIVE_CAREER_KNOWLEDGE.get(career_mapping[career_name], {})
-                        
-                        # Try direct field match
-                        if field_key in COMPREHENSIVE_CAREER_KNOWLEDGE:
-                            return COMPREHENSIVE_CAREER_KNOWLEDGE[field_key]
-                        
-                        # Try mapped field
-                        mapped_field = field_mapping.get(field_key)
-                        if mapped_field and mapped_field in COMPREHENSIVE_CAREER_KNOWLEDGE:
-                            return COMPREHENSIVE_CAREER_KNOWLEDGE[mapped_field]
-                        
                         # Fallback to technology if no match (most comprehensive)
-                        return COMPREHENSIVE_CAREER_KNOWLEDGE.get('technology', {})
+                        field_key = career_field_key(career_row.get('name', ''), career_row.get('field', ''))
+                        return COMPREHENSIVE_CAREER_KNOWLEDGE.get(field_key, {})
 
                     def _join_list(val, limit=None):
                         items = []
@@ -2782,16 +2355,65 @@ def render_main_app():
                 st.rerun()
 
 # Main app logic
+@st.cache_resource(show_spinner="Preparing career data...")
+def prepare_backend():
+    """Initialise the database and warm the caches once per server process, not on every rerun."""
+    init_db()
+    get_session_store().purge_expired()
+    # The CF model is loaded on the first CF request, from the artifact `bootstrap.py --warm-up` saves
+    return warm_up(cf=False)
+
+def set_session_token(token):
+    """Remember this connection's session token (None to log out) and update the cookie on the next run."""
+    st.session_state.session_token = token
+    st.session_state.session_cookie_pending = True
+
+def write_session_cookie():
+    """Store the session token in a browser cookie, or clear it after a logout.
+
+    Streamlit cannot set cookies from the server, so a zero-height component
+    sets it on the app page. It is written on the run after login or logout,
+    because ``st.rerun()`` would discard a component emitted in the same run.
+    A cookie written by script cannot be HttpOnly; it is ``Secure`` and
+    ``SameSite=Strict``, and the page must not render untrusted HTML.
+    """
+    if not st.session_state.session_cookie_pending:
+        return
+    st.session_state.session_cookie_pending = False
+    token = st.session_state.session_token or ''
+    max_age = SESSION_TTL_SECONDS if token else 0
+    components.html(f"""
+    <script>
+    window.parent.document.cookie = '{SESSION_COOKIE}={token}; Path=/; Max-Age={max_age}; Secure; SameSite=Strict';
+    </script>
+    """, height=0)
+
+def restore_session():
+    """Sync the login state with this connection's session token.
+
+    Resolving a token is served from the session cache on reruns, so this does
+    not query the database on every interaction.
+    """
+    token = st.session_state.session_token
+    if not token and not st.session_state.is_authenticated:
+        return
+    info = resolve_session(token)
+    if info is None:
+        # Expired, revoked or missing: back to the login page
+        if token:
+            set_session_token(None)
+        st.session_state.is_authenticated = False
+        st.session_state.current_user_id = None
+        st.session_state.current_user_name = None
+        return
+    st.session_state.is_authenticated = True
+    st.session_state.current_user_id = info.user_id
+    st.session_state.current_user_name = info.full_name
+
 def main():
-    # Seed database if needed
-    try:
-        # Check if database is empty
-        careers_df = get_career_data()
-        if careers_df.empty:
-            seed_sample_data()
-    except:
-        # If there's an error, try to seed the database
-        seed_sample_data()
+    prepare_backend()
+    restore_session()
+    write_session_cookie()
     
     # Render appropriate page
     if st.session_state.is_authenticated:
@@ -0,0 +1,162 @@
+"""Versioned on-disk model artifacts shared between worker processes.
+
+An artifact is a directory ``ARTIFACT_DIR/<key>/`` holding one ``.npy`` file per
+array plus ``manifest.json`` for small metadata. Keys are derived from a hash of
+the data the model was built from, so a worker that sees the same database
+contents finds the same artifact. Arrays are opened with ``mmap_mode='r'``:
+every process maps the same files read-only and the OS keeps a single copy of
+the pages in its cache.
+
+Writes go to a temporary directory that is renamed into place, so readers
+never observe a partially written artifact. ``save_frame``/``load_frame`` use the
+same layout to snapshot DataFrames column by column.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so stale artifacts are ignored.
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_DIR = os.getenv('ARTIFACT_DIR', 'artifacts')
+# Artifacts kept per kind (key prefix); older ones are pruned after a save
+ARTIFACT_KEEP = int(os.getenv('ARTIFACT_KEEP', '3'))
+
+
+def content_key(kind: str, *parts: bytes) -> str:
+    """Build an artifact key from a kind label and the bytes it was built from."""
+    digest = hashlib.sha256(f'v{ARTIFACT_FORMAT_VERSION}'.encode())
+    for part in parts:
+        digest.update(hashlib.sha256(part).digest())
+    return f'{kind}-{digest.hexdigest()[:20]}'
+
+
+def load_artifact(key: str) -> Optional[Tuple[Dict[str, np.ndarray], dict]]:
+    """Memory-map the arrays of an artifact; None if it does not exist."""
+    path = os.path.join(ARTIFACT_DIR, key)
+    try:
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != ARTIFACT_FORMAT_VERSION:
+            return None
+        arrays = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+            for name in manifest['arrays']
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+    return arrays, manifest.get('meta', {})
+
+
+def save_artifact(key: str, arrays: Dict[str, np.ndarray], meta: Optional[dict] = None) -> bool:
+    """Write an artifact atomically. Returns False if it could not be written."""
+    final = os.path.join(ARTIFACT_DIR, key)
+    if os.path.isdir(final):
+        return True
+    try:
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f'.{key}-', dir=ARTIFACT_DIR)
+    except OSError:
+        return False
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f'{name}.npy'), np.ascontiguousarray(array), allow_pickle=False)
+        with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+            json.dump({
+                'format': ARTIFACT_FORMAT_VERSION,
+                'created_at': time.time(),
+                'arrays': sorted(arrays),
+                'meta': meta or {},
+            }, f)
+        os.rename(tmp, final)
+    except OSError:
+        # Either the disk is not writable or another worker won the rename.
+        shutil.rmtree(tmp, ignore_errors=True)
+        return os.path.isdir(final)
+    prune_artifacts(key.split('-', 1)[0], keep=ARTIFACT_KEEP)
+    return True
+
+
+def prune_artifacts(kind: str, keep: int = ARTIFACT_KEEP) -> None:
+    """Delete all but the ``keep`` newest artifacts of one kind.
+
+    Processes that still map a deleted artifact keep working; the pages are
+    released when the last mapping goes away.
+    """
+    try:
+        entries = [
+            e for e in os.scandir(ARTIFACT_DIR)
+            if e.is_dir() and e.name.startswith(f'{kind}-')
+        ]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# Joins the values of a string column into one UTF-8 buffer; splitting it is a
+# single C-level call, much faster than decoding one slice per row.
+_STRING_SEP = '\x1f'
+
+
+def save_frame(key: str, frame: pd.DataFrame, meta: Optional[dict] = None) -> bool:
+    """Store a DataFrame as a columnar artifact: one typed array per column.
+
+    Categorical columns keep their codes and categories, string columns are
+    stored as one separator-joined UTF-8 buffer plus a null mask. Returns False
+    (nothing written) for frames that cannot be stored losslessly.
+    """
+    arrays, columns = {}, []
+    for i, name in enumerate(frame.columns):
+        column, tag = frame[name], f'col{i}'
+        spec = {'name': name, 'array': tag}
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            spec.update(kind='category', categories=column.cat.categories.tolist())
+            arrays[tag] = column.cat.codes.to_numpy()
+        elif pd.api.types.is_bool_dtype(column) or pd.api.types.is_numeric_dtype(column) \
+                or pd.api.types.is_datetime64_dtype(column):
+            spec.update(kind='array')
+            arrays[tag] = column.to_numpy()
+        else:
+            nulls = column.isna().to_numpy()
+            values = ['' if null else str(v) for v, null in zip(column.tolist(), nulls)]
+            if any(_STRING_SEP in v for v in values):
+                return False
+            spec.update(kind='string')
+            arrays[tag] = np.frombuffer(_STRING_SEP.join(values).encode('utf-8'), dtype=np.uint8)
+            if nulls.any():
+                spec['nulls'] = f'{tag}_null'
+                arrays[spec['nulls']] = nulls
+        columns.append(spec)
+    return save_artifact(key, arrays, {**(meta or {}), 'frame': {'columns': columns, 'rows': len(frame)}})
+
+
+def load_frame(key: str) -> Optional[Tuple[pd.DataFrame, dict]]:
+    """Load a frame stored with ``save_frame``; None if it does not exist."""
+    loaded = load_artifact(key)
+    if loaded is None or 'frame' not in loaded[1]:
+        return None
+    arrays, meta = loaded
+    layout = meta.pop('frame')
+    rows = layout['rows']
+    data = {}
+    for spec in layout['columns']:
+        array = arrays[spec['array']]
+        if spec['kind'] == 'category':
+            data[spec['name']] = pd.Categorical.from_codes(np.array(array), categories=spec['categories'])
+        elif spec['kind'] == 'array':
+            # Copy out of the mapping so the frame owns writable memory.
+            data[spec['name']] = np.array(array)
+        else:
+            values = array.tobytes().decode('utf-8').split(_STRING_SEP) if rows else []
+            if 'nulls' in spec:
+                values = [None if null else v for v, null in zip(values, arrays[spec['nulls']])]
+            data[spec['name']] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(rows)), meta
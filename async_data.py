@@ -0,0 +1,208 @@
+"""Asyncio data access for accounts and user data.
+
+The functions here run on SQLAlchemy's async engine (``aiosqlite`` for
+SQLite, ``asyncpg`` for PostgreSQL), so several lookups can wait on the
+database at the same time:
+
+    profile, history, trends = gather_sync(
+        get_user_profile_async(user_id),
+        get_user_interactions_async(user_id),
+        career_trend_timeseries_async(granularity='month', group_by='field'),
+    )
+
+Streamlit scripts are synchronous, so ``run_sync``/``gather_sync`` execute
+coroutines on one background event loop and block only the calling thread.
+The account functions are implemented here only: ``create_user_account``,
+``verify_user_credentials`` and ``get_user_by_email`` in ``counselor_core``
+are ``run_sync`` facades over them. As there, trend queries go to
+``DATABASE_REPLICA_URL`` when it is set.
+"""
+import asyncio
+import threading
+import weakref
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from counselor_core import (
+    DATABASE_REPLICA_URL, DATABASE_URL, Assessment, Interaction, User, UserProfile, email_may_exist, remember_emails,
+    trend_timeseries_statement
+)
+from credential_service import hash_password_async, needs_rehash, verify_password_async
+from db_engine import make_async_engine
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to the async driver for its backend."""
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Async connections belong to the event loop that opened them, so every loop
+# gets its own engines: (primary, sessions on the primary, replica or primary).
+_engines: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AsyncEngine, async_sessionmaker, AsyncEngine]]' = \
+    weakref.WeakKeyDictionary()
+_engines_lock = threading.Lock()
+
+
+def _loop_engines() -> Tuple[AsyncEngine, async_sessionmaker, AsyncEngine]:
+    loop = asyncio.get_running_loop()
+    with _engines_lock:
+        if loop not in _engines:
+            engine = make_async_engine(async_database_url(DATABASE_URL))
+            read_engine = engine
+            if DATABASE_REPLICA_URL:
+                read_engine = make_async_engine(async_database_url(DATABASE_REPLICA_URL), read_only=True)
+            _engines[loop] = (engine, async_sessionmaker(engine, expire_on_commit=False), read_engine)
+        return _engines[loop]
+
+
+def _sessions() -> async_sessionmaker:
+    return _loop_engines()[1]
+
+
+def get_async_engine(read_only: bool = False) -> AsyncEngine:
+    """The async engine of the running event loop; the replica's with ``read_only``."""
+    engine, _, read_engine = _loop_engines()
+    return read_engine if read_only else engine
+
+
+async def get_user_by_email_async(email: str) -> Optional[User]:
+    """Get user by email address."""
+    async with _sessions()() as s:
+        return (await s.execute(select(User).where(User.email == email))).scalars().first()
+
+
+async def _in_executor(fn, *args):
+    """Run a blocking call (e.g. the email filter, which may load from the database) off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def create_user_account_async(full_name: str, email: str, password: str) -> Tuple[bool, Optional[int], str]:
+    """Create a new user account."""
+    if await _in_executor(email_may_exist, email):
+        async with _sessions()() as s:
+            existing_user = (await s.execute(select(User.id).where(User.email == email))).first()
+        if existing_user:
+            return False, None, "User already exists with this email"
+
+    # Hash without holding a pooled connection; the unique email catches a concurrent sign-up
+    password_hash = await hash_password_async(password)
+    async with _sessions()() as s:
+        user = User(email=email, password_hash=password_hash, full_name=full_name)
+        s.add(user)
+        try:
+            await s.commit()
+        except IntegrityError:
+            await s.rollback()
+            await _in_executor(remember_emails, [email])
+            return False, None, "User already exists with this email"
+        await _in_executor(remember_emails, [email])
+        return True, user.id, "User created successfully"
+
+
+async def verify_user_credentials_async(email: str, password: str) -> Optional[int]:
+    """Verify user login credentials and return user ID."""
+    async with _sessions()() as s:
+        user = (await s.execute(select(User.id, User.password_hash).where(User.email == email))).first()
+    if not user or not await verify_password_async(password, user.password_hash):
+        return None
+
+    # Legacy SHA-256 or outdated-cost hashes are replaced now that we know the password
+    new_hash = await hash_password_async(password) if needs_rehash(user.password_hash) else None
+    async with _sessions()() as s:
+        await s.execute(update(User).where(User.id == user.id).values(last_login=datetime.utcnow()))
+        if new_hash:
+            # Skip if the password changed meanwhile
+            await s.execute(update(User).where(User.id == user.id, User.password_hash == user.password_hash)
+                            .values(password_hash=new_hash))
+        await s.commit()
+    return user.id
+
+
+async def get_user_profile_async(user_id: int) -> Optional[UserProfile]:
+    """Most recently updated profile of a user."""
+    async with _sessions()() as s:
+        result = await s.execute(
+            select(UserProfile).where(UserProfile.user_id == user_id)
+            .order_by(UserProfile.updated_at.desc()).limit(1)
+        )
+        return result.scalars().first()
+
+
+async def get_user_assessments_async(user_id: int, limit: int = 10) -> List[Assessment]:
+    """A user's latest assessments, newest first."""
+    async with _sessions()() as s:
+        result = await s.execute(
+            select(Assessment).where(Assessment.user_id == user_id)
+            .order_by(Assessment.created_at.desc()).limit(limit)
+        )
+        return list(result.scalars())
+
+
+async def get_user_interactions_async(user_id: int, limit: int = 50) -> List[Interaction]:
+    """A user's latest interactions, newest first."""
+    async with _sessions()() as s:
+        result = await s.execute(
+            select(Interaction).where(Interaction.user_id == user_id)
+            .order_by(Interaction.created_at.desc()).limit(limit)
+        )
+        return list(result.scalars())
+
+
+async def career_trend_timeseries_async(**filters) -> pd.DataFrame:
+    """``counselor_core.career_trend_timeseries`` with the query awaited."""
+    engine = get_async_engine(read_only=True)
+    stmt, finish = trend_timeseries_statement(engine.dialect.name, **filters)
+    async with engine.connect() as conn:
+        result = await conn.execute(stmt)
+        frame = pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+    return finish(frame)
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='async-data', daemon=True).start()
+        return _loop
+
+
+def run_sync(coro, timeout: Optional[float] = None):
+    """Run one coroutine on the shared background loop and return its result."""
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("run_sync() cannot be called from the async-data loop; await the coroutine")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def gather_sync(*coros, timeout: Optional[float] = None) -> list:
+    """Run coroutines concurrently on the background loop and return their results in order."""
+    async def gather():
+        return await asyncio.gather(*coros)
+    return run_sync(gather(), timeout)
@@ -0,0 +1,290 @@
+"""Benchmark suite for the recommendation hot paths.
+
+Runs without Streamlit against a throwaway SQLite database filled with a
+synthetic catalog, so results are reproducible on any machine:
+
+    python benchmarks/run_benchmarks.py --sizes 10 1000 100000 1000000 \\
+        --output benchmarks/results.json
+    python benchmarks/run_benchmarks.py --baseline old.json --tolerance 0.25
+
+For every case it records throughput, p50/p99 latency and the peak Python
+heap allocated by a call (tracemalloc), and writes all results as JSON.
+With ``--baseline`` the run fails when a case's p50 latency regressed by
+more than ``--tolerance`` against an earlier results file.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from sqlalchemy import func, select
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIELDS = ['Technology', 'Healthcare', 'Business', 'Education', 'Design', 'Finance', 'Science']
+FILLER = ['design', 'build', 'analyze', 'lead', 'support', 'manage', 'research', 'deliver',
+          'systems', 'teams', 'clients', 'products', 'services', 'projects', 'reports']
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000) if samples else 0.0
+
+
+def measure(case, fn, iterations, catalog_size=None, **extra):
+    """Time ``fn`` ``iterations`` times after one warm-up call.
+
+    Latency is measured with tracing off; peak memory comes from a separate,
+    shorter pass under tracemalloc, which would otherwise slow every call.
+    """
+    fn(0)
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    for i in range(min(iterations, 10)):
+        fn(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        'case': case,
+        'catalog_size': catalog_size,
+        'iterations': iterations,
+        'throughput_per_s': iterations / elapsed if elapsed else float('inf'),
+        'p50_ms': _percentile_ms(samples, 50),
+        'p99_ms': _percentile_ms(samples, 99),
+        'peak_memory_mb': peak / 2 ** 20,
+    }
+    result.update(extra)
+    print(f"{case:<40} size={str(catalog_size):>8}  {result['throughput_per_s']:10.1f}/s  "
+          f"p50={result['p50_ms']:8.3f}ms  p99={result['p99_ms']:8.3f}ms  "
+          f"peak={result['peak_memory_mb']:8.2f}MB")
+    return result
+
+
+def skill_vocabulary():
+    from career_knowledge import COMPREHENSIVE_CAREER_KNOWLEDGE
+    return sorted({s.lower() for data in COMPREHENSIVE_CAREER_KNOWLEDGE.values() for s in data['skills']})
+
+
+def grow_catalog(core, target, rng):
+    """Insert synthetic careers until the catalog holds ``target`` rows."""
+    vocab = skill_vocabulary()
+    with core.engine.begin() as conn:
+        current = conn.execute(select(func.count()).select_from(core.Career.__table__)).scalar()
+        rows = []
+        for i in range(current, target):
+            words = rng.sample(vocab, 4) + rng.sample(FILLER, 3)
+            rows.append({
+                'name': f'Synthetic Career {i}',
+                'field': FIELDS[i % len(FIELDS)],
+                'description': ' '.join(words),
+                'avg_salary': 40000.0 + (i % 100) * 1000,
+                'growth_rate': float(i % 25),
+                'level': 'entry',
+            })
+            if len(rows) == 50000:
+                conn.execute(core.Career.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(core.Career.__table__.insert(), rows)
+        core.publish_catalog_versions(core.bump_catalog_version(conn, 'careers'))
+    # Core inserts bypass the ORM events, so tell the index to reload.
+    core.career_index.invalidate()
+
+
+def synthetic_knowledge(n_fields, rng):
+    """Knowledge base with ``n_fields`` fields shaped like the real one."""
+    from career_knowledge import COMPREHENSIVE_CAREER_KNOWLEDGE
+    template = next(iter(COMPREHENSIVE_CAREER_KNOWLEDGE.values()))
+    vocab = skill_vocabulary()
+    traits = sorted({t for data in COMPREHENSIVE_CAREER_KNOWLEDGE.values() for t in data['personality_traits']})
+    knowledge = {}
+    for i in range(n_fields):
+        field = dict(template)
+        field['skills'] = rng.sample(vocab, min(40, len(vocab)))
+        field['personality_traits'] = rng.sample(traits, min(8, len(traits)))
+        knowledge[f'field_{i}'] = field
+    return knowledge
+
+
+def quiz_answers(rng):
+    from career_knowledge import CAREER_ASSESSMENT_QUESTIONS
+    return [
+        {'question': q['question'], 'answer': rng.choice(q['options']), 'category': q['category']}
+        for q in CAREER_ASSESSMENT_QUESTIONS
+    ]
+
+
+def cold_start():
+    """Seconds spent importing the core module and bootstrapping the empty database."""
+    started = time.perf_counter()
+    import counselor_core as core
+    imported = time.perf_counter()
+    core.init_db()
+    initialised = time.perf_counter()
+    warm = core.warm_up()
+    return {
+        'import_s': imported - started,
+        'init_db_s': initialised - imported,
+        'warm_up_s': sum(warm.values()),
+    }
+
+
+def run_catalog_cases(args, rng):
+    import counselor_core as core
+
+    results = []
+    vocab = skill_vocabulary()
+    queries = [' '.join(rng.sample(vocab, 5)) for _ in range(64)]
+    for size in sorted(args.sizes):
+        grow_catalog(core, size, rng)
+        started = time.perf_counter()
+        core.career_index.snapshot()
+        build_s = time.perf_counter() - started
+        print(f"catalog size {size}: index built in {build_s:.2f}s")
+        iterations = args.iterations if size <= 100000 else max(args.iterations // 10, 5)
+        results.append(measure(
+            'recommend_careers_by_text', lambda i: core.recommend_careers_by_text(queries[i % 64], 5, approximate=False),
+            iterations, size, index_build_s=build_s
+        ))
+        if size >= 1000:
+            core.get_ann_index()
+            results.append(measure(
+                'recommend_careers_by_text[ann]', lambda i: core.recommend_careers_by_text(queries[i % 64], 5, approximate=True),
+                iterations, size
+            ))
+        results.append(measure(
+            'recommend_careers_by_text_batch[64]', lambda i: core.recommend_careers_by_text_batch(queries, 5, approximate=False),
+            max(iterations // 10, 3), size
+        ))
+    return results
+
+
+def run_knowledge_cases(args, rng):
+    import career_knowledge
+
+    results = []
+    vocab = skill_vocabulary()
+    real = career_knowledge.COMPREHENSIVE_CAREER_KNOWLEDGE
+    skills = [rng.sample(vocab, 12) for _ in range(64)]
+    personality = ['analytical', 'curious', 'creative', 'organized']
+    try:
+        for n_fields in args.kb_fields:
+            career_knowledge.COMPREHENSIVE_CAREER_KNOWLEDGE = real if n_fields == len(real) else synthetic_knowledge(n_fields, rng)
+            career_knowledge.recompile_knowledge()
+            results.append(measure(
+                'analyze_career_match', lambda i: career_knowledge.analyze_career_match(skills[i % 64], personality),
+                args.iterations, kb_fields=n_fields
+            ))
+            results.append(measure(
+                'get_career_recommendations_from_quiz',
+                lambda i: career_knowledge.get_career_recommendations_from_quiz(skills[i % 64], personality),
+                args.iterations, kb_fields=n_fields
+            ))
+    finally:
+        career_knowledge.COMPREHENSIVE_CAREER_KNOWLEDGE = real
+        career_knowledge.recompile_knowledge()
+
+    answers = [quiz_answers(rng) for _ in range(64)]
+    results.append(measure(
+        'process_quiz_results', lambda i: career_knowledge.process_quiz_results(answers[i % 64]), args.iterations
+    ))
+    return results
+
+
+def run_text_cases(args, rng):
+    try:
+        from skill_extraction import extract_skills_from_text
+        extract_skills_from_text('warm up')
+    except (ImportError, LookupError) as e:
+        print(f"extract_skills_from_text skipped: {e}")
+        return []
+    vocab = skill_vocabulary()
+    resumes = [
+        ' '.join(rng.choice(vocab + FILLER) for _ in range(600)) for _ in range(16)
+    ]
+    return [measure(
+        'extract_skills_from_text[resume]', lambda i: extract_skills_from_text(resumes[i % 16]),
+        max(args.iterations // 10, 5)
+    )]
+
+
+def compare(results, baseline_path, tolerance):
+    """Print regressions against a baseline file; return True if any were found."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    key = lambda r: (r['case'], r.get('catalog_size'), r.get('kb_fields'))
+    previous = {key(r): r for r in baseline}
+    regressed = False
+    for result in results:
+        before = previous.get(key(result))
+        if not before or not before['p50_ms']:
+            continue
+        change = result['p50_ms'] / before['p50_ms'] - 1
+        if change > tolerance:
+            regressed = True
+            print(f"REGRESSION {key(result)}: p50 {before['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms ({change:+.0%})")
+    return regressed
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--kb-fields', type=int, nargs='+', default=[6, 100, 1000])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results.json'))
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='directionwise-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['ARTIFACT_DIR'] = os.path.join(workdir, 'artifacts')
+    rng = random.Random(args.seed)
+
+    startup = cold_start()
+    print('cold start: ' + '  '.join(f'{k}={v:.3f}' for k, v in startup.items()))
+    results = run_catalog_cases(args, rng) + run_knowledge_cases(args, rng) + run_text_cases(args, rng)
+    report = {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'cold_start': startup,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Bloom filter for cheap "definitely not present" checks.
+
+Sized from the expected number of items and the acceptable false-positive
+rate. ``might_contain`` never answers False for an added item; a True answer
+has to be confirmed against the real data.
+"""
+import math
+import threading
+from itertools import islice
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Items hashed per vectorized step of add_many
+_CHUNK = 65536
+# Two independent 64-bit SipHash keys (16 bytes each) for double hashing
+_KEY1 = 'bloom-filter-h1!'
+_KEY2 = 'bloom-filter-h2!'
+
+
+class BloomFilter:
+    """Bit array with ``k`` positions per item from double hashing of two SipHash digests.
+
+    Items are hashed a whole array at a time with pandas' vectorized hasher,
+    so bulk loads cost no Python-level work per item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.n_bits = max(int(math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)), 8)
+        self.n_hashes = max(int(round(self.n_bits / self.capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+        self._steps = np.arange(self.n_hashes, dtype=np.uint64)
+        self._lock = threading.Lock()
+
+    def _positions(self, items: List[str]) -> np.ndarray:
+        """``(len(items), k)`` bit positions."""
+        values = np.array(items, dtype=object)
+        h1 = pd.util.hash_array(values, hash_key=_KEY1, categorize=False)
+        h2 = pd.util.hash_array(values, hash_key=_KEY2, categorize=False) | np.uint64(1)
+        # uint64 arithmetic wraps, identically for every item
+        return ((h1[:, None] + self._steps * h2[:, None]) % np.uint64(self.n_bits)).astype(np.int64)
+
+    def _set(self, positions: np.ndarray, n_items: int) -> None:
+        positions = positions.ravel()
+        with self._lock:
+            np.bitwise_or.at(self._bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+            self.count += n_items
+
+    def _test(self, positions: np.ndarray) -> np.ndarray:
+        return np.all(self._bits[positions >> 3] & (1 << (positions & 7)).astype(np.uint8), axis=1)
+
+    def add(self, item: str) -> None:
+        self._set(self._positions([item]), 1)
+
+    def add_many(self, items: Iterable[str]) -> None:
+        """Add ``items``, hashed in vectorized chunks."""
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, _CHUNK))
+            if not chunk:
+                return
+            self._set(self._positions(chunk), len(chunk))
+
+    def might_contain(self, item: str) -> bool:
+        return bool(self._test(self._positions([item]))[0])
+
+    def might_contain_many(self, items: List[str]) -> np.ndarray:
+        """Boolean array: ``might_contain`` for each item."""
+        if not items:
+            return np.zeros(0, dtype=bool)
+        return self._test(self._positions(list(items)))
+
+    __contains__ = might_contain
+
+    @property
+    def saturated(self) -> bool:
+        """True once more items were added than it was sized for, so the error rate is exceeded."""
+        return self.count > self.capacity
@@ -0,0 +1,35 @@
+"""Prepare the database and model caches for the app.
+
+    python bootstrap.py               # create tables, migrate, seed an empty catalog
+    python bootstrap.py --no-seed     # schema and migrations only
+    python bootstrap.py --warm-up     # also build the cached indexes and models
+
+Warming up at deploy time writes the TF-IDF, frame and CF artifacts to
+``ARTIFACT_DIR``, so app processes start from memory-mapped files instead of
+fitting them on their first request. Every step is timed.
+"""
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prepare the database and model caches for the app.')
+    parser.add_argument('--no-seed', action='store_true', help='do not add sample data to an empty catalog')
+    parser.add_argument('--warm-up', action='store_true', help='build and persist the recommendation caches')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    import counselor_core
+    print(f"{'import':<22}{time.perf_counter() - started:8.3f}s")
+
+    started = time.perf_counter()
+    counselor_core.init_db(seed=not args.no_seed)
+    print(f"{'init_db':<22}{time.perf_counter() - started:8.3f}s")
+
+    if args.warm_up:
+        for step, seconds in counselor_core.warm_up().items():
+            print(f"{step:<22}{seconds:8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
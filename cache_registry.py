@@ -0,0 +1,67 @@
+"""Process-local caches tagged with catalog versions.
+
+Every write to the career catalog bumps a counter in the ``catalog_version``
+table (see ``counselor_core.bump_catalog_version``). A ``CacheRegistry`` reads
+those counters at most once per ``ttl`` seconds and tags each cached value
+with the versions it was built from; a reader that finds a stale tag rebuilds
+the value and replaces the entry in one assignment, so concurrent readers see
+either the old value or the new one, never a mix.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+class CacheRegistry:
+    """Named cache entries that reload when the catalog versions they depend on change."""
+
+    def __init__(self, read_versions: Callable[[], Dict[str, int]], ttl: float):
+        self.read_versions = read_versions
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._checked: Optional[float] = None
+        self._entries: Dict[str, Tuple[tuple, object]] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def versions(self, refresh: bool = False) -> Dict[str, int]:
+        """Current catalog versions, re-read from the database when older than ``ttl``."""
+        with self._lock:
+            if refresh or self._checked is None or time.monotonic() - self._checked > self.ttl:
+                self._versions = dict(self.read_versions())
+                self._checked = time.monotonic()
+            return dict(self._versions)
+
+    def note_versions(self, versions: Dict[str, int]) -> None:
+        """Record versions this process just committed, without waiting for the TTL."""
+        with self._lock:
+            for name, version in versions.items():
+                self._versions[name] = max(self._versions.get(name, 0), version)
+
+    def tag(self, depends_on: Iterable[str]) -> tuple:
+        versions = self.versions()
+        return tuple(versions.get(name, 0) for name in depends_on)
+
+    def get(self, name: str, depends_on: Iterable[str], build: Callable[[], object]):
+        """Return the cached ``name``, calling ``build()`` if it is missing or stale."""
+        depends_on = tuple(depends_on)
+        tag = self.tag(depends_on)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == tag:
+            return entry[1]
+        with self._lock:
+            build_lock = self._build_locks.setdefault(name, threading.Lock())
+        with build_lock:
+            # Another thread may have rebuilt it while we waited.
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == tag:
+                return entry[1]
+            value = build()
+            self._entries[name] = (tag, value)
+            return value
+
+    def invalidate(self, *names: str) -> None:
+        """Drop the named entries, or all of them."""
+        with self._lock:
+            for name in names or list(self._entries):
+                self._entries.pop(name, None)
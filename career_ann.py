@@ -0,0 +1,126 @@
+"""Approximate nearest-neighbour search over career TF-IDF vectors.
+
+The index is IVF-style: career vectors are reduced to a small dense space with
+a truncated SVD projection, clustered with spherical k-means, and stored as
+inverted lists per cluster. A query probes the ``n_probe`` closest clusters
+and re-ranks the candidates exactly against the original sparse vectors, so
+the returned scores are true cosine similarities and only recall is
+approximate. Raising ``n_probe`` trades speed for recall; ``n_probe ==
+n_lists`` is an exhaustive search.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def _normalize_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        part = np.argpartition(-scores, k - 1)[:k]
+    else:
+        part = np.arange(scores.shape[0])
+    return part[np.argsort(-scores[part], kind='stable')]
+
+
+class CareerANNIndex:
+    """Inverted-file index with exact re-ranking over L2-normalised sparse rows."""
+
+    def __init__(self, n_components: int = 128, n_lists: Optional[int] = None,
+                 n_probe: int = 16, n_iter: int = 10, seed: int = 0):
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.seed = seed
+        self.projection = None
+        self.centroids = None
+        self.list_offsets = None
+        self.list_members = None
+        self.vectors = None
+
+    def _project(self, vectors) -> np.ndarray:
+        reduced = vectors @ self.projection
+        return _normalize_rows(np.asarray(reduced, dtype=np.float32))
+
+    def _assign(self, reduced: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        labels = np.empty(reduced.shape[0], dtype=np.int64)
+        for start in range(0, reduced.shape[0], chunk_size):
+            block = reduced[start:start + chunk_size]
+            labels[start:start + chunk_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return labels
+
+    def build(self, vectors: sparse.csr_matrix) -> 'CareerANNIndex':
+        """Fit projection and clusters on the catalog vectors."""
+        rng = np.random.default_rng(self.seed)
+        n_rows, n_features = vectors.shape
+        self.vectors = sparse.csr_matrix(vectors)
+        n_components = max(1, min(self.n_components, n_rows - 1, n_features - 1))
+        if n_rows > 1 and n_features > 1:
+            # Truncated SVD keeps the dominant topic directions of the catalog;
+            # fitting it on a sample bounds the cost for very large catalogs.
+            sample = self.vectors[rng.choice(n_rows, min(n_rows, 50000), replace=False)]
+            from sklearn.utils.extmath import randomized_svd
+            _, _, vt = randomized_svd(sample, n_components, random_state=self.seed)
+            self.projection = vt.T.astype(np.float32)
+        else:
+            self.projection = np.eye(n_features, n_components, dtype=np.float32)
+        reduced = self._project(self.vectors)
+
+        n_lists = self.n_lists or int(np.sqrt(max(n_rows, 1)))
+        n_lists = max(1, min(n_lists, n_rows))
+        self.centroids = reduced[rng.choice(n_rows, n_lists, replace=False)] if n_rows else \
+            np.zeros((1, n_components), dtype=np.float32)
+
+        labels = np.zeros(n_rows, dtype=np.int64)
+        for _ in range(self.n_iter if n_rows else 0):
+            labels = self._assign(reduced)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, reduced)
+            empty = ~sums.any(axis=1)
+            # Re-seed empty clusters from random rows so every list stays usable.
+            sums[empty] = reduced[rng.choice(n_rows, int(empty.sum()))]
+            self.centroids = _normalize_rows(sums)
+        if n_rows:
+            labels = self._assign(reduced)
+
+        self.list_members = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=self.centroids.shape[0])
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self
+
+    def search(self, query_vectors: sparse.csr_matrix, top_k: int,
+               n_probe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(indices, scores)`` of shape (n_queries, k), best first.
+
+        Rows with fewer than k candidates are padded with index -1 and score 0.
+        """
+        n_probe = min(n_probe or self.n_probe, self.centroids.shape[0])
+        query_vectors = sparse.csr_matrix(query_vectors)
+        n_queries = query_vectors.shape[0]
+        k = min(top_k, self.vectors.shape[0])
+        indices = np.full((n_queries, k), -1, dtype=np.int64)
+        scores = np.zeros((n_queries, k), dtype=np.float32)
+
+        probe_scores = self._project(query_vectors) @ self.centroids.T
+        for row in range(n_queries):
+            probes = _top_k(probe_scores[row], n_probe)
+            candidates = np.concatenate([
+                self.list_members[self.list_offsets[p]:self.list_offsets[p + 1]] for p in probes
+            ])
+            if candidates.size == 0:
+                continue
+            exact = (self.vectors[candidates] @ query_vectors[row].T).toarray().ravel()
+            best = _top_k(exact, k)
+            indices[row, :best.size] = candidates[best]
+            scores[row, :best.size] = exact[best]
+        return indices, scores
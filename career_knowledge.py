@@ -0,0 +1,545 @@
+"""Offline career knowledge base and the field-level matching built on it.
+
+Kept free of Streamlit so the recommenders and background workers can import it.
+"""
+
+# Enhanced Career Knowledge Base for Intelligent Offline Analysis
+COMPREHENSIVE_CAREER_KNOWLEDGE = {
+    "technology": {
+        "skills": ["programming", "coding", "software", "computer", "digital", "technical", "analytical", "problem-solving", "logic", "mathematics", "data", "web", "mobile", "database", "cloud", "ai", "machine learning", "cybersecurity", "networking", "python", "java", "javascript", "sql", "html", "css", "react", "node.js", "docker", "kubernetes", "aws", "azure", "git", "agile", "scrum", "devops", "api", "rest", "graphql", "microservices", "blockchain", "iot", "robotics"],
+        "careers": [
+            {"name": "Software Engineer", "description": "Design, develop, and maintain software applications", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["Programming", "Problem Solving", "Software Design", "Testing", "Version Control"]},
+            {"name": "Data Scientist", "description": "Analyze complex data to help organizations make decisions", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Statistics", "Machine Learning", "Python/R", "Data Visualization", "SQL"]},
+            {"name": "Web Developer", "description": "Create and maintain websites and web applications", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["HTML/CSS", "JavaScript", "Frontend Frameworks", "Backend Development", "Database"]},
+            {"name": "AI Engineer", "description": "Develop artificial intelligence and machine learning systems", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 400,000+", "skills_required": ["Machine Learning", "Deep Learning", "Python", "Neural Networks", "AI Frameworks"]},
+            {"name": "Cybersecurity Analyst", "description": "Protect systems from cyber threats and attacks", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Security", "Networking", "Incident Response", "Risk Assessment", "Security Tools"]},
+            {"name": "DevOps Engineer", "description": "Bridge development and operations for efficient software delivery", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["CI/CD", "Cloud Platforms", "Automation", "Monitoring", "Infrastructure"]},
+            {"name": "Product Manager", "description": "Lead product strategy and development from concept to launch", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 90,000 - 350,000+", "skills_required": ["Product Strategy", "Market Research", "User Experience", "Agile", "Leadership"]},
+            {"name": "UX Designer", "description": "Create user-centered design solutions for digital products", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["User Research", "Wireframing", "Prototyping", "Visual Design", "User Testing"]},
+            {"name": "Cloud Architect", "description": "Design and implement cloud infrastructure solutions", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 120,000 - 400,000+", "skills_required": ["Cloud Platforms", "Architecture Design", "Networking", "Security", "Automation"]},
+            {"name": "Blockchain Developer", "description": "Build decentralized applications and smart contracts", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Blockchain", "Smart Contracts", "Cryptography", "Web3", "Solidity"]},
+            {"name": "Frontend Developer", "description": "Build user-facing web applications and interfaces", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 220,000+", "skills_required": ["HTML/CSS", "JavaScript", "React/Vue", "Responsive Design", "User Experience"]},
+            {"name": "Backend Developer", "description": "Develop server-side logic and database systems", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 65,000 - 250,000+", "skills_required": ["Python/Java/Node.js", "Databases", "APIs", "Server Architecture", "Security"]}
+        ],
+        "personality_traits": ["analytical", "logical", "detail-oriented", "problem-solver", "innovative", "curious", "patient", "systematic"],
+        "growth_areas": ["Artificial Intelligence", "Cloud Computing", "Cybersecurity", "Data Science", "Mobile Development", "Web Development", "DevOps", "Blockchain", "IoT", "Robotics"],
+        "salary_range": "PKR 50,000 - 200,000+",
+        "demand_level": "Very High",
+        "work_environment": "Office/Remote, Collaborative, Fast-paced",
+        "market_trends": [85, 88, 92, 95, 98, 96, 94, 97, 99, 96, 93, 95],
+        "growth_rate": "25% annually",
+        "emerging_technologies": ["AI/ML", "Edge Computing", "Quantum Computing", "5G", "AR/VR"]
+    },
+    "healthcare": {
+        "skills": ["medical", "health", "care", "patient", "clinical", "diagnostic", "treatment", "nursing", "pharmacy", "therapy", "rehabilitation", "research", "laboratory", "surgery", "emergency", "preventive", "wellness"],
+        "careers": [
+            {"name": "Medical Doctor", "description": "Diagnose and treat patients' illnesses and injuries", "experience": "5+ years (after medical school)", "salary": "PKR 150,000 - 500,000+", "skills_required": ["Medical Knowledge", "Patient Care", "Diagnosis", "Treatment Planning", "Communication"]},
+            {"name": "Nurse", "description": "Provide patient care and support in healthcare settings", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Patient Care", "Medical Procedures", "Communication", "Critical Thinking", "Compassion"]},
+            {"name": "Pharmacist", "description": "Dispense medications and provide pharmaceutical care", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Pharmacy", "Medication Management", "Patient Counseling", "Drug Interactions", "Regulatory Compliance"]},
+            {"name": "Physiotherapist", "description": "Help patients recover movement and manage pain", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 220,000+", "skills_required": ["Physical Therapy", "Patient Assessment", "Treatment Planning", "Exercise Prescription", "Manual Therapy"]},
+            {"name": "Medical Laboratory Technologist", "description": "Perform laboratory tests for disease diagnosis", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["Laboratory Techniques", "Medical Testing", "Quality Control", "Equipment Operation", "Safety Protocols"]},
+            {"name": "Radiologist", "description": "Interpret medical images for diagnosis", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 200,000 - 600,000+", "skills_required": ["Medical Imaging", "Diagnosis", "Radiology Equipment", "Patient Safety", "Medical Knowledge"]},
+            {"name": "Surgeon", "description": "Perform surgical procedures to treat conditions", "experience": "5+ years (after medical school + residency)", "salary": "PKR 300,000 - 800,000+", "skills_required": ["Surgical Skills", "Medical Knowledge", "Hand-Eye Coordination", "Decision Making", "Team Leadership"]},
+            {"name": "Dentist", "description": "Provide oral health care and dental treatments", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 350,000+", "skills_required": ["Dental Procedures", "Patient Care", "Dental Equipment", "Treatment Planning", "Communication"]},
+            {"name": "Psychologist", "description": "Help patients with mental health and behavioral issues", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Psychology", "Therapy", "Assessment", "Research", "Empathy"]},
+            {"name": "Healthcare Administrator", "description": "Manage healthcare facilities and operations", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Healthcare Management", "Operations", "Leadership", "Regulatory Compliance", "Financial Management"]}
+        ],
+        "personality_traits": ["empathetic", "caring", "patient", "detail-oriented", "responsible", "calm", "communicative", "team-oriented"],
+        "growth_areas": ["Telemedicine", "Preventive Healthcare", "Mental Health", "Geriatric Care", "Pediatric Care", "Emergency Medicine"],
+        "salary_range": "PKR 80,000 - 300,000+",
+        "demand_level": "Very High",
+        "work_environment": "Hospitals/Clinics, Shift work, High-stress",
+        "market_trends": [78, 82, 85, 88, 90, 92, 94, 92, 90, 88, 85, 82],
+        "growth_rate": "18% annually",
+        "emerging_technologies": ["Telemedicine", "AI Diagnostics", "Robotic Surgery", "Wearable Health Tech", "Precision Medicine"]
+    },
+    "business": {
+        "skills": ["management", "leadership", "strategy", "marketing", "sales", "finance", "accounting", "entrepreneurship", "communication", "negotiation", "planning", "organization", "analysis", "decision-making", "teamwork", "customer service", "excel", "powerpoint", "word", "project management", "risk management", "quality assurance", "supply chain", "logistics", "operations", "business development", "market research", "competitive analysis", "budgeting", "forecasting", "performance metrics", "kpi", "roi", "swot analysis"],
+        "careers": [
+            {"name": "Business Manager", "description": "Oversee business operations and lead teams", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Leadership", "Strategic Planning", "Operations Management", "Team Management", "Financial Acumen"]},
+            {"name": "Marketing Manager", "description": "Develop and execute marketing strategies", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Marketing Strategy", "Digital Marketing", "Brand Management", "Market Research", "Campaign Management"]},
+            {"name": "Sales Manager", "description": "Lead sales teams and drive revenue growth", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 75,000 - 280,000+", "skills_required": ["Sales Leadership", "Customer Relationship", "Team Management", "Sales Strategy", "Performance Metrics"]},
+            {"name": "Financial Analyst", "description": "Analyze financial data and provide insights", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Financial Analysis", "Excel", "Financial Modeling", "Accounting", "Data Analysis"]},
+            {"name": "Marketing Specialist", "description": "Plan and execute targeted marketing campaigns across channels", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["SEO/SEM", "Content Marketing", "Analytics", "Social Media", "Campaigns"]},
+            {"name": "Digital Marketing Specialist", "description": "Focus on online marketing channels and digital campaigns", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 220,000+", "skills_required": ["Digital Marketing", "SEO/SEM", "Social Media", "Email Marketing", "Analytics"]},
+            {"name": "Accountant", "description": "Manage financial records and ensure compliance", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["Accounting", "Financial Reporting", "Tax Preparation", "Compliance", "Attention to Detail"]},
+            {"name": "Entrepreneur", "description": "Start and grow new business ventures", "experience": "Varies", "salary": "Variable (can be very high)", "skills_required": ["Business Planning", "Risk Taking", "Innovation", "Leadership", "Financial Management"]},
+            {"name": "Business Consultant", "description": "Provide expert advice to improve business performance", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 100,000 - 400,000+", "skills_required": ["Business Strategy", "Problem Solving", "Communication", "Industry Knowledge", "Analytical Thinking"]},
+            {"name": "HR Manager", "description": "Manage human resources and employee relations", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["HR Management", "Employee Relations", "Recruitment", "Compliance", "Communication"]},
+            {"name": "Operations Manager", "description": "Optimize business processes and efficiency", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 75,000 - 280,000+", "skills_required": ["Operations Management", "Process Improvement", "Supply Chain", "Quality Control", "Leadership"]},
+            {"name": "Project Manager", "description": "Lead projects from initiation to completion", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Project Management", "Leadership", "Risk Management", "Communication", "Planning"]}
+        ],
+        "personality_traits": ["leadership", "communicative", "strategic", "organized", "results-driven", "confident", "adaptable", "team-oriented"],
+        "growth_areas": ["Digital Marketing", "E-commerce", "Fintech", "Consulting", "Startups", "International Business", "Business Intelligence", "Process Automation", "Sustainability"],
+        "salary_range": "PKR 60,000 - 250,000+",
+        "demand_level": "High",
+        "work_environment": "Office/Corporate, Client-facing, Performance-driven",
+        "market_trends": [72, 75, 78, 80, 82, 85, 88, 85, 82, 80, 78, 75],
+        "growth_rate": "15% annually",
+        "emerging_technologies": ["Business Intelligence", "Process Automation", "Digital Transformation", "Sustainability", "Remote Work Solutions"]
+    },
+    "education": {
+        "skills": ["teaching", "education", "learning", "instruction", "curriculum", "mentoring", "training", "academic", "research", "communication", "patience", "creativity", "organization", "assessment", "guidance", "motivation", "learn", "knowledge", "curious", "explore", "discover", "understand", "grow", "study", "curiosity"],
+        "careers": [
+            {"name": "Teacher", "description": "Educate students in various subjects and grade levels", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Teaching", "Curriculum Development", "Classroom Management", "Assessment", "Communication"]},
+            {"name": "Professor", "description": "Teach at university level and conduct research", "experience": "5+ years (PhD required)", "salary": "PKR 80,000 - 200,000+", "skills_required": ["Research", "Teaching", "Academic Writing", "Mentoring", "Subject Expertise"]},
+            {"name": "Educational Administrator", "description": "Manage educational institutions and programs", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 180,000+", "skills_required": ["Educational Leadership", "Administration", "Policy Development", "Budget Management", "Strategic Planning"]},
+            {"name": "Curriculum Developer", "description": "Design and develop educational programs", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 150,000+", "skills_required": ["Curriculum Design", "Educational Theory", "Assessment Design", "Content Development", "Research"]},
+            {"name": "Educational Consultant", "description": "Provide expert advice on educational matters", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 200,000+", "skills_required": ["Educational Expertise", "Consulting", "Problem Solving", "Communication", "Industry Knowledge"]},
+            {"name": "Special Education Teacher", "description": "Work with students who have special needs", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 130,000+", "skills_required": ["Special Education", "Patience", "Adaptability", "Individualized Instruction", "Collaboration"]},
+            {"name": "Librarian", "description": "Manage library resources and assist users", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Information Management", "Customer Service", "Research Skills", "Technology", "Organization"]},
+            {"name": "Corporate Trainer", "description": "Train employees in professional skills", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 180,000+", "skills_required": ["Training", "Adult Learning", "Presentation Skills", "Content Development", "Assessment"]},
+            {"name": "Online Educator", "description": "Teach courses through digital platforms", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["Online Teaching", "Technology", "Content Creation", "Student Engagement", "Digital Tools"]},
+            {"name": "Guidance Counselor", "description": "Provide career and academic guidance to students", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 150,000+", "skills_required": ["Counseling", "Career Guidance", "Student Support", "Communication", "Empathy"]}
+        ],
+        "personality_traits": ["patient", "communicative", "creative", "organized", "empathic", "motivational", "knowledgeable", "adaptable", "learning", "curious", "inspiring"],
+        "growth_areas": ["Online Education", "Special Education", "STEM Education", "Early Childhood Education", "Adult Education", "Educational Technology", "Personalized Learning", "Lifelong Learning"],
+        "salary_range": "PKR 40,000 - 150,000+",
+        "demand_level": "High",
+        "work_environment": "Schools/Universities, Structured, Student-focused",
+        "market_trends": [68, 70, 72, 75, 78, 80, 82, 80, 78, 75, 72, 70],
+        "growth_rate": "12% annually",
+        "emerging_technologies": ["EdTech", "Virtual Reality Learning", "AI Tutoring", "Adaptive Learning", "Digital Assessment"]
+    },
+    "creative_arts": {
+        "skills": ["creative", "artistic", "design", "visual", "graphic", "multimedia", "photography", "video", "animation", "illustration", "branding", "typography", "color", "composition", "storytelling", "innovation", "aesthetics"],
+        "careers": [
+            {"name": "Graphic Designer", "description": "Create visual content for print and digital media", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 35,000 - 120,000+", "skills_required": ["Design Software", "Typography", "Color Theory", "Layout Design", "Creativity"]},
+            {"name": "UI/UX Designer", "description": "Design user interfaces and user experiences", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 180,000+", "skills_required": ["User Research", "Wireframing", "Prototyping", "Visual Design", "User Testing"]},
+            {"name": "Web Designer", "description": "Create visually appealing and functional websites", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 150,000+", "skills_required": ["Web Design", "HTML/CSS", "Design Software", "Responsive Design", "User Experience"]},
+            {"name": "Illustrator", "description": "Create original artwork and illustrations", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 30,000 - 120,000+", "skills_required": ["Drawing", "Digital Art", "Creativity", "Artistic Skills", "Software Proficiency"]},
+            {"name": "Photographer", "description": "Capture images for various purposes", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 25,000 - 100,000+", "skills_required": ["Photography", "Composition", "Lighting", "Equipment", "Post-processing"]},
+            {"name": "Video Editor", "description": "Edit and produce video content", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 150,000+", "skills_required": ["Video Editing", "Storytelling", "Software Proficiency", "Creativity", "Attention to Detail"]},
+            {"name": "Animator", "description": "Create animated content and characters", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 180,000+", "skills_required": ["Animation", "Character Design", "Storyboarding", "Software Skills", "Creativity"]},
+            {"name": "Art Director", "description": "Lead creative projects and artistic vision", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 250,000+", "skills_required": ["Creative Leadership", "Project Management", "Artistic Vision", "Team Management", "Communication"]},
+            {"name": "Creative Director", "description": "Oversee creative strategy and brand development", "experience": "5+ years senior", "salary": "PKR 100,000 - 300,000+", "skills_required": ["Creative Strategy", "Brand Development", "Leadership", "Innovation", "Business Acumen"]},
+            {"name": "Brand Designer", "description": "Create and maintain brand identities", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 200,000+", "skills_required": ["Brand Strategy", "Logo Design", "Visual Identity", "Marketing", "Creativity"]},
+            {"name": "Product Designer", "description": "Design user-centered products and experiences", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 250,000+", "skills_required": ["User Research", "Prototyping", "Visual Design", "User Testing", "Collaboration"]}
+        ],
+        "personality_traits": ["creative", "artistic", "innovative", "detail-oriented", "expressive", "imaginative", "collaborative", "trend-aware"],
+        "growth_areas": ["Digital Design", "User Experience Design", "Brand Design", "Motion Graphics", "3D Design", "Social Media Design"],
+        "salary_range": "PKR 35,000 - 150,000+",
+        "demand_level": "Medium-High",
+        "work_environment": "Creative Studios, Flexible, Project-based",
+        "market_trends": [65, 68, 70, 72, 75, 78, 80, 78, 75, 72, 70, 68],
+        "growth_rate": "10% annually",
+        "emerging_technologies": ["3D Design", "Virtual Reality", "AI Art", "Motion Graphics", "Digital Illustration"]
+    },
+    "science_research": {
+        "skills": ["research", "scientific", "laboratory", "experiment", "analysis", "data", "statistics", "methodology", "hypothesis", "investigation", "discovery", "innovation", "critical thinking", "observation", "documentation", "collaboration"],
+        "careers": [
+            {"name": "Research Scientist", "description": "Conduct scientific research and experiments", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Research Methods", "Data Analysis", "Scientific Writing", "Laboratory Skills", "Critical Thinking"]},
+            {"name": "Laboratory Technician", "description": "Support research by performing lab tests", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 40,000 - 120,000+", "skills_required": ["Laboratory Techniques", "Equipment Operation", "Safety Protocols", "Data Recording", "Attention to Detail"]},
+            {"name": "Data Scientist", "description": "Analyze complex data sets for insights", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 300,000+", "skills_required": ["Statistics", "Machine Learning", "Programming", "Data Visualization", "Problem Solving"]},
+            {"name": "Biologist", "description": "Study living organisms and their interactions", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 60,000 - 200,000+", "skills_required": ["Biology", "Research Methods", "Laboratory Skills", "Data Analysis", "Scientific Writing"]},
+            {"name": "Chemist", "description": "Study chemical substances and reactions", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 65,000 - 220,000+", "skills_required": ["Chemistry", "Laboratory Skills", "Analytical Methods", "Safety Protocols", "Research"]},
+            {"name": "Physicist", "description": "Study matter, energy, and their interactions", "experience": "3-5 years mid, 5+ years senior", "salary": "PKR 80,000 - 280,000+", "skills_required": ["Physics", "Mathematics", "Research Methods", "Theoretical Analysis", "Problem Solving"]},
+            {"name": "Environmental Scientist", "description": "Study environmental issues and solutions", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 55,000 - 180,000+", "skills_required": ["Environmental Science", "Field Research", "Data Analysis", "Policy Knowledge", "Problem Solving"]},
+            {"name": "Research Analyst", "description": "Analyze research data and prepare reports", "experience": "0-2 years entry, 2-5 years mid, 5+ years senior", "salary": "PKR 45,000 - 150,000+", "skills_required": ["Data Analysis", "Research Methods", "Report Writing", "Statistical Analysis", "Critical Thinking"]},
+            {"name": "Clinical Researcher", "description": "Conduct clinical trials and medical research", "experience": "2-5 years mid, 5+ years senior", "salary": "PKR 70,000 - 250,000+", "skills_required": ["Clinical Research", "Medical Knowledge", "Data Collection", "Regulatory Compliance", "Patient Safety"]},
+            {"name": "Quality Control Specialist", "description": "Ensure products meet quality standards", "experience": "1-3 years entry, 3-5 years mid, 5+ years senior", "salary": "PKR 50,000 - 160,000+", "skills_required": ["Quality Control", "Testing Methods", "Documentation", "Attention to Detail", "Problem Solving"]}
+        ],
+        "personality_traits": ["analytical", "curious", "patient", "detail-oriented", "logical", "innovative", "persistent", "collaborative"],
+        "growth_areas": ["Biotechnology", "Environmental Science", "Data Science", "Medical Research", "Renewable Energy", "Artificial Intelligence"],
+        "salary_range": "PKR 50,000 - 200,000+",
+        "demand_level": "High",
+        "work_environment": "Laboratories/Research Centers, Structured, Discovery-focused",
+        "market_trends": [70, 72, 75, 78, 80, 82, 85, 82, 80, 78, 75, 72],
+        "growth_rate": "20% annually",
+        "emerging_technologies": ["CRISPR Gene Editing", "Quantum Computing", "Nanotechnology", "Biotechnology", "Clean Energy"]
+    }
+}
+
+# Careers whose catalog field does not say which knowledge-base field fits best
+CAREER_FIELD_OVERRIDES = {
+    'ux designer': 'technology',
+    'graphic designer': 'creative_arts',
+    'marketing specialist': 'business',
+    'financial analyst': 'business',
+    'ui/ux designer': 'creative_arts'
+}
+
+# Catalog field names mapped onto knowledge-base field keys
+FIELD_ALIASES = {
+    'design': 'creative_arts',
+    'marketing': 'business',
+    'finance': 'business',
+    'technology': 'technology',
+    'healthcare': 'healthcare',
+    'education': 'education',
+    'science': 'science_research',
+    'research': 'science_research',
+    'arts': 'creative_arts',
+    'creative': 'creative_arts',
+    'business': 'business',
+    'management': 'business',
+    'administration': 'business'
+}
+
+
+def career_field_key(career_name, career_field, default='technology'):
+    """Knowledge-base field key for a catalog career, or ``default`` if none fits."""
+    field_key = str(career_field or '').lower().replace(' ', '_')
+    name = str(career_name or '').lower()
+
+    # Try specific career mapping first
+    if name in CAREER_FIELD_OVERRIDES:
+        return CAREER_FIELD_OVERRIDES[name]
+
+    # Try direct field match
+    if field_key in COMPREHENSIVE_CAREER_KNOWLEDGE:
+        return field_key
+
+    # Try mapped field
+    mapped_field = FIELD_ALIASES.get(field_key)
+    if mapped_field and mapped_field in COMPREHENSIVE_CAREER_KNOWLEDGE:
+        return mapped_field
+
+    return default
+
+
+def compile_knowledge(knowledge):
+    """Precompute lowercased lookup tables for a knowledge base.
+
+    Returns a dict with per-field skill and trait sets, the skill -> fields
+    and trait -> fields inverted indexes, and the raw skill-list length each
+    field's score is normalised by.
+    """
+    compiled = {
+        "field_skills": {},
+        "field_traits": {},
+        "skill_fields": {},
+        "trait_fields": {},
+        "skill_counts": {},
+    }
+    for field, data in knowledge.items():
+        skills = {s.lower() for s in data.get("skills", [])}
+        traits = {p.lower() for p in data.get("personality_traits", [])}
+        compiled["field_skills"][field] = frozenset(skills)
+        compiled["field_traits"][field] = frozenset(traits)
+        compiled["skill_counts"][field] = len(data.get("skills", []))
+        for skill in skills:
+            compiled["skill_fields"].setdefault(skill, []).append(field)
+        for trait in traits:
+            compiled["trait_fields"].setdefault(trait, []).append(field)
+    return compiled
+
+
+_compiled = compile_knowledge(COMPREHENSIVE_CAREER_KNOWLEDGE)
+
+
+def recompile_knowledge():
+    """Rebuild the lookup tables after COMPREHENSIVE_CAREER_KNOWLEDGE is edited."""
+    global _compiled
+    _compiled = compile_knowledge(COMPREHENSIVE_CAREER_KNOWLEDGE)
+
+
+def field_skill_set(field):
+    """Lowercased skills of a knowledge-base field."""
+    return _compiled["field_skills"].get(field, frozenset())
+
+
+def field_trait_set(field):
+    """Lowercased personality traits of a knowledge-base field."""
+    return _compiled["field_traits"].get(field, frozenset())
+
+
+def analyze_career_match(user_skills, user_personality):
+    """Analyze career match using comprehensive knowledge base
+
+    Matches are counted through the inverted indexes, so the work grows with
+    the user's own skills and traits rather than with the knowledge base.
+    """
+    skill_matches = {}
+    for skill in user_skills:
+        for field in _compiled["skill_fields"].get(skill.lower(), ()):
+            skill_matches[field] = skill_matches.get(field, 0) + 1
+    personality_matches = {}
+    for trait in user_personality:
+        for field in _compiled["trait_fields"].get(trait.lower(), ()):
+            personality_matches[field] = personality_matches.get(field, 0) + 1
+    
+    career_scores = {}
+    for field, data in COMPREHENSIVE_CAREER_KNOWLEDGE.items():
+        skill_match = skill_matches.get(field, 0)
+        personality_match = personality_matches.get(field, 0)
+        
+        total_score = (skill_match * 0.7) + (personality_match * 0.3)
+        normalized_score = min(total_score / max(_compiled["skill_counts"][field], 1), 1.0)
+        
+        career_scores[field] = {
+            "score": normalized_score,
+            "skill_match": skill_match,
+            "personality_match": personality_match,
+            "careers": data["careers"],
+            "growth_areas": data["growth_areas"],
+            "salary_range": data["salary_range"],
+            "demand_level": data["demand_level"],
+            "work_environment": data["work_environment"]
+        }
+    
+    return career_scores
+
+def get_personalized_career_insights(user_skills, user_personality):
+    """Get personalized career insights and recommendations"""
+    career_analysis = analyze_career_match(user_skills, user_personality)
+    
+    # Best score; ties keep knowledge-base order
+    top_field = max(career_analysis.items(), key=lambda x: x[1]["score"], default=None)
+    
+    insights = {
+        "top_field": top_field[0] if top_field else None,
+        "recommended_careers": [],
+        "skill_gaps": [],
+        "growth_opportunities": []
+    }
+    
+    if top_field:
+        insights["recommended_careers"] = top_field[1]["careers"][:5]
+        insights["growth_opportunities"] = top_field[1]["growth_areas"]
+        
+        # Identify skill gaps
+        top_skills = COMPREHENSIVE_CAREER_KNOWLEDGE[top_field[0]]["skills"]
+        user_skill_set = {s.lower() for s in user_skills}
+        missing_skills = [skill for skill in top_skills[:10] if skill.lower() not in user_skill_set]
+        insights["skill_gaps"] = missing_skills[:5]
+    
+    return insights
+
+
+def get_career_recommendations_from_quiz(user_skills, user_personality, limit=5):
+    """Get career recommendations based on quiz results using comprehensive knowledge base"""
+    # Normalize inputs
+    safe_user_skills = [str(s).strip() for s in (user_skills or []) if s]
+    safe_user_personality = [str(p).strip() for p in (user_personality or []) if p]
+    
+    # Use the comprehensive career analysis
+    insights = get_personalized_career_insights(safe_user_skills, safe_user_personality)
+    
+    if not insights.get("top_field"):
+        return []
+    
+    # Get field data safely
+    field_key = insights["top_field"]
+    field_data = COMPREHENSIVE_CAREER_KNOWLEDGE.get(field_key, {})
+    field_skills = field_skill_set(field_key)
+    field_traits = field_trait_set(field_key)
+    denom = max(len(field_data.get("skills", [])), 1)
+    
+    # The match depends only on the field, so it is computed once for all careers
+    skill_match = sum(1 for skill in safe_user_skills if skill.lower() in field_skills)
+    personality_match = sum(1 for trait in safe_user_personality if trait.lower() in field_traits)
+    total_score = (skill_match * 0.7) + (personality_match * 0.3)
+    normalized_score = min(total_score / denom, 1.0)
+    
+    recommendations = []
+    for i, career_name in enumerate((insights.get("recommended_careers") or [])[:limit]):
+        recommendations.append({
+            'career': {
+                'name': str(career_name),
+                'field': field_key,
+                'description': f"Career in {field_key} field",
+                'demand_level': field_data.get('demand_level', 'N/A'),
+                'salary_range': field_data.get('salary_range', 'N/A')
+            },
+            'similarity_score': float(normalized_score),
+            'skill_match': int(skill_match),
+            'personality_match': int(personality_match)
+        })
+    
+    # Sort by similarity score
+    recommendations.sort(key=lambda x: x.get('similarity_score', 0), reverse=True)
+    return recommendations
+
+
+# Quiz questions and logic
+CAREER_ASSESSMENT_QUESTIONS = [
+    {
+        "question": "What type of work environment do you prefer?",
+        "options": ["Team collaboration", "Independent work", "Leadership role", "Creative freedom"],
+        "category": "work_style"
+    },
+    {
+        "question": "Which of these activities interests you most?",
+        "options": ["Solving complex problems", "Helping others", "Creating new things", "Analyzing data"],
+        "category": "interests"
+    },
+    {
+        "question": "What's your preferred learning method?",
+        "options": ["Hands-on experience", "Reading and research", "Visual learning", "Group discussions"],
+        "category": "learning_style"
+    },
+    {
+        "question": "How do you handle stress and deadlines?",
+        "options": ["Plan ahead and organize", "Work under pressure", "Adapt and adjust", "Seek support"],
+        "category": "stress_management"
+    },
+    {
+        "question": "What motivates you most in a job?",
+        "options": ["Financial rewards", "Making a difference", "Personal growth", "Recognition"],
+        "category": "motivation"
+    },
+    {
+        "question": "What type of problems do you enjoy solving?",
+        "options": ["Technical/Mathematical", "Human/Emotional", "Creative/Artistic", "Strategic/Business"],
+        "category": "problem_solving"
+    },
+    {
+        "question": "How do you prefer to communicate?",
+        "options": ["Written communication", "Verbal presentations", "Visual demonstrations", "One-on-one discussions"],
+        "category": "communication_style"
+    },
+    {
+        "question": "What's your approach to new challenges?",
+        "options": ["Research and plan thoroughly", "Jump in and learn by doing", "Seek expert advice", "Collaborate with others"],
+        "category": "challenge_approach"
+    },
+    {
+        "question": "What role do you typically take in group projects?",
+        "options": ["Leader/Coordinator", "Creative contributor", "Technical specialist", "Support/Helper"],
+        "category": "team_role"
+    },
+    {
+        "question": "How do you measure success?",
+        "options": ["Achieving goals and targets", "Helping others succeed", "Learning new skills", "Recognition from peers"],
+        "category": "success_measure"
+    },
+    {
+        "question": "What type of work schedule do you prefer?",
+        "options": ["Regular 9-5 schedule", "Flexible hours", "Project-based deadlines", "Shift work"],
+        "category": "work_schedule"
+    },
+    {
+        "question": "How do you stay updated in your field?",
+        "options": ["Reading industry publications", "Attending conferences", "Online courses", "Networking with professionals"],
+        "category": "learning_approach"
+    }
+]
+
+def process_quiz_results(answers):
+    """Process quiz answers and extract skills/personality traits"""
+    skills = []
+    personality = []
+    
+    for answer in answers:
+        if answer['category'] == 'work_style':
+            if answer['answer'] == 'Team collaboration':
+                skills.extend(['communication', 'teamwork', 'collaboration'])
+            elif answer['answer'] == 'Independent work':
+                skills.extend(['self-motivation', 'time management', 'autonomy'])
+            elif answer['answer'] == 'Leadership role':
+                skills.extend(['leadership', 'decision making', 'mentoring'])
+            elif answer['answer'] == 'Creative freedom':
+                skills.extend(['creativity', 'innovation', 'problem solving'])
+        
+        elif answer['category'] == 'interests':
+            if answer['answer'] == 'Solving complex problems':
+                skills.extend(['analytical thinking', 'problem solving', 'critical thinking'])
+            elif answer['answer'] == 'Helping others':
+                skills.extend(['empathy', 'communication', 'interpersonal skills'])
+            elif answer['answer'] == 'Creating new things':
+                skills.extend(['creativity', 'innovation', 'design thinking'])
+            elif answer['answer'] == 'Analyzing data':
+                skills.extend(['data analysis', 'statistics', 'research'])
+        
+        elif answer['category'] == 'learning_style':
+            if answer['answer'] == 'Hands-on experience':
+                skills.extend(['practical skills', 'experimentation', 'learning by doing'])
+            elif answer['answer'] == 'Reading and research':
+                skills.extend(['research skills', 'information literacy', 'critical reading'])
+            elif answer['answer'] == 'Visual learning':
+                skills.extend(['visual thinking', 'design skills', 'spatial awareness'])
+            elif answer['answer'] == 'Group discussions':
+                skills.extend(['communication', 'active listening', 'group facilitation'])
+        
+        elif answer['category'] == 'stress_management':
+            if answer['answer'] == 'Plan ahead and organize':
+                skills.extend(['planning', 'organization', 'time management'])
+            elif answer['answer'] == 'Work under pressure':
+                skills.extend(['stress management', 'adaptability', 'resilience'])
+            elif answer['answer'] == 'Adapt and adjust':
+                skills.extend(['flexibility', 'adaptability', 'change management'])
+            elif answer['answer'] == 'Seek support':
+                skills.extend(['communication', 'collaboration', 'emotional intelligence'])
+        
+        elif answer['category'] == 'motivation':
+            if answer['answer'] == 'Financial rewards':
+                personality.extend(['goal-oriented', 'results-driven', 'achievement-focused'])
+            elif answer['answer'] == 'Making a difference':
+                personality.extend(['altruistic', 'purpose-driven', 'socially conscious'])
+            elif answer['answer'] == 'Personal growth':
+                personality.extend(['growth mindset', 'continuous learning', 'self-improvement'])
+            elif answer['answer'] == 'Recognition':
+                personality.extend(['achievement-oriented', 'recognition-seeking', 'performance-driven'])
+        
+        elif answer['category'] == 'problem_solving':
+            if answer['answer'] == 'Technical/Mathematical':
+                skills.extend(['analytical thinking', 'mathematical skills', 'technical problem solving', 'logical reasoning'])
+            elif answer['answer'] == 'Human/Emotional':
+                skills.extend(['emotional intelligence', 'empathy', 'interpersonal skills', 'conflict resolution'])
+            elif answer['answer'] == 'Creative/Artistic':
+                skills.extend(['creative thinking', 'artistic skills', 'innovation', 'design thinking'])
+            elif answer['answer'] == 'Strategic/Business':
+                skills.extend(['strategic thinking', 'business acumen', 'market analysis', 'competitive intelligence'])
+        
+        elif answer['category'] == 'communication_style':
+            if answer['answer'] == 'Written communication':
+                skills.extend(['writing skills', 'documentation', 'report writing', 'email communication'])
+            elif answer['answer'] == 'Verbal presentations':
+                skills.extend(['public speaking', 'presentation skills', 'verbal communication', 'persuasion'])
+            elif answer['answer'] == 'Visual demonstrations':
+                skills.extend(['visual communication', 'presentation design', 'demonstration skills', 'visual storytelling'])
+            elif answer['answer'] == 'One-on-one discussions':
+                skills.extend(['active listening', 'interpersonal communication', 'mentoring', 'coaching'])
+        
+        elif answer['category'] == 'challenge_approach':
+            if answer['answer'] == 'Research and plan thoroughly':
+                skills.extend(['research skills', 'planning', 'analysis', 'methodical approach'])
+            elif answer['answer'] == 'Jump in and learn by doing':
+                skills.extend(['adaptability', 'hands-on learning', 'experimentation', 'risk-taking'])
+            elif answer['answer'] == 'Seek expert advice':
+                skills.extend(['networking', 'mentorship seeking', 'collaboration', 'learning from others'])
+            elif answer['answer'] == 'Collaborate with others':
+                skills.extend(['teamwork', 'collaboration', 'facilitation', 'group dynamics'])
+        
+        elif answer['category'] == 'team_role':
+            if answer['answer'] == 'Leader/Coordinator':
+                skills.extend(['leadership', 'project coordination', 'team management', 'decision making'])
+            elif answer['answer'] == 'Creative contributor':
+                skills.extend(['creativity', 'innovation', 'idea generation', 'artistic skills'])
+            elif answer['answer'] == 'Technical specialist':
+                skills.extend(['technical expertise', 'specialized knowledge', 'problem solving', 'analytical skills'])
+            elif answer['answer'] == 'Support/Helper':
+                skills.extend(['support skills', 'helping others', 'patience', 'service orientation'])
+        
+        elif answer['category'] == 'success_measure':
+            if answer['answer'] == 'Achieving goals and targets':
+                personality.extend(['goal-oriented', 'results-driven', 'achievement-focused', 'performance-oriented'])
+            elif answer['answer'] == 'Helping others succeed':
+                personality.extend(['altruistic', 'supportive', 'mentoring', 'team-oriented'])
+            elif answer['answer'] == 'Learning new skills':
+                personality.extend(['growth mindset', 'continuous learning', 'curious', 'self-improvement'])
+            elif answer['answer'] == 'Recognition from peers':
+                personality.extend(['recognition-seeking', 'social validation', 'peer appreciation', 'team recognition'])
+        
+        elif answer['category'] == 'work_schedule':
+            if answer['answer'] == 'Regular 9-5 schedule':
+                personality.extend(['structured', 'routine-oriented', 'time-conscious', 'organized'])
+            elif answer['answer'] == 'Flexible hours':
+                personality.extend(['flexible', 'autonomous', 'self-managing', 'adaptable'])
+            elif answer['answer'] == 'Project-based deadlines':
+                personality.extend(['deadline-oriented', 'project-focused', 'time management', 'goal-driven'])
+            elif answer['answer'] == 'Shift work':
+                personality.extend(['adaptable', 'flexible', 'resilient', 'schedule-flexible'])
+        
+        elif answer['category'] == 'learning_approach':
+            if answer['answer'] == 'Reading industry publications':
+                skills.extend(['research skills', 'information literacy', 'staying current', 'analytical reading'])
+            elif answer['answer'] == 'Attending conferences':
+                skills.extend(['networking', 'professional development', 'industry knowledge', 'presentation skills'])
+            elif answer['answer'] == 'Online courses':
+                skills.extend(['e-learning', 'self-directed learning', 'digital literacy', 'continuous education'])
+            elif answer['answer'] == 'Networking with professionals':
+                skills.extend(['networking', 'relationship building', 'professional communication', 'industry connections'])
+    
+    return list(set(skills)), list(set(personality))
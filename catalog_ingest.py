@@ -0,0 +1,287 @@
+"""Bulk loader for national occupation catalogs.
+
+Streams CSV or JSONL files (optionally compressed) in chunks and upserts them
+with Core executemany statements, one transaction per chunk:
+
+    python catalog_ingest.py --careers careers.csv --skills skills.jsonl \\
+        --career-skills career_skills.csv --resources resources.csv
+
+Expected columns:
+
+- careers: ``name``, ``field`` and optionally ``description``, ``avg_salary``,
+  ``growth_rate``, ``level``
+- skills: ``name`` and optionally ``category``
+- career skills: ``career``, ``skill`` and optionally ``importance``; skills
+  that do not exist yet are created
+- resources: ``title`` and optionally ``provider``, ``url``, ``type`` and
+  ``careers`` (career names separated by ``;``)
+
+Careers and skills are deduplicated on their unique ``name``; resources, which
+have no unique column, on ``(title, url)``. Re-running a load updates rows in
+place instead of duplicating them, and an interrupted load can simply be run
+again.
+"""
+import argparse
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import bindparam, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from counselor_core import (
+    Career, Resource, Skill, bump_catalog_version, career_index, career_resource, career_skill, engine, init_db,
+    publish_catalog_versions
+)
+
+CHUNK_SIZE = 5000
+# Bound parameters per IN (...) lookup; stays below SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+CAREER_COLUMNS = ['name', 'field', 'description', 'avg_salary', 'growth_rate', 'level']
+SKILL_COLUMNS = ['name', 'category']
+RESOURCE_COLUMNS = ['title', 'provider', 'url', 'type']
+
+
+def read_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield ``path`` as DataFrames of at most ``chunk_size`` rows."""
+    lower = path.lower()
+    for suffix in ('.gz', '.bz2', '.zip', '.xz'):
+        if lower.endswith(suffix):
+            lower = lower[:-len(suffix)]
+    if lower.endswith(('.jsonl', '.ndjson')):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    elif lower.endswith('.csv'):
+        reader = pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    else:
+        raise ValueError(f"Unsupported catalog file (expected .csv or .jsonl): {path}")
+    with reader:
+        yield from reader
+
+
+def _records(chunk: pd.DataFrame, table, columns: Sequence[str], required: Sequence[str]) -> List[dict]:
+    """Clean a chunk into insert parameters using only the columns the file provides."""
+    missing = [c for c in required if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"{table.name}: missing required column(s) {', '.join(missing)}")
+    present = [c for c in columns if c in chunk.columns]
+    frame = chunk[present].copy()
+    for name in present:
+        column = table.c[name]
+        values = frame[name].where(frame[name].notna(), None)
+        if column.type.python_type is float:
+            # Blank and unparsable cells become NaN, then the column default
+            values = pd.to_numeric(values, errors='coerce')
+        else:
+            values = values.map(lambda v: v.strip() if isinstance(v, str) else v)
+        default = column.default.arg if column.default is not None and not callable(column.default.arg) else None
+        frame[name] = values.astype(object).where(values.notna() & (values != ''), default)
+    frame = frame[frame[required].notna().all(axis=1)]
+    return frame.to_dict('records')
+
+
+def _dedupe(rows: List[dict], key: Sequence[str]) -> List[dict]:
+    """Keep the last row per key; Postgres rejects a key twice in one upsert."""
+    return list({tuple(r[k] for k in key): r for r in rows}.values())
+
+
+def upsert(conn, table, rows: List[dict], key: Sequence[str], update: Sequence[str] = ()) -> None:
+    """Insert ``rows``, updating ``update`` columns of rows whose ``key`` already exists."""
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+        stmt = insert(table)
+        if update:
+            stmt = stmt.on_conflict_do_update(index_elements=list(key), set_={c: stmt.excluded[c] for c in update})
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(key))
+        conn.execute(stmt, rows)
+        return
+
+    # Other backends: split into updates and inserts by looking the keys up first.
+    existing = set()
+    for part in _batches(rows, LOOKUP_CHUNK):
+        keys = [tuple(r[k] for k in key) for r in part]
+        existing.update(conn.execute(select(*[table.c[k] for k in key]).where(
+            tuple_(*[table.c[k] for k in key]).in_(keys))).all())
+    new = [r for r in rows if tuple(r[k] for k in key) not in existing]
+    old = [r for r in rows if tuple(r[k] for k in key) in existing]
+    if new:
+        conn.execute(table.insert(), new)
+    if old and update:
+        stmt = table.update().where(*[table.c[k] == bindparam(f'key_{k}') for k in key]).values(
+            {c: bindparam(f'new_{c}') for c in update})
+        conn.execute(stmt, [
+            {**{f'key_{k}': r[k] for k in key}, **{f'new_{c}': r[c] for c in update}} for r in old
+        ])
+
+
+def _batches(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def lookup_ids(conn, table, names: Iterable[str]) -> Dict[str, int]:
+    """Map ``name`` -> ``id`` for the given names that exist in ``table``."""
+    names = list(dict.fromkeys(n for n in names if n))
+    ids = {}
+    for part in _batches(names, LOOKUP_CHUNK):
+        ids.update(conn.execute(select(table.c.name, table.c.id).where(table.c.name.in_(part))).all())
+    return ids
+
+
+def ingest_careers(conn, chunk: pd.DataFrame) -> int:
+    rows = _dedupe(_records(chunk, Career.__table__, CAREER_COLUMNS, ['name', 'field']), ['name'])
+    update = [c for c in CAREER_COLUMNS if c != 'name' and c in chunk.columns]
+    upsert(conn, Career.__table__, rows, ['name'], update)
+    return len(rows)
+
+
+def ingest_skills(conn, chunk: pd.DataFrame) -> int:
+    rows = _dedupe(_records(chunk, Skill.__table__, SKILL_COLUMNS, ['name']), ['name'])
+    update = [c for c in SKILL_COLUMNS if c != 'name' and c in chunk.columns]
+    upsert(conn, Skill.__table__, rows, ['name'], update)
+    return len(rows)
+
+
+def ingest_career_skills(conn, chunk: pd.DataFrame) -> int:
+    for column in ('career', 'skill'):
+        if column not in chunk.columns:
+            raise ValueError(f"career_skill: missing required column {column}")
+    frame = pd.DataFrame({
+        'career': chunk['career'].astype(str).str.strip(),
+        'skill': chunk['skill'].astype(str).str.strip(),
+        'importance': pd.to_numeric(chunk['importance'], errors='coerce').fillna(0.5)
+        if 'importance' in chunk.columns else 0.5,
+    })
+    frame = frame[(frame['career'] != '') & (frame['skill'] != '')]
+    upsert(conn, Skill.__table__, [{'name': n} for n in frame['skill'].unique()], ['name'])
+
+    career_ids = lookup_ids(conn, Career.__table__, frame['career'])
+    skill_ids = lookup_ids(conn, Skill.__table__, frame['skill'])
+    rows = _dedupe([
+        {'career_id': career_ids[c], 'skill_id': skill_ids[s], 'importance': float(i)}
+        for c, s, i in zip(frame['career'], frame['skill'], frame['importance'])
+        if c in career_ids
+    ], ['career_id', 'skill_id'])
+    upsert(conn, career_skill, rows, ['career_id', 'skill_id'], ['importance'])
+    return len(rows)
+
+
+def ingest_resources(conn, chunk: pd.DataFrame) -> int:
+    table = Resource.__table__
+    rows = _records(chunk, table, RESOURCE_COLUMNS, ['title'])
+    for row in rows:
+        row.setdefault('url', '')
+        row['url'] = row['url'] or ''
+    links = {}
+    if 'careers' in chunk.columns:
+        titles = chunk['title'].fillna('').astype(str).str.strip()
+        urls = chunk['url'].fillna('').astype(str).str.strip() if 'url' in chunk.columns else [''] * len(chunk)
+        for title, url, careers in zip(titles, urls, chunk['careers'].fillna('')):
+            names = [n.strip() for n in str(careers).split(';') if n.strip()]
+            if title and names:
+                links.setdefault((title, url), set()).update(names)
+    rows = _dedupe(rows, ['title', 'url'])
+
+    def existing_ids():
+        ids = {}
+        for part in _batches([(r['title'], r['url']) for r in rows], LOOKUP_CHUNK):
+            ids.update(((t, u), i) for t, u, i in conn.execute(
+                select(table.c.title, table.c.url, table.c.id).where(tuple_(table.c.title, table.c.url).in_(part))))
+        return ids
+
+    ids = existing_ids()
+    new = [r for r in rows if (r['title'], r['url']) not in ids]
+    old = [r for r in rows if (r['title'], r['url']) in ids]
+    if new:
+        conn.execute(table.insert(), new)
+        ids = existing_ids()
+    update = [c for c in ('provider', 'type') if c in chunk.columns]
+    if old and update:
+        conn.execute(
+            table.update().where(table.c.id == bindparam('resource_id')).values({c: bindparam(f'new_{c}') for c in update}),
+            [{'resource_id': ids[(r['title'], r['url'])], **{f'new_{c}': r[c] for c in update}} for r in old]
+        )
+
+    if links:
+        career_ids = lookup_ids(conn, Career.__table__, (n for names in links.values() for n in names))
+        edges = _dedupe([
+            {'career_id': career_ids[name], 'resource_id': ids[key]}
+            for key, names in links.items() for name in names if name in career_ids and key in ids
+        ], ['career_id', 'resource_id'])
+        upsert(conn, career_resource, edges, ['career_id', 'resource_id'])
+    return len(rows)
+
+
+INGESTERS = {
+    'careers': ingest_careers,
+    'skills': ingest_skills,
+    'career_skills': ingest_career_skills,
+    'resources': ingest_resources,
+}
+
+# Catalog versions each kind of file changes; resources are not cached anywhere
+CATALOG_PARTS = {
+    'careers': ('careers',),
+    'skills': ('skills',),
+    'career_skills': ('skills',),
+    'resources': (),
+}
+
+
+def ingest_file(kind: str, path: str, chunk_size: int = CHUNK_SIZE, progress=print) -> Dict[str, float]:
+    """Load one file of ``kind`` and return ``{'rows', 'seconds', 'rows_per_s'}``."""
+    ingest = INGESTERS[kind]
+    rows = 0
+    started = time.perf_counter()
+    for chunk in read_chunks(path, chunk_size):
+        with engine.begin() as conn:
+            rows += ingest(conn, chunk)
+            # Core statements bypass the ORM hooks; tell every process's caches.
+            publish_catalog_versions(bump_catalog_version(conn, *CATALOG_PARTS[kind]))
+        if progress:
+            elapsed = time.perf_counter() - started
+            progress(f"{kind}: {rows} rows, {rows / elapsed if elapsed else 0:.0f} rows/s")
+    seconds = time.perf_counter() - started
+    return {'rows': rows, 'seconds': seconds, 'rows_per_s': rows / seconds if seconds else 0.0}
+
+
+def ingest_catalog(careers: Optional[str] = None, skills: Optional[str] = None,
+                   career_skills: Optional[str] = None, resources: Optional[str] = None,
+                   chunk_size: int = CHUNK_SIZE, progress=print) -> Dict[str, Dict[str, float]]:
+    """Load the given files in dependency order and return per-file statistics."""
+    files = {'careers': careers, 'skills': skills, 'career_skills': career_skills, 'resources': resources}
+    stats = {}
+    try:
+        for kind, path in files.items():
+            if path:
+                stats[kind] = ingest_file(kind, path, chunk_size, progress)
+    finally:
+        if stats:
+            # Core statements bypass the ORM events that keep the index current.
+            career_index.invalidate()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--careers', help='careers CSV/JSONL file')
+    parser.add_argument('--skills', help='skills CSV/JSONL file')
+    parser.add_argument('--career-skills', help='career/skill edges CSV/JSONL file')
+    parser.add_argument('--resources', help='learning resources CSV/JSONL file')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    if not any([args.careers, args.skills, args.career_skills, args.resources]):
+        parser.error('nothing to load')
+
+    init_db(seed=False)
+    stats = ingest_catalog(args.careers, args.skills, args.career_skills, args.resources, args.chunk_size)
+    for kind, s in stats.items():
+        print(f"{kind:<14} {s['rows']:>10} rows  {s['seconds']:8.2f}s  {s['rows_per_s']:10.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
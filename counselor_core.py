@@ -1,38 +1,55 @@
+import json
 import os
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Float, DateTime, ForeignKey, Text, Table, Boolean
+    Column, Integer, String, Float, DateTime, ForeignKey, Text, Table, Boolean, Index
 )
-from sqlalchemy.orm import sessionmaker, declarative_base, relationship
-from sqlalchemy import text
-import hashlib
+from sqlalchemy.orm import sessionmaker, declarative_base, relationship, Session, object_session
+from sqlalchemy import text, event, func, select, cast, inspect, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-# Optional Surprise for CF
-try:
-    from surprise import Dataset, Reader, SVD
-    _surprise_available = True
-except Exception:
-    _surprise_available = False
+from artifact_store import content_key, load_artifact, load_frame, save_artifact, save_frame
+from bloom_filter import BloomFilter
+from cache_registry import CacheRegistry
+from career_ann import CareerANNIndex
+from cf_engine import ImplicitALS
+from credential_service import get_credential_service
+from db_engine import make_engine, pool_stats
+from migrations import run_migrations
+
+if TYPE_CHECKING:
+    # scikit-learn is imported on first fit so importing this module stays cheap
+    from sklearn.feature_extraction.text import TfidfVectorizer
 
 # Database configuration for cloud deployment
 import os
 DB_PATH = 'career_counselor.db'
 DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{DB_PATH}')
 
+# Optional read-only replica for catalog, trend and recommendation reads
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL', '')
+
 # Handle PostgreSQL URL format for cloud databases
 if DATABASE_URL.startswith('postgres://'):
     DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+if DATABASE_REPLICA_URL.startswith('postgres://'):
+    DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# Pool sizing and SQLite pragmas come from the DB_* / SQLITE_* environment variables
+engine = make_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
+# Accounts, profiles and anything read back right after a write stay on the primary.
+read_engine = make_engine(DATABASE_REPLICA_URL, read_only=True) if DATABASE_REPLICA_URL else engine
+ReadSessionLocal = sessionmaker(bind=read_engine)
 Base = declarative_base()
 
 # Association tables
@@ -40,7 +57,8 @@ career_skill = Table(
     'career_skill', Base.metadata,
     Column('career_id', ForeignKey('careers.id'), primary_key=True),
     Column('skill_id', ForeignKey('skills.id'), primary_key=True),
-    Column('importance', Float, default=0.5)
+    Column('importance', Float, default=0.5),
+    Index('ix_career_skill_skill', 'skill_id')
 )
 
 career_resource = Table(
@@ -93,6 +111,8 @@ class MarketTrend(Base):
     demand_index = Column(Float, default=0.0)
     salary_index = Column(Float, default=0.0)
 
+    __table_args__ = (Index('ix_market_trends_career_date', 'career_id', 'date'),)
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -120,6 +140,8 @@ class UserProfile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (Index('ix_user_profiles_user', 'user_id'),)
+
 
 class Assessment(Base):
     __tablename__ = 'assessments'
@@ -130,6 +152,8 @@ class Assessment(Base):
     results = Column(Text)  # JSON string
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index('ix_assessments_user_created', 'user_id', 'created_at'),)
+
 
 class Interaction(Base):
     __tablename__ = 'interactions'
@@ -140,93 +164,856 @@ class Interaction(Base):
     interaction_data = Column(Text)  # JSON string
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index('ix_interactions_user_created', 'user_id', 'created_at'),)
+
+
+class UserSession(Base):
+    """Server-side login session; the browser holds a signed token naming it."""
+    __tablename__ = 'user_sessions'
+    id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime)
+
+    __table_args__ = (Index('ix_user_sessions_user', 'user_id'),)
+
+
+class CatalogVersion(Base):
+    """Write counter per catalog part; caches compare it to decide when to reload."""
+    __tablename__ = 'catalog_version'
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Catalog parts with a version: career rows, and skills together with career_skill edges
+CATALOGS = ('careers', 'skills')
+# How long a process trusts the catalog versions it read before checking again
+CATALOG_VERSION_TTL = float(os.getenv('CATALOG_VERSION_TTL', '5'))
+
+
+# Share of the catalog that may change incrementally before a full TF-IDF refit
+CAREER_INDEX_DRIFT_THRESHOLD = float(os.getenv('CAREER_INDEX_DRIFT_THRESHOLD', '0.2'))
 
-# Create tables
-Base.metadata.create_all(engine)
+# Catalog size from which text recommendations switch to the ANN index
+ANN_MIN_CATALOG_SIZE = int(os.getenv('ANN_MIN_CATALOG_SIZE', '50000'))
+# Clusters probed per query; higher means better recall and slower queries
+ANN_N_PROBE = int(os.getenv('ANN_N_PROBE', '16'))
+
+# Implicit feedback strength per Interaction.interaction_type (others count 1.0)
+INTERACTION_WEIGHTS = {'view': 1.0, 'save': 3.0, 'export': 2.0}
+# Strength of a career that an Assessment result recommended to the user
+ASSESSMENT_WEIGHT = 1.0
+CF_FACTORS = int(os.getenv('CF_FACTORS', '32'))
+# Retrain the CF model at most this often to pick up new feedback
+CF_MAX_AGE_SECONDS = float(os.getenv('CF_MAX_AGE_SECONDS', '3600'))
+
+# False-positive rate of the registered-email filter; a false positive costs one lookup query
+EMAIL_FILTER_ERROR_RATE = float(os.getenv('EMAIL_FILTER_ERROR_RATE', '0.01'))
+# Rows per transaction in create_user_accounts
+USER_IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', '1000'))
 
 # Global variables for caching
-_career_data = None
-_skill_data = None
-_vectorizer = None
-_career_vectors = None
+_cf_model = None
+_cf_trained = None  # (catalog version, monotonic time) of the last training
+_cf_lock = threading.Lock()
+
+
+def bump_catalog_version(conn, *names: str) -> Dict[str, int]:
+    """Increment catalog versions inside the caller's transaction; returns the new values.
+
+    Core statements that modify careers, skills or ``career_skill`` bypass the
+    ORM hooks and must call this themselves.
+    """
+    table = CatalogVersion.__table__
+    versions = {}
+    for name in names:
+        now = datetime.utcnow()
+        updated = conn.execute(
+            table.update().where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+        )
+        if updated.rowcount == 0:
+            conn.execute(table.insert().values(name=name, version=1, updated_at=now))
+        versions[name] = conn.execute(select(table.c.version).where(table.c.name == name)).scalar_one()
+    return versions
+
+
+def _read_catalog_versions() -> Dict[str, int]:
+    # Read from where the catalogs are loaded, so a lagging replica never looks newer than its data.
+    try:
+        with read_engine.connect() as conn:
+            return dict(conn.execute(select(CatalogVersion.name, CatalogVersion.version)).all())
+    except SQLAlchemyError:
+        # Not bootstrapped yet: treat every catalog as version 0.
+        return {}
+
+
+catalog_cache = CacheRegistry(_read_catalog_versions, CATALOG_VERSION_TTL)
+
+
+def publish_catalog_versions(versions: Dict[str, int]) -> None:
+    """Let this process's caches see catalog versions it just committed.
+
+    With a replica the caches wait until the replica reports the versions
+    itself; reloading earlier could read rows it has not received yet.
+    """
+    if versions and read_engine is engine:
+        catalog_cache.note_versions(versions)
+
+
+def _new_vectorizer() -> 'TfidfVectorizer':
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(
+        max_features=1000,
+        stop_words='english',
+        ngram_range=(1, 2)
+    )
+
+
+def _career_text(careers: pd.DataFrame) -> pd.Series:
+    return careers['description'].astype(object).fillna('') + ' ' + careers['field'].astype(object).fillna('')
+
+
+def _compact_frame(frame: pd.DataFrame, categories=(), floats=()) -> pd.DataFrame:
+    """Shrink a table frame: int32 ids, categorical labels, float32 measures."""
+    frame = frame.copy()
+    if 'id' in frame and len(frame) and frame['id'].max() < np.iinfo(np.int32).max:
+        frame['id'] = frame['id'].astype(np.int32)
+    for name in categories:
+        frame[name] = frame[name].astype(object).astype('category')
+    for name in floats:
+        frame[name] = frame[name].astype(np.float32)
+    return frame
+
+
+def _compact_careers(careers: pd.DataFrame) -> pd.DataFrame:
+    return _compact_frame(careers, categories=('field', 'level'), floats=('avg_salary', 'growth_rate'))
+
+
+def _compact_skills(skills: pd.DataFrame) -> pd.DataFrame:
+    return _compact_frame(skills, categories=('category',))
+
+
+class CatalogStamp(NamedTuple):
+    """A catalog's version counter and the time it was last bumped.
+
+    The timestamp tells apart databases whose counters happen to be equal
+    (say, two fresh databases sharing an artifact directory).
+    """
+    version: int
+    updated_at: Optional[datetime]
+
+    def key(self) -> bytes:
+        return f'{self.version}@{self.updated_at.isoformat() if self.updated_at else ""}'.encode()
+
+
+def _catalog_stamp(s, name: str) -> Optional[CatalogStamp]:
+    """The ``catalog_version`` row of ``name`` as seen by session ``s``, or None if it has none."""
+    try:
+        row = s.execute(
+            select(CatalogVersion.version, CatalogVersion.updated_at).where(CatalogVersion.name == name)
+        ).first()
+    except SQLAlchemyError:
+        s.rollback()
+        return None
+    return CatalogStamp(*row) if row else None
+
+
+def _load_table_frame(s, kind: str, catalog: str, read, compact) -> Tuple[pd.DataFrame, Optional[CatalogStamp]]:
+    """Return ``compact(read())`` and the catalog stamp it reflects.
+
+    The frame is served from the columnar snapshot saved for the current
+    ``catalog`` version when there is one. Every write to the catalog bumps
+    that version, so a snapshot is never reused after an edit. Without a
+    ``catalog_version`` row (database not bootstrapped) no snapshot is used.
+    """
+    # Read the stamp first: a write landing before ``read()`` then saves newer rows under
+    # an older version, which nobody asks for again, never older rows under a newer one.
+    stamp = _catalog_stamp(s, catalog)
+    if stamp is None:
+        return compact(read()), None
+    key = content_key(kind, stamp.key())
+    loaded = load_frame(key)
+    if loaded is not None:
+        return loaded[0], stamp
+    frame = compact(read())
+    save_frame(key, frame, {'catalog_version': stamp.version})
+    return frame, stamp
+
+
+def _read_careers(s, career_ids: Optional[List[int]] = None) -> pd.DataFrame:
+    """Read career rows ordered by id, optionally restricted to some ids."""
+    if career_ids is None:
+        return _load_table_frame(
+            s, 'careerframe', 'careers',
+            lambda: pd.read_sql(s.query(Career).order_by(Career.id).statement, s.bind),
+            _compact_careers
+        )[0]
+    chunks = []
+    for start in range(0, len(career_ids), 500):
+        chunk = career_ids[start:start + 500]
+        chunks.append(pd.read_sql(s.query(Career).filter(Career.id.in_(chunk)).statement, s.bind))
+    return _compact_careers(pd.concat(chunks, ignore_index=True))
+
+
+def _career_artifact_key(careers: pd.DataFrame, stamp: Optional[CatalogStamp] = None) -> str:
+    hashed = pd.util.hash_pandas_object(careers[['id', 'field', 'description']], index=False)
+    params = repr(sorted(_new_vectorizer().get_params().items()))
+    return content_key('careers', hashed.to_numpy().tobytes(), params.encode(), stamp.key() if stamp else b'')
+
+
+def _fit_career_vectors(careers: pd.DataFrame,
+                        stamp: Optional[CatalogStamp] = None) -> Tuple['TfidfVectorizer', sparse.csr_matrix]:
+    """Fit TF-IDF on the catalog, reusing the saved artifact for identical contents.
+
+    ``stamp`` is the careers catalog version ``careers`` was read at. A
+    loaded artifact is memory-mapped, so workers share the matrix pages.
+    """
+    key = _career_artifact_key(careers, stamp)
+    vectorizer = _new_vectorizer()
+    loaded = load_artifact(key)
+    if loaded is not None:
+        arrays, meta = loaded
+        vectorizer.vocabulary_ = {term: i for i, term in enumerate(meta['terms'])}
+        vectorizer.idf_ = arrays['idf']
+        vectors = sparse.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=(len(careers), len(meta['terms']))
+        )
+        return vectorizer, vectors
+
+    vectors = vectorizer.fit_transform(_career_text(careers)).tocsr()
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    save_artifact(key, {
+        'idf': vectorizer.idf_,
+        'data': vectors.data,
+        'indices': vectors.indices,
+        'indptr': vectors.indptr,
+    }, {'terms': terms})
+    return vectorizer, vectors
+
+
+class CareerIndex:
+    """TF-IDF index over the career catalog that follows Career writes.
+
+    Committed inserts, updates and deletes of ``Career`` rows are queued by id
+    (see the session hooks below). The next read re-fetches only those rows and
+    vectorizes them against the already-fitted vocabulary. Once the share of
+    rows changed since the last full fit passes ``drift_threshold`` the whole
+    corpus is refit, so vocabulary and IDF weights catch up with the catalog.
+    ``version`` is bumped every time the served data changes.
+
+    Writes from other processes are noticed through the ``careers`` catalog
+    version, checked at most every ``CATALOG_VERSION_TTL`` seconds, and cause a
+    full reload.
+    """
+
+    def __init__(self, drift_threshold: float = CAREER_INDEX_DRIFT_THRESHOLD):
+        self.drift_threshold = drift_threshold
+        self.version = 0
+        self.catalog_version = 0  # 'careers' catalog version the served data reflects
+        self._lock = threading.RLock()
+        self._pending = set()
+        self._changed_since_fit = 0
+        self._data = None
+        self._vectorizer = None
+        self._vectors = None
+        self._derived = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def mark_changed(self, career_ids, catalog_version: Optional[int] = None) -> None:
+        """Queue career ids whose rows were inserted, updated or deleted.
+
+        ``catalog_version`` is the careers version the change was committed as.
+        If it directly follows the served version the change is applied
+        incrementally; otherwise a write from elsewhere came in between and the
+        next read reloads everything.
+        """
+        with self._lock:
+            self._pending.update(career_ids)
+            if catalog_version is not None and catalog_version == self.catalog_version + 1:
+                self.catalog_version = catalog_version
+
+    def invalidate(self) -> None:
+        """Drop everything; the next read does a full refit."""
+        with self._lock:
+            self._data = None
+            self._pending.clear()
+
+    def snapshot(self) -> Tuple[pd.DataFrame, 'TfidfVectorizer', sparse.csr_matrix]:
+        """Return a consistent (careers, vectorizer, vectors) triple.
+
+        Always use this instead of separate getters when more than one part is
+        needed: a reload between two calls would pair mismatched parts.
+        """
+        with self._lock:
+            if self._data is not None and catalog_cache.versions().get('careers', 0) > self.catalog_version:
+                self._data = None
+            if self._data is None:
+                self._refit()
+            elif self._pending:
+                self._apply_pending()
+            return self._data, self._vectorizer, self._vectors
+
+    def snapshot_with(self, key: str, build, depends_on=()):
+        """Return ``(careers, vectorizer, vectors, value)`` where ``value`` is
+        ``build(careers, vectorizer, vectors)`` for that very snapshot.
+
+        ``value`` is cached until the index changes; ``depends_on`` names
+        further catalogs (see ``CATALOGS``) whose changes also require a
+        rebuild. The build runs outside the index lock, so readers are not held
+        up behind it; concurrent callers wait for one build of the same key.
+        """
+        with self._lock:
+            snapshot = self.snapshot()
+            tag = (self.version, catalog_cache.tag(depends_on))
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == tag:
+                return (*snapshot, cached[1])
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            # Another thread may have built it for this snapshot while we waited.
+            cached = self._derived.get(key)
+            if cached is None or cached[0] != tag:
+                cached = (tag, build(*snapshot))
+                with self._lock:
+                    if tag[0] == self.version:
+                        self._derived[key] = cached
+            return (*snapshot, cached[1])
+
+    def derived(self, key: str, build, depends_on=()):
+        """Return ``build(careers, vectorizer, vectors)``, rebuilt whenever the index changes.
+
+        Use ``snapshot_with`` instead when the caller also needs the careers
+        or vectors the value was built from.
+        """
+        return self.snapshot_with(key, build, depends_on)[3]
+
+    def _refit(self) -> None:
+        # Read the version first: a write during the load leaves it behind and triggers another reload.
+        catalog_version = catalog_cache.versions(refresh=True).get('careers', 0)
+        with ReadSessionLocal() as s:
+            data, stamp = _load_table_frame(
+                s, 'careerframe', 'careers',
+                lambda: pd.read_sql(s.query(Career).order_by(Career.id).statement, s.bind),
+                _compact_careers
+            )
+        vectorizer, vectors = _fit_career_vectors(data, stamp)
+        self._data, self._vectorizer, self._vectors = data, vectorizer, vectors
+        self.catalog_version = stamp.version if stamp else catalog_version
+        self._pending.clear()
+        self._changed_since_fit = 0
+        self.version += 1
+
+    def _apply_pending(self) -> None:
+        career_ids = sorted(self._pending)
+        changed = self._changed_since_fit + len(career_ids)
+        if changed > self.drift_threshold * max(len(self._data), 1):
+            self._refit()
+            return
+
+        # Changes queued here were committed by this process; read them back from the primary.
+        with SessionLocal() as s:
+            rows = _read_careers(s, career_ids)
+        keep = np.flatnonzero(~self._data['id'].isin(career_ids).to_numpy())
+        # Concatenating categoricals with different categories falls back to object.
+        data = _compact_careers(pd.concat([self._data.iloc[keep], rows], ignore_index=True))
+        vectors = sparse.vstack(
+            [self._vectors[keep], self._vectorizer.transform(_career_text(rows))],
+            format='csr'
+        )
+        order = np.argsort(data['id'].to_numpy(), kind='stable')
+        self._data = data.iloc[order].reset_index(drop=True)
+        self._vectors = vectors[order]
+        self._pending.clear()
+        self._changed_since_fit = changed
+        self.version += 1
+
+
+career_index = CareerIndex()
+
+
+@event.listens_for(Career, 'after_insert')
+@event.listens_for(Career, 'after_update')
+@event.listens_for(Career, 'after_delete')
+def _record_career_change(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_career_ids', set()).add(target.id)
+        session.info.setdefault('changed_catalogs', set()).add('careers')
+
+
+@event.listens_for(Session, 'before_flush')
+def _record_skill_changes(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Skill) or (isinstance(obj, Career) and inspect(obj).attrs.skills.history.has_changes()):
+            session.info.setdefault('changed_catalogs', set()).add('skills')
+            return
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_catalog_versions(session, flush_context):
+    changed = session.info.pop('changed_catalogs', None)
+    bumped = session.info.setdefault('catalog_versions', {})
+    # One bump per catalog and transaction, however many flushes it takes.
+    names = sorted(name for name in changed or () if name not in bumped)
+    if names:
+        bumped.update(bump_catalog_version(session.connection(), *names))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_career_changes(session):
+    changed = session.info.pop('changed_career_ids', None)
+    versions = session.info.pop('catalog_versions', None) or {}
+    if changed:
+        career_index.mark_changed(changed, versions.get('careers'))
+    publish_catalog_versions(versions)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_career_changes(session):
+    for key in ('changed_career_ids', 'changed_catalogs', 'catalog_versions'):
+        session.info.pop(key, None)
 
 
 def get_career_data() -> pd.DataFrame:
     """Get career data with caching."""
-    global _career_data
-    if _career_data is None:
-        with SessionLocal() as s:
-            q = pd.read_sql(s.query(Career).statement, s.bind)
-            _career_data = q
-    return _career_data
+    return career_index.snapshot()[0]
+
+
+def _load_skill_data() -> pd.DataFrame:
+    with ReadSessionLocal() as s:
+        return _load_table_frame(
+            s, 'skillframe', 'skills',
+            lambda: pd.read_sql(s.query(Skill).order_by(Skill.id).statement, s.bind),
+            _compact_skills
+        )[0]
 
 
 def get_skill_data() -> pd.DataFrame:
-    """Get skill data with caching."""
-    global _skill_data
-    if _skill_data is None:
-        with SessionLocal() as s:
-            q = pd.read_sql(s.query(Skill).statement, s.bind)
-            _skill_data = q
-    return _skill_data
-
-
-def get_vectorizer() -> TfidfVectorizer:
-    """Get TF-IDF vectorizer with caching."""
-    global _vectorizer
-    if _vectorizer is None:
-        _vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-    return _vectorizer
+    """Get skill data with caching; reloaded when the skills catalog version changes."""
+    return catalog_cache.get('skill_data', ('skills',), _load_skill_data)
+
 
+def get_vectorizer() -> 'TfidfVectorizer':
+    """Get the TF-IDF vectorizer fitted on the career catalog."""
+    return career_index.snapshot()[1]
 
-def get_career_vectors() -> np.ndarray:
+
+def get_career_vectors() -> sparse.csr_matrix:
     """Get career vectors with caching."""
-    global _career_vectors
-    if _career_vectors is None:
-        careers = get_career_data()
-        vectorizer = get_vectorizer()
-        descriptions = careers['description'].fillna('') + ' ' + careers['field'].fillna('')
-        _career_vectors = vectorizer.fit_transform(descriptions)
-    return _career_vectors
+    return career_index.snapshot()[2]
+
+
+def _build_career_skill_graph(careers: pd.DataFrame, vectorizer, vectors) -> Tuple[sparse.csr_matrix, pd.DataFrame]:
+    skills = get_skill_data()
+    with ReadSessionLocal() as s:
+        edges = pd.read_sql(s.query(career_skill).statement, s.bind)
+    rows = pd.Index(careers['id']).get_indexer(edges['career_id'])
+    cols = pd.Index(skills['id']).get_indexer(edges['skill_id'])
+    valid = (rows >= 0) & (cols >= 0)
+    importance = edges['importance'].fillna(0.5).to_numpy(dtype=np.float32)
+    matrix = sparse.csr_matrix(
+        (importance[valid], (rows[valid], cols[valid])),
+        shape=(len(careers), len(skills))
+    )
+    return matrix, skills
+
+
+def _career_skill_graph() -> Tuple[pd.DataFrame, sparse.csr_matrix, pd.DataFrame]:
+    """``(careers, matrix, skills)``: the career x skill matrix with the frames its rows and columns follow."""
+    careers, _, _, (matrix, skills) = career_index.snapshot_with(
+        'career_skill', _build_career_skill_graph, depends_on=('skills',)
+    )
+    return careers, matrix, skills
+
+
+def get_career_skill_matrix() -> sparse.csr_matrix:
+    """Career x skill importance matrix from the career_skill table.
+
+    Rows follow ``get_career_data()``, columns follow ``get_skill_data()``.
+    Loaded in one query and rebuilt when the career index or the skills change.
+    """
+    return _career_skill_graph()[1]
+
+
+def user_skill_vector(user_skills: List[str], skills: Optional[pd.DataFrame] = None) -> np.ndarray:
+    """0/1 indicator over ``skills`` (default ``get_skill_data()``) rows for the skills a user has."""
+    wanted = {str(skill).strip().lower() for skill in user_skills if skill}
+    names = (get_skill_data() if skills is None else skills)['name'].str.lower()
+    return names.isin(wanted).to_numpy(dtype=np.float32)
+
+
+def _coverage(matrix: sparse.csr_matrix, have: np.ndarray) -> np.ndarray:
+    total = np.asarray(matrix.sum(axis=1)).ravel()
+    return np.divide(matrix @ have, total, out=np.zeros_like(total), where=total > 0)
+
+
+def _missing(matrix: sparse.csr_matrix, skills: pd.DataFrame, have: np.ndarray, top_n: int) -> pd.DataFrame:
+    missing = np.asarray(matrix.sum(axis=0)).ravel() * (1.0 - have)
+    indices, weights = top_k_rows(missing, top_n)
+    keep = weights[0] > 0
+    result = skills.iloc[indices[0][keep]].copy()
+    result['missing_importance'] = weights[0][keep]
+    return result[['name', 'category', 'missing_importance']]
+
+
+def skill_coverage(user_skills: List[str]) -> np.ndarray:
+    """Importance-weighted share of each career's skills that the user has.
 
+    Aligned with ``get_career_data()`` rows; careers without listed skills get 0.
+    Use ``best_covered_careers`` when the career rows are needed too.
+    """
+    _, matrix, skills = _career_skill_graph()
+    return _coverage(matrix, user_skill_vector(user_skills, skills))
 
-def recommend_careers_by_text(text: str, top_k: int = 5) -> pd.DataFrame:
-    """Recommend careers based on text input using TF-IDF and cosine similarity."""
+
+def top_missing_skills(user_skills: List[str], career_positions=None, top_n: int = 5) -> pd.DataFrame:
+    """Skills the user lacks, ranked by importance summed over careers.
+
+    ``career_positions`` restricts the sum to some ``get_career_data()`` rows;
+    by default every career counts.
+    """
+    _, matrix, skills = _career_skill_graph()
+    if career_positions is not None:
+        matrix = matrix[np.atleast_1d(career_positions)]
+    return _missing(matrix, skills, user_skill_vector(user_skills, skills), top_n)
+
+
+def best_covered_careers(user_skills: List[str], top_k: int = 5, top_missing: int = 3) -> pd.DataFrame:
+    """The ``top_k`` careers whose listed skills the user covers best.
+
+    Columns ``name``, ``coverage`` and ``missing`` (names of up to
+    ``top_missing`` skills the career needs and the user lacks, most important
+    first). Everything comes from one career index snapshot, so rows, coverage
+    and skills always line up. Empty when no career lists any skills.
+    """
+    careers, matrix, skills = _career_skill_graph()
+    if not matrix.nnz:
+        return pd.DataFrame(columns=['name', 'coverage', 'missing'])
+    have = user_skill_vector(user_skills, skills)
+    positions, coverage = top_k_rows(_coverage(matrix, have), top_k)
+    return pd.DataFrame({
+        'name': careers['name'].iloc[positions[0]].astype(str).to_numpy(),
+        'coverage': coverage[0],
+        'missing': [_missing(matrix[[pos]], skills, have, top_missing)['name'].tolist() for pos in positions[0]],
+    })
+
+
+def _build_ann_index(careers, vectorizer, vectors) -> CareerANNIndex:
+    return CareerANNIndex(n_probe=ANN_N_PROBE).build(vectors)
+
+
+def get_ann_index() -> CareerANNIndex:
+    """Get the approximate nearest-neighbour index over the career vectors."""
+    return career_index.derived('ann', _build_ann_index)
+
+
+def _search_snapshot(approximate: Optional[bool]):
+    """``(careers, vectorizer, vectors, ann)`` from one index snapshot; ``ann`` is None for exact search."""
+    careers, vectorizer, vectors = career_index.snapshot()
+    if not _use_ann(len(careers), approximate):
+        return careers, vectorizer, vectors, None
+    return career_index.snapshot_with('ann', _build_ann_index)
+
+
+def _use_ann(n_careers: int, approximate: Optional[bool]) -> bool:
+    if approximate is None:
+        return n_careers >= ANN_MIN_CATALOG_SIZE
+    return approximate
+
+
+def recommend_careers_by_text(text: str, top_k: int = 5,
+                              approximate: Optional[bool] = None) -> pd.DataFrame:
+    """Recommend careers based on text input using TF-IDF and cosine similarity.
+
+    ``approximate`` selects the ANN index (True) or exact search (False); by
+    default the ANN index is used once the catalog reaches ANN_MIN_CATALOG_SIZE.
+    """
     if not text or not text.strip():
         return pd.DataFrame()
     
-    vectorizer = get_vectorizer()
-    career_vectors = get_career_vectors()
+    careers, vectorizer, career_vectors, ann = _search_snapshot(approximate)
     
     # Vectorize input text
     text_vector = vectorizer.transform([text])
     
-    # Calculate similarities
-    similarities = cosine_similarity(text_vector, career_vectors).flatten()
-    
-    # Get top matches
-    top_indices = similarities.argsort()[-top_k:][::-1]
+    if ann is not None:
+        top_indices, top_scores = ann.search(text_vector, top_k)
+        keep = top_indices[0] >= 0
+        top_indices, top_scores = top_indices[0][keep], top_scores[0][keep]
+    else:
+        # TF-IDF rows are L2-normalised, so the dot product is the cosine similarity
+        similarities = (text_vector @ career_vectors.T).toarray().ravel()
+        
+        # Get top matches
+        top_indices = top_k_rows(similarities, top_k)[0][0]
+        top_scores = similarities[top_indices]
     
-    careers = get_career_data()
     recommended = careers.iloc[top_indices].copy()
-    recommended['similarity_score'] = similarities[top_indices]
+    recommended['similarity_score'] = top_scores
     
     return recommended[['name', 'field', 'description', 'avg_salary', 'growth_rate', 'similarity_score']]
 
 
+def top_k_rows(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the top_k columns of each row of a dense score matrix, best first.
+
+    Uses argpartition so the cost is linear in the number of careers; only the
+    k selected entries per row are sorted.
+    """
+    scores = np.atleast_2d(scores)
+    n_cols = scores.shape[1]
+    k = min(top_k, n_cols)
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(scores.dtype)
+    if k < n_cols:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(n_cols), (scores.shape[0], 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    indices = np.take_along_axis(part, order, axis=1)
+    return indices, np.take_along_axis(part_scores, order, axis=1)
+
+
+def recommend_careers_by_text_batch(texts: List[str], top_k: int = 5,
+                                    as_frames: bool = False,
+                                    approximate: Optional[bool] = None):
+    """Recommend careers for many texts at once.
+
+    All texts are vectorized in a single ``transform`` call and scored with one
+    sparse matrix product against the career vectors. TF-IDF rows are already
+    L2-normalised, so the product equals cosine similarity.
+
+    Returns ``(indices, scores)``: two ``(len(texts), k)`` arrays holding row
+    positions into ``get_career_data()`` and their similarity, best first.
+    Empty texts get a score of 0 for every career. With ``as_frames=True`` a
+    list of DataFrames shaped like ``recommend_careers_by_text`` is returned
+    instead. ``approximate`` behaves as in ``recommend_careers_by_text``; ANN
+    results pad missing hits with index -1, which frames leave out.
+    """
+    texts = [t if t and t.strip() else '' for t in texts]
+    if not texts:
+        empty = np.empty((0, 0))
+        if as_frames:
+            return []
+        return empty.astype(np.int64), empty.astype(np.float32)
+
+    careers, vectorizer, career_vectors, ann = _search_snapshot(approximate)
+
+    text_vectors = vectorizer.transform(texts)
+    if ann is not None:
+        indices, top_scores = ann.search(text_vectors, top_k)
+    else:
+        scores = (text_vectors @ career_vectors.T).toarray().astype(np.float32, copy=False)
+        indices, top_scores = top_k_rows(scores, top_k)
+
+    if not as_frames:
+        return indices, top_scores
+
+    columns = ['name', 'field', 'description', 'avg_salary', 'growth_rate', 'similarity_score']
+    frames = []
+    for text, row_idx, row_scores in zip(texts, indices, top_scores):
+        if not text:
+            frames.append(pd.DataFrame())
+            continue
+        keep = row_idx >= 0
+        recommended = careers.iloc[row_idx[keep]].copy()
+        recommended['similarity_score'] = row_scores[keep]
+        frames.append(recommended[columns])
+    return frames
+
+
+def _feedback_careers(interaction_type: str, content: Optional[str], data: Optional[str]):
+    """Yield (career key, weight) pairs referenced by one Interaction row.
+
+    ``interaction_data`` may carry a ``career_id`` or ``career`` name; otherwise
+    ``content`` is taken as the career name.
+    """
+    weight = INTERACTION_WEIGHTS.get(interaction_type, 1.0)
+    payload = {}
+    if data:
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    if payload.get('career_id') is not None:
+        yield int(payload['career_id']), weight
+    elif payload.get('career') or content:
+        yield str(payload.get('career') or content), weight
+
+
+def _assessment_careers(results: Optional[str]):
+    """Yield career names recommended by one stored Assessment result."""
+    if not results:
+        return
+    try:
+        parsed = json.loads(results)
+    except ValueError:
+        return
+    if isinstance(parsed, dict):
+        parsed = parsed.get('recommended_careers', [])
+    if not isinstance(parsed, list):
+        return
+    for item in parsed:
+        name = item.get('name') if isinstance(item, dict) else item
+        if name:
+            yield str(name)
+
+
+def load_feedback_matrix(careers: Optional[pd.DataFrame] = None) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Build the implicit user x career matrix from interactions and assessments.
+
+    Rows follow the returned array of user ids, columns follow the positions of
+    ``careers`` (default ``get_career_data()``).
+    """
+    if careers is None:
+        careers = get_career_data()
+    positions = {}
+    for pos, (career_id, name) in enumerate(zip(careers['id'], careers['name'])):
+        positions[int(career_id)] = pos
+        positions[name] = pos
+
+    users, items, weights = [], [], []
+    with ReadSessionLocal() as s:
+        rows = s.query(
+            Interaction.user_id, Interaction.interaction_type,
+            Interaction.content, Interaction.interaction_data
+        ).filter(Interaction.user_id.isnot(None))
+        for user_id, interaction_type, content, data in rows:
+            for key, weight in _feedback_careers(interaction_type, content, data):
+                if key in positions:
+                    users.append(user_id)
+                    items.append(positions[key])
+                    weights.append(weight)
+        rows = s.query(Assessment.user_id, Assessment.results).filter(Assessment.user_id.isnot(None))
+        for user_id, results in rows:
+            for name in _assessment_careers(results):
+                if name in positions:
+                    users.append(user_id)
+                    items.append(positions[name])
+                    weights.append(ASSESSMENT_WEIGHT)
+
+    user_ids, user_rows = np.unique(np.asarray(users, dtype=np.int64), return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float64), (user_rows, np.asarray(items, dtype=np.int64))),
+        shape=(len(user_ids), len(careers))
+    )
+    matrix.sum_duplicates()
+    return matrix, user_ids
+
+
+class CFModel:
+    """Trained factors plus the lookups needed to serve them."""
+
+    def __init__(self, als: ImplicitALS, feedback: sparse.csr_matrix, user_ids: np.ndarray,
+                 careers: pd.DataFrame):
+        self.als = als
+        self.careers = careers  # the catalog snapshot whose rows the item factors follow
+        self.feedback = feedback
+        self.user_rows = {int(u): row for row, u in enumerate(user_ids)}
+        self.popularity = np.asarray(feedback.sum(axis=0)).ravel()
+
+
+def train_cf_model() -> Optional[CFModel]:
+    """Train implicit ALS on current feedback; None when there is no feedback yet.
+
+    Factors for identical feedback and catalog are loaded from the artifact
+    store instead of being retrained.
+    """
+    careers = get_career_data()
+    feedback, user_ids = load_feedback_matrix(careers)
+    if feedback.nnz == 0:
+        return None
+    # Keep the rank well below the catalog size so the model generalises
+    # instead of reproducing the observed matrix.
+    als = ImplicitALS(factors=max(1, min(CF_FACTORS, feedback.shape[1] // 2)))
+    key = content_key(
+        'cf', feedback.data.tobytes(), feedback.indices.tobytes(), feedback.indptr.tobytes(),
+        user_ids.tobytes(), careers['id'].to_numpy().tobytes(),
+        repr(sorted(vars(als).items())).encode()
+    )
+    loaded = load_artifact(key)
+    if loaded is not None:
+        als.user_factors = loaded[0]['user_factors']
+        als.item_factors = loaded[0]['item_factors']
+    else:
+        als.fit(feedback)
+        save_artifact(key, {'user_factors': als.user_factors, 'item_factors': als.item_factors})
+    return CFModel(als, feedback, user_ids, careers)
+
+
+def get_cf_model() -> Optional[CFModel]:
+    """Get the cached CF model, retraining when the catalog changes or it is CF_MAX_AGE_SECONDS old."""
+    global _cf_model, _cf_trained
+    with _cf_lock:
+        career_index.snapshot()
+        version = career_index.version
+        if (_cf_trained is None or _cf_trained[0] != version
+                or time.monotonic() - _cf_trained[1] > CF_MAX_AGE_SECONDS):
+            _cf_model = train_cf_model()
+            _cf_trained = (version, time.monotonic())
+        return _cf_model
+
+
+def cf_scores_for_user(user_id: Optional[int], careers: Optional[pd.DataFrame] = None) -> Optional[np.ndarray]:
+    """CF preference for every row of ``careers`` (default ``get_career_data()``).
+
+    Scores are matched to rows by career id, so ``careers`` may be a different
+    snapshot than the one the model was trained on; careers the model has not
+    seen score 0. Users without feedback get normalised career popularity;
+    None when there is no feedback at all.
+    """
+    model = get_cf_model()
+    if model is None:
+        return None
+    row = model.user_rows.get(int(user_id)) if user_id is not None else None
+    if row is None:
+        scores = model.popularity / max(model.popularity.max(), 1e-9)
+    else:
+        scores = model.als.item_factors @ model.als.user_factors[row]
+    if careers is None:
+        careers = get_career_data()
+    positions = pd.Index(model.careers['id']).get_indexer(careers['id'])
+    return np.where(positions >= 0, scores[positions], 0.0)
+
+
 def recommend_cf_for_user(user_id: int, top_k: int = 5) -> pd.DataFrame:
-    """Collaborative filtering recommendations for a user."""
-    if not _surprise_available:
-        # Fallback to content-based recommendations
+    """Collaborative filtering recommendations for a user.
+
+    Known users are scored with one dot product between their factor vector
+    and every career's; careers they already interacted with are skipped.
+    Users without feedback get the most popular careers, and an empty
+    feedback log falls back to ``get_random_cf_recommendations``.
+    """
+    model = get_cf_model()
+    if model is None:
         return get_random_cf_recommendations(top_k)
-    
-    # This would implement actual collaborative filtering
-    # For now, return random recommendations
-    return get_random_cf_recommendations(top_k)
+
+    careers = model.careers
+    row = model.user_rows.get(int(user_id)) if user_id is not None else None
+    if row is None:
+        positions = top_k_rows(model.popularity, top_k)[0][0]
+        confidence = model.popularity[positions] / max(model.popularity.max(), 1e-9)
+        user_similarity = np.zeros(len(positions))
+    else:
+        seen = model.feedback.indices[model.feedback.indptr[row]:model.feedback.indptr[row + 1]]
+        positions, scores = model.als.recommend(row, top_k, exclude=seen)
+        confidence = np.clip(scores, 0.0, 1.0)
+        user_vector = model.als.user_factors[row]
+        item_vectors = model.als.item_factors[positions]
+        norms = np.linalg.norm(item_vectors, axis=1) * max(np.linalg.norm(user_vector), 1e-9)
+        user_similarity = (item_vectors @ user_vector) / np.maximum(norms, 1e-9)
+
+    selected = careers.iloc[positions].copy()
+    selected['cf_confidence'] = confidence
+    selected['user_similarity'] = user_similarity
+    return selected[['name', 'field', 'description', 'avg_salary', 'growth_rate', 'cf_confidence', 'user_similarity']]
 
 
 def get_random_cf_recommendations(top_k: int = 5) -> pd.DataFrame:
@@ -252,52 +1039,254 @@ def get_random_cf_recommendations(top_k: int = 5) -> pd.DataFrame:
     return selected[['name', 'field', 'description', 'avg_salary', 'growth_rate', 'cf_confidence', 'user_similarity']]
 
 
-def career_trend_timeseries(career_name: str = None) -> pd.DataFrame:
-    """Get career trend timeseries data."""
+def get_pool_stats() -> Dict[str, object]:
+    """Current connection-pool usage of the shared engine (and replica, under
+    ``'replica'``), for monitoring."""
+    stats = pool_stats(engine)
+    if read_engine is not engine:
+        stats['replica'] = pool_stats(read_engine)
+    return stats
+
+
+TREND_GRANULARITIES = ('week', 'month', 'quarter')
+
+
+def _period_start(column, granularity: str, dialect: str):
+    """SQL expression truncating ``column`` to the start of its week/month/quarter."""
+    if dialect == 'postgresql':
+        return func.date_trunc(granularity, column)
+    if dialect == 'sqlite':
+        if granularity == 'week':
+            # Monday of the row's week
+            return func.date(column, '-6 days', 'weekday 1')
+        if granularity == 'month':
+            return func.strftime('%Y-%m-01', column)
+        quarter_month = (cast(func.strftime('%m', column), Integer) - 1) // 3 * 3 + 1
+        return func.printf('%s-%02d-01', func.strftime('%Y', column), quarter_month)
+    return None
+
+
+def trend_timeseries_statement(dialect: str, career_name: str = None, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None, careers: Optional[List[str]] = None,
+                               fields: Optional[List[str]] = None, granularity: Optional[str] = None,
+                               group_by: Optional[str] = 'career'):
+    """Build the trend query for ``dialect``; see ``career_trend_timeseries``.
+
+    Returns ``(statement, finish)`` where ``finish`` turns the fetched rows
+    (as a DataFrame) into the final result.
+    """
+    if granularity is not None and granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"granularity must be one of {TREND_GRANULARITIES}")
+    if group_by not in ('career', 'field', None):
+        raise ValueError("group_by must be 'career', 'field' or None")
+    names = list(careers or []) + ([career_name] if career_name else [])
+
+    conditions = []
+    if start is not None:
+        conditions.append(MarketTrend.date >= start)
+    if end is not None:
+        conditions.append(MarketTrend.date < end)
+    if names:
+        conditions.append(Career.name.in_(names))
+    if fields:
+        conditions.append(Career.field.in_(fields))
+    group_column = {'career': Career.name.label('career'), 'field': Career.field.label('field'), None: None}[group_by]
+
+    bucket = _period_start(MarketTrend.date, granularity, dialect) if granularity else None
+    if granularity is None or bucket is None:
+        stmt = select(
+            MarketTrend.id, MarketTrend.career_id, MarketTrend.date, MarketTrend.demand_index,
+            MarketTrend.salary_index, Career.name.label('career'), Career.field
+        )
+    else:
+        keys = [bucket.label('date')] + ([group_column] if group_column is not None else [])
+        stmt = select(
+            *keys,
+            func.avg(MarketTrend.demand_index).label('demand_index'),
+            func.avg(MarketTrend.salary_index).label('salary_index'),
+            func.count().label('n_points')
+        ).group_by(*[k.element for k in keys])
+    stmt = stmt.join(Career, Career.id == MarketTrend.career_id).where(*conditions).order_by(text('date'))
+
+    def finish(q: pd.DataFrame) -> pd.DataFrame:
+        q['date'] = pd.to_datetime(q['date'])
+        if granularity is not None and bucket is None:
+            # No SQL date truncation for this backend: resample the filtered rows instead.
+            q['date'] = q['date'].dt.to_period({'week': 'W-SUN', 'month': 'M', 'quarter': 'Q'}[granularity]).dt.start_time
+            by = ['date'] + ([group_by] if group_by else [])
+            q = q.groupby(by, as_index=False).agg(
+                demand_index=('demand_index', 'mean'), salary_index=('salary_index', 'mean'),
+                n_points=('demand_index', 'size')
+            ).sort_values('date')
+        return q.reset_index(drop=True)
+
+    return stmt, finish
+
+
+def career_trend_timeseries(career_name: str = None, start: Optional[datetime] = None,
+                            end: Optional[datetime] = None, careers: Optional[List[str]] = None,
+                            fields: Optional[List[str]] = None, granularity: Optional[str] = None,
+                            group_by: Optional[str] = 'career') -> pd.DataFrame:
+    """Get career trend timeseries data.
+
+    Filters on the date range ``[start, end)``, career names and career fields
+    are applied in SQL in a single query joined to ``careers``. Without
+    ``granularity`` every matching point is returned with its ``career`` and
+    ``field``. With ``granularity`` ('week', 'month' or 'quarter') the points
+    are averaged per period and per ``group_by`` ('career', 'field' or None
+    for one overall series), adding an ``n_points`` count.
+    Runs on the read replica when one is configured.
+    """
+    with ReadSessionLocal() as s:
+        stmt, finish = trend_timeseries_statement(
+            s.bind.dialect.name, career_name, start, end, careers, fields, granularity, group_by
+        )
+        q = pd.read_sql(stmt, s.connection())
+    return finish(q)
+
+
+_email_filter: Optional[BloomFilter] = None
+_email_filter_lock = threading.Lock()
+
+
+def _load_email_filter(min_capacity: int = 0) -> BloomFilter:
     with SessionLocal() as s:
-        if career_name:
-            career = s.query(Career).filter(Career.name == career_name).first()
-            if not career:
-                return pd.DataFrame()
-            q = pd.read_sql(s.query(MarketTrend).filter(MarketTrend.career_id == career.id).statement, s.bind)
-        else:
-            q = pd.read_sql(s.query(MarketTrend).statement, s.bind)
-    return q.sort_values('date')
+        count = s.query(func.count(User.id)).scalar()
+        # Room to grow before it saturates and is rebuilt
+        bloom = BloomFilter(max(2 * max(count, min_capacity), 100000), EMAIL_FILTER_ERROR_RATE)
+        bloom.add_many(s.execute(select(User.email).execution_options(yield_per=10000)).scalars())
+    return bloom
+
+
+def get_email_filter() -> BloomFilter:
+    """The Bloom filter over existing emails, loaded from the users table on first use.
+
+    ``warm_up`` loads it, so the first sign-up does not pay for the scan.
+    """
+    global _email_filter
+    with _email_filter_lock:
+        if _email_filter is None:
+            _email_filter = _load_email_filter()
+        return _email_filter
+
+
+def email_may_exist(email: str) -> bool:
+    """False only if no account with ``email`` is known to this process.
+
+    Backed by a Bloom filter over the users table, loaded on first use and
+    updated by this process's sign-ups. Accounts created by other processes
+    can be missing, so a False answer only lets callers skip the lookup
+    query; the unique constraint on ``users.email`` stays the authority.
+    Blocks while the filter loads; async code runs it in an executor.
+    """
+    return get_email_filter().might_contain(email)
+
+
+def remember_emails(emails) -> None:
+    """Add newly registered emails to the filter, rebuilding it once it is over capacity."""
+    global _email_filter
+    with _email_filter_lock:
+        if _email_filter is None:
+            return
+        _email_filter.add_many(emails)
+        if _email_filter.saturated:
+            _email_filter = _load_email_filter(_email_filter.count)
 
 
 def create_user_account(full_name: str, email: str, password: str) -> Tuple[bool, Optional[int], str]:
-    """Create a new user account."""
-    with SessionLocal() as s:
-        # Check if user already exists
-        existing_user = s.query(User).filter(User.email == email).first()
-        if existing_user:
-            return False, None, "User already exists with this email"
-        
-        # Create new user
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        user = User(email=email, password_hash=password_hash, full_name=full_name)
-        s.add(user)
-        s.commit()
-        s.refresh(user)
-        return True, user.id, "User created successfully"
+    """Create a new user account.
+
+    Blocking facade over ``async_data.create_user_account_async``.
+    """
+    from async_data import create_user_account_async, run_sync
+    return run_sync(create_user_account_async(full_name, email, password))
+
+
+def _insert_users(rows: List[Dict]) -> List[str]:
+    """Insert a batch in one transaction; on a conflict, row by row. Returns the emails inserted."""
+    table = User.__table__
+    try:
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+        return [row['email'] for row in rows]
+    except IntegrityError:
+        pass
+    inserted = []
+    with engine.begin() as conn:
+        for row in rows:
+            try:
+                with conn.begin_nested():
+                    conn.execute(table.insert(), [row])
+                inserted.append(row['email'])
+            except IntegrityError:
+                continue
+    return inserted
+
+
+def create_user_accounts(rows, batch_size: int = USER_IMPORT_BATCH_SIZE) -> Dict[str, object]:
+    """Create many accounts, e.g. a bulk student import.
+
+    ``rows`` is an iterable of mappings with ``full_name``, ``email`` and
+    ``password``. Emails the filter has never seen skip the existence
+    check; the rest are looked up in one query per batch. Passwords of a
+    batch are hashed in parallel on the credential pool and the batch is
+    inserted in one transaction. Returns the number created and the emails
+    skipped because they already exist or repeat within ``rows``.
+    """
+    created, skipped, seen = 0, [], set()
+
+    def flush(batch):
+        nonlocal created
+        flags = get_email_filter().might_contain_many([row['email'] for row in batch])
+        maybe = [row['email'] for row, flag in zip(batch, flags) if flag]
+        existing = set()
+        if maybe:
+            with SessionLocal() as s:
+                existing = set(s.execute(select(User.email).where(User.email.in_(maybe))).scalars())
+        fresh = [row for row in batch if row['email'] not in existing]
+        skipped.extend(row['email'] for row in batch if row['email'] in existing)
+        hashes = get_credential_service().hash_many(row['password'] for row in fresh)
+        inserted = _insert_users([
+            {'email': row['email'], 'full_name': row['full_name'], 'password_hash': password_hash}
+            for row, password_hash in zip(fresh, hashes)
+        ]) if fresh else []
+        remember_emails(inserted)
+        created += len(inserted)
+        done = set(inserted)
+        # Lost a race with another sign-up
+        skipped.extend(row['email'] for row in fresh if row['email'] not in done)
+
+    batch = []
+    for row in rows:
+        if row['email'] in seen:
+            skipped.append(row['email'])
+            continue
+        seen.add(row['email'])
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return {'created': created, 'skipped': skipped}
 
 
 def verify_user_credentials(email: str, password: str) -> Optional[int]:
-    """Verify user login credentials and return user ID."""
-    with SessionLocal() as s:
-        user = s.query(User).filter(User.email == email).first()
-        if user and user.password_hash == hashlib.sha256(password.encode()).hexdigest():
-            # Update last login
-            user.last_login = datetime.utcnow()
-            s.commit()
-            return user.id
-        return None
+    """Verify user login credentials and return user ID.
+
+    Blocking facade over ``async_data.verify_user_credentials_async``.
+    """
+    from async_data import run_sync, verify_user_credentials_async
+    return run_sync(verify_user_credentials_async(email, password))
 
 
 def get_user_by_email(email: str) -> Optional[User]:
-    """Get user by email address."""
-    with SessionLocal() as s:
-        return s.query(User).filter(User.email == email).first()
+    """Get user by email address.
+
+    Blocking facade over ``async_data.get_user_by_email_async``.
+    """
+    from async_data import get_user_by_email_async, run_sync
+    return run_sync(get_user_by_email_async(email))
 
 
 def seed_sample_data():
@@ -344,5 +1333,47 @@ def seed_sample_data():
         s.commit()
 
 
-# Seed data on import
-seed_sample_data()
+def init_db(seed: bool = True) -> None:
+    """Create missing tables, apply pending migrations and seed an empty catalog.
+
+    Importing this module never touches the database; run this once per
+    deployment (``python bootstrap.py``) or at process start.
+    """
+    Base.metadata.create_all(engine)
+    run_migrations(engine, Base.metadata)
+    try:
+        with engine.begin() as conn:
+            known = set(conn.execute(select(CatalogVersion.name)).scalars())
+            missing = [{'name': name, 'version': 0} for name in CATALOGS if name not in known]
+            if missing:
+                conn.execute(CatalogVersion.__table__.insert(), missing)
+    except IntegrityError:
+        pass  # another process registered them first
+    if seed:
+        seed_sample_data()
+
+
+def warm_up(cf: bool = True, accounts: bool = True) -> Dict[str, float]:
+    """Load the recommendation caches ahead of the first request.
+
+    ``cf`` also loads (or trains) the CF model, ``accounts`` the registered
+    email filter. Returns the seconds spent per step, so cold-start cost can
+    be tracked.
+    """
+    timings = {}
+
+    def step(name, load):
+        started = time.perf_counter()
+        load()
+        timings[name] = time.perf_counter() - started
+
+    step('career_index', career_index.snapshot)
+    step('skill_data', get_skill_data)
+    step('career_skill_matrix', get_career_skill_matrix)
+    if accounts:
+        step('email_filter', get_email_filter)
+    if _use_ann(len(get_career_data()), None):
+        step('ann_index', get_ann_index)
+    if cf:
+        step('cf_model', get_cf_model)
+    return timings
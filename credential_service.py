@@ -0,0 +1,235 @@
+"""Password hashing on a bounded worker pool.
+
+Passwords are stored as salted, tunable KDF hashes:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+(salt and hash base64-encoded). ``PASSWORD_HASHER`` picks the scheme for new
+hashes and the ``PASSWORD_SCRYPT_*`` / ``PASSWORD_PBKDF2_ITERATIONS``
+variables its cost. Hashes written before this module (bare hex SHA-256) and
+hashes with outdated parameters still verify; ``needs_rehash`` tells the login
+path to replace them with the current format.
+
+Each hash costs tens of milliseconds of CPU, so it runs on a thread pool of
+``PASSWORD_HASH_WORKERS`` threads (``hashlib`` releases the GIL while it
+hashes). At most ``PASSWORD_HASH_MAX_PENDING`` hashes may be queued or running;
+beyond that calls fail fast with ``CredentialServiceBusy`` instead of piling up
+behind a sign-in burst, and a caller waits at most
+``PASSWORD_HASH_TIMEOUT_SECONDS`` for its hash before getting
+``concurrent.futures.TimeoutError``. ``stats()`` reports how long hashes
+waited for a worker.
+"""
+import asyncio
+import atexit
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterable, List, Optional
+
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'scrypt')
+PASSWORD_SCRYPT_N = int(os.getenv('PASSWORD_SCRYPT_N', str(2 ** 14)))
+PASSWORD_SCRYPT_R = int(os.getenv('PASSWORD_SCRYPT_R', '8'))
+PASSWORD_SCRYPT_P = int(os.getenv('PASSWORD_SCRYPT_P', '1'))
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', '600000'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', str(max(PASSWORD_HASH_WORKERS, 1) * 8)))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv('PASSWORD_HASH_TIMEOUT_SECONDS', '10'))
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+_LEGACY_SHA256 = re.compile(r'[0-9a-f]{64}')
+# Recent queue waits kept for the percentiles in stats()
+_WAIT_SAMPLES = 1024
+
+
+class CredentialServiceBusy(RuntimeError):
+    """Raised when too many password hashes are already queued."""
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode('ascii')
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # OpenSSL needs 128 * n * r bytes plus some slack
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=HASH_BYTES,
+                          maxmem=256 * n * r + 2 ** 20)
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations, dklen=HASH_BYTES)
+
+
+def _current_params():
+    if PASSWORD_HASHER == 'scrypt':
+        return 'scrypt', (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    if PASSWORD_HASHER == 'pbkdf2_sha256':
+        return 'pbkdf2_sha256', (PASSWORD_PBKDF2_ITERATIONS,)
+    raise ValueError(f"Unknown PASSWORD_HASHER {PASSWORD_HASHER!r}; use 'scrypt' or 'pbkdf2_sha256'")
+
+
+def _hash(password: str) -> str:
+    scheme, params = _current_params()
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, *params) if scheme == 'scrypt' else _pbkdf2(password, salt, *params)
+    return '$'.join([scheme, *map(str, params), _b64(salt), _b64(digest)])
+
+
+def _verify(password: str, stored: str) -> bool:
+    if not stored:
+        return False
+    if _LEGACY_SHA256.fullmatch(stored):
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+    scheme, *fields = stored.split('$')
+    try:
+        salt, expected = base64.b64decode(fields[-2]), base64.b64decode(fields[-1])
+        params = [int(value) for value in fields[:-2]]
+        if scheme == 'scrypt':
+            digest = _scrypt(password, salt, *params)
+        elif scheme == 'pbkdf2_sha256':
+            digest = _pbkdf2(password, salt, *params)
+        else:
+            return False
+    except (ValueError, TypeError, IndexError):
+        return False
+    return hmac.compare_digest(digest, expected)
+
+
+def needs_rehash(stored: str) -> bool:
+    """True if ``stored`` is a legacy SHA-256 hash or uses other than the current scheme and cost."""
+    scheme, params = _current_params()
+    return not stored or stored.split('$')[:len(params) + 1] != [scheme, *map(str, params)]
+
+
+class CredentialService:
+    """Bounded thread pool that hashes and verifies passwords, with queue-wait metrics."""
+
+    def __init__(self, max_workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 timeout: float = PASSWORD_HASH_TIMEOUT_SECONDS):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._waits = deque(maxlen=_WAIT_SAMPLES)
+        self._stats = {'hashed': 0, 'verified': 0, 'rejected': 0, 'in_flight': 0,
+                       'wait_seconds_total': 0.0, 'wait_seconds_max': 0.0, 'work_seconds_total': 0.0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='password-hash')
+            return self._executor
+
+    def _timed(self, kind: str, fn, args, queued: float):
+        started = time.perf_counter()
+        wait = started - queued
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._stats[kind] += 1
+                self._stats['in_flight'] -= 1
+                self._stats['wait_seconds_total'] += wait
+                self._stats['wait_seconds_max'] = max(self._stats['wait_seconds_max'], wait)
+                self._stats['work_seconds_total'] += time.perf_counter() - started
+                self._waits.append(wait)
+
+    def submit(self, kind: str, fn, *args, wait: bool = False) -> Future:
+        """Queue ``fn(*args)``; raises CredentialServiceBusy when the queue is full,
+        unless ``wait`` is set, in which case it blocks until there is room."""
+        if self.max_workers <= 0:
+            future = Future()
+            with self._lock:
+                self._stats['in_flight'] += 1
+            future.set_result(self._timed(kind, fn, args, time.perf_counter()))
+            return future
+        if not self._slots.acquire(blocking=wait):
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise CredentialServiceBusy("Too many sign-ins in progress, please retry")
+        with self._lock:
+            self._stats['in_flight'] += 1
+        try:
+            future = self._get_executor().submit(self._timed, kind, fn, args, time.perf_counter())
+        except BaseException:
+            with self._lock:
+                self._stats['in_flight'] -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def _wait(self, future: Future):
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # Same exception on every Python version; the queued hash is cancelled if it has not started
+            raise FuturesTimeoutError(f"Password hash took longer than {self.timeout}s") from None
+
+    async def hash(self, password: str) -> str:
+        """Hash ``password`` with the current scheme and cost, waiting at most ``timeout``."""
+        return await self._wait(self.submit('hashed', _hash, password))
+
+    async def verify(self, password: str, stored: str) -> bool:
+        """Check ``password`` against a stored hash of any supported format, waiting at most ``timeout``."""
+        return await self._wait(self.submit('verified', _verify, password, stored))
+
+    def hash_many(self, passwords: Iterable[str]) -> List[str]:
+        """Hash a batch of passwords in parallel, waiting for queue room rather than failing."""
+        futures = [self.submit('hashed', _hash, password, wait=True) for password in passwords]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, object]:
+        """Counters plus queue-wait percentiles over the last hashes."""
+        with self._lock:
+            stats = dict(self._stats)
+            waits = sorted(self._waits)
+        done = stats['hashed'] + stats['verified']
+        stats['wait_seconds_mean'] = stats['wait_seconds_total'] / done if done else 0.0
+        for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            stats[f'wait_seconds_{name}'] = waits[min(int(q * len(waits)), len(waits) - 1)] if waits else 0.0
+        stats['workers'] = self.max_workers
+        return stats
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service: Optional[CredentialService] = None
+_service_lock = threading.Lock()
+
+
+def get_credential_service() -> CredentialService:
+    """The process-wide service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CredentialService()
+            atexit.register(_service.shutdown)
+        return _service
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a new password on the shared pool without blocking the event loop."""
+    return await get_credential_service().hash(password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    """Verify a password against its stored hash on the shared pool without blocking the event loop."""
+    return await get_credential_service().verify(password, stored)
+
+
+def credential_stats() -> Dict[str, object]:
+    """Queue-wait and throughput metrics of the shared pool, for monitoring."""
+    return get_credential_service().stats()
@@ -0,0 +1,184 @@
+"""Engine factory for the shared database connection pool.
+
+SQLite connections get WAL journaling, ``synchronous=NORMAL``, a busy timeout
+and a larger page cache / mmap window applied on every new connection, so
+concurrent Streamlit sessions wait for the write lock instead of failing with
+``database is locked``. Server databases (PostgreSQL, MySQL) get a sized
+``QueuePool`` with pre-ping and recycling so the app holds a bounded number of
+healthy connections.
+
+Engines made with ``read_only=True`` (used for a read replica) refuse writes:
+SQLite connections set ``query_only`` and server connections default every
+transaction to READ ONLY.
+
+Everything is configured through environment variables; ``pool_stats`` reports
+the current pool state and lifetime counters for monitoring.
+"""
+import os
+import threading
+import weakref
+from typing import Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Seconds after which a pooled connection is replaced, below typical server idle timeouts
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_ECHO = os.getenv('DB_ECHO', '').lower() in ('1', 'true', 'yes')
+
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 2 ** 20)))
+# Page cache per connection in KiB (passed to SQLite as a negative cache_size)
+SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+
+_counters: 'weakref.WeakKeyDictionary[Engine, Dict[str, int]]' = weakref.WeakKeyDictionary()
+_counters_lock = threading.Lock()
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.database in (None, '', ':memory:') or 'mode=memory' in str(url)
+
+
+# Statements that make a server connection read-only for its whole session
+_READ_ONLY_SESSION = {
+    'postgresql': 'SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY',
+    'mysql': 'SET SESSION TRANSACTION READ ONLY',
+}
+
+
+def _sqlite_pragmas(memory: bool, read_only: bool = False):
+    pragmas = [
+        f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}',
+        f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}',
+        f'PRAGMA cache_size={-SQLITE_CACHE_SIZE_KB}',
+    ]
+    if not memory:
+        # WAL and mmap only apply to file databases; a replica keeps the journal mode it was given
+        if not read_only:
+            pragmas.insert(0, f'PRAGMA journal_mode={SQLITE_JOURNAL_MODE}')
+        pragmas.append(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+    if read_only:
+        pragmas.append('PRAGMA query_only=ON')
+    return pragmas
+
+
+def _track_pool(engine: Engine) -> None:
+    counters = {'connects': 0, 'checkouts': 0, 'checkins': 0, 'invalidations': 0}
+    with _counters_lock:
+        _counters[engine] = counters
+
+    def bump(name):
+        def listener(*_):
+            counters[name] += 1
+        return listener
+
+    event.listen(engine, 'connect', bump('connects'))
+    event.listen(engine, 'checkout', bump('checkouts'))
+    event.listen(engine, 'checkin', bump('checkins'))
+    event.listen(engine, 'invalidate', bump('invalidations'))
+
+
+def _install_connect_statements(engine: Engine, statements) -> None:
+    @event.listens_for(engine, 'connect')
+    def _apply_statements(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+        if statements and not getattr(dbapi_connection, 'autocommit', True):
+            # Server drivers open a transaction for the SET; end it so it applies to the session.
+            dbapi_connection.commit()
+
+
+def _install_sqlite_pragmas(engine: Engine, memory: bool, read_only: bool = False) -> None:
+    _install_connect_statements(engine, _sqlite_pragmas(memory, read_only))
+
+
+def _server_pool_options() -> dict:
+    return dict(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+def make_engine(url: str, read_only: bool = False, **overrides) -> Engine:
+    """Create an engine tuned for ``url``'s backend.
+
+    With ``read_only`` every connection rejects writes. Other keyword
+    arguments are passed to ``create_engine`` and win over the
+    environment-driven defaults.
+    """
+    parsed = make_url(url)
+    options = {'echo': DB_ECHO, 'future': True}
+
+    if parsed.get_backend_name() == 'sqlite':
+        memory = _is_memory_sqlite(parsed)
+        # Sessions run in Streamlit threads; the pool hands each connection to one thread at a time.
+        options['connect_args'] = {'check_same_thread': False, 'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if not memory:
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+        options.update(overrides)
+        engine = create_engine(url, **options)
+        _install_sqlite_pragmas(engine, memory, read_only)
+    else:
+        options.update(poolclass=QueuePool, **_server_pool_options())
+        options.update(overrides)
+        engine = create_engine(url, **options)
+        if read_only:
+            backend = parsed.get_backend_name()
+            if backend not in _READ_ONLY_SESSION:
+                raise ValueError(f"Read-only connections are not supported for {backend} databases")
+            _install_connect_statements(engine, [_READ_ONLY_SESSION[backend]])
+
+    _track_pool(engine)
+    return engine
+
+
+def make_async_engine(url: str, read_only: bool = False, **overrides):
+    """Async counterpart of ``make_engine`` for an async driver URL
+    (``sqlite+aiosqlite``, ``postgresql+asyncpg``).
+
+    The same pragmas, pool sizing and ``read_only`` handling apply; pool
+    statistics are available through ``pool_stats(engine.sync_engine)``.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    parsed = make_url(url)
+    options = {'echo': DB_ECHO}
+    if parsed.get_backend_name() != 'sqlite':
+        options.update(_server_pool_options())
+    options.update(overrides)
+    engine = create_async_engine(url, **options)
+    backend = parsed.get_backend_name()
+    if backend == 'sqlite':
+        _install_sqlite_pragmas(engine.sync_engine, _is_memory_sqlite(parsed), read_only)
+    elif read_only:
+        if backend not in _READ_ONLY_SESSION:
+            raise ValueError(f"Read-only connections are not supported for {backend} databases")
+        _install_connect_statements(engine.sync_engine, [_READ_ONLY_SESSION[backend]])
+    _track_pool(engine.sync_engine)
+    return engine
+
+
+def pool_stats(engine: Engine) -> Dict[str, object]:
+    """Snapshot of ``engine``'s pool: sizing, current usage and lifetime counters."""
+    pool = engine.pool
+    stats: Dict[str, object] = {'backend': engine.dialect.name, 'pool': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    with _counters_lock:
+        stats.update(_counters.get(engine, {}))
+    return stats
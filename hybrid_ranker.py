@@ -0,0 +1,97 @@
+"""Single ranking pass that blends every recommendation signal.
+
+The text (TF-IDF), collaborative-filtering and knowledge-base scorers each
+produce a vector aligned with the rows of one career index snapshot. Each
+available signal is rescaled to [0, 1], blended with configurable weights and
+ranked once, so a request costs one vectorizer transform, one CF dot product
+and one knowledge-base pass instead of three separate pipelines.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from career_knowledge import COMPREHENSIVE_CAREER_KNOWLEDGE, analyze_career_match, career_field_key
+from counselor_core import career_index, cf_scores_for_user, top_k_rows
+
+DEFAULT_WEIGHTS = {'text': 0.5, 'cf': 0.3, 'knowledge': 0.2}
+
+_FIELD_KEYS = list(COMPREHENSIVE_CAREER_KNOWLEDGE)
+
+
+def _career_field_codes(careers: pd.DataFrame, vectorizer, vectors) -> np.ndarray:
+    """Knowledge-base field position per career; -1 where no field fits."""
+    positions = {key: i for i, key in enumerate(_FIELD_KEYS)}
+    return np.array([
+        positions.get(career_field_key(name, field, default=None), -1)
+        for name, field in zip(careers['name'], careers['field'])
+    ], dtype=np.int64)
+
+
+def _rescale(scores: np.ndarray) -> np.ndarray:
+    low, high = float(scores.min()), float(scores.max())
+    if high - low <= 1e-12:
+        return np.zeros_like(scores, dtype=np.float64)
+    return (scores - low) / (high - low)
+
+
+def compute_signals(text: Optional[str] = None, user_id: Optional[int] = None,
+                    user_skills: Optional[List[str]] = None,
+                    user_personality: Optional[List[str]] = None):
+    """Return ``(careers, signals)`` where each signal is aligned with ``careers`` rows.
+
+    Signals whose inputs are missing are left out. Every signal is computed
+    from one career index snapshot.
+    """
+    use_knowledge = bool(user_skills or user_personality)
+    if use_knowledge:
+        careers, vectorizer, vectors, codes = career_index.snapshot_with('knowledge_fields', _career_field_codes)
+    else:
+        careers, vectorizer, vectors = career_index.snapshot()
+    signals: Dict[str, np.ndarray] = {}
+
+    if text and text.strip():
+        signals['text'] = (vectorizer.transform([text]) @ vectors.T).toarray().ravel()
+
+    if user_id is not None:
+        # Matched by career id: the CF model may have been trained on another snapshot
+        cf = cf_scores_for_user(user_id, careers)
+        if cf is not None:
+            signals['cf'] = np.asarray(cf, dtype=np.float64)
+
+    if use_knowledge:
+        field_scores = analyze_career_match(user_skills or [], user_personality or [])
+        by_position = np.array([field_scores[key]['score'] for key in _FIELD_KEYS] + [0.0])
+        signals['knowledge'] = by_position[codes]
+
+    return careers, signals
+
+
+def rank_careers(text: Optional[str] = None, user_id: Optional[int] = None,
+                 user_skills: Optional[List[str]] = None,
+                 user_personality: Optional[List[str]] = None,
+                 top_k: int = 5, weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Rank catalog careers by a weighted blend of text, CF and knowledge-base scores.
+
+    Weights of missing signals are redistributed over the available ones. The
+    result has the usual career columns, the blended ``score`` and one
+    ``<signal>_score`` column per signal used.
+    """
+    careers, signals = compute_signals(text, user_id, user_skills, user_personality)
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    active = {name: weights.get(name, 0.0) for name in signals if weights.get(name, 0.0) > 0}
+    if not active or len(careers) == 0:
+        return pd.DataFrame()
+
+    total = sum(active.values())
+    blended = np.zeros(len(careers))
+    for name, weight in active.items():
+        blended += (weight / total) * _rescale(signals[name])
+
+    indices, scores = top_k_rows(blended, top_k)
+    ranked = careers.iloc[indices[0]].copy()
+    ranked['score'] = scores[0]
+    for name in active:
+        ranked[f'{name}_score'] = signals[name][indices[0]]
+    columns = ['name', 'field', 'description', 'avg_salary', 'growth_rate', 'score']
+    return ranked[columns + [f'{name}_score' for name in active]]
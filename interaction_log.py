@@ -0,0 +1,155 @@
+"""Write-behind logging of user interactions.
+
+Recommendation views, save clicks and exports are recorded as ``Interaction``
+rows, which feed analytics and the collaborative-filtering model. Instead of a
+commit per click, events go into an in-memory queue. A background thread
+writes them with one batched insert when ``INTERACTION_BATCH_SIZE`` events are
+waiting or ``INTERACTION_FLUSH_SECONDS`` have passed since the first one.
+
+The queue is bounded: when the writer falls behind, ``log`` waits up to
+``INTERACTION_ENQUEUE_TIMEOUT`` seconds for room and then drops the event,
+so a slow database never stalls the UI. Pending events are flushed on
+``close()``, which runs at interpreter exit.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from counselor_core import Interaction, engine
+
+INTERACTION_BATCH_SIZE = int(os.getenv('INTERACTION_BATCH_SIZE', '200'))
+INTERACTION_FLUSH_SECONDS = float(os.getenv('INTERACTION_FLUSH_SECONDS', '2'))
+INTERACTION_QUEUE_SIZE = int(os.getenv('INTERACTION_QUEUE_SIZE', '10000'))
+INTERACTION_ENQUEUE_TIMEOUT = float(os.getenv('INTERACTION_ENQUEUE_TIMEOUT', '0.05'))
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class InteractionLogger:
+    """Buffers interaction events and inserts them in batches from a background thread."""
+
+    def __init__(self, bind=engine, batch_size: int = INTERACTION_BATCH_SIZE,
+                 flush_seconds: float = INTERACTION_FLUSH_SECONDS,
+                 queue_size: int = INTERACTION_QUEUE_SIZE,
+                 enqueue_timeout: float = INTERACTION_ENQUEUE_TIMEOUT):
+        self.bind = bind
+        self.batch_size = max(batch_size, 1)
+        self.flush_seconds = flush_seconds
+        self.enqueue_timeout = enqueue_timeout
+        self.stats = {'logged': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+        self._queue = queue.Queue(maxsize=max(queue_size, 1))
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='interaction-log', daemon=True)
+        self._thread.start()
+
+    def log(self, user_id: Optional[int], interaction_type: str, career: Optional[str] = None,
+            career_id: Optional[int] = None, **data) -> bool:
+        """Queue one event; returns False if it was dropped.
+
+        ``career`` is stored as the row's content and, together with
+        ``career_id`` and any extra keyword data, in ``interaction_data``.
+        """
+        payload = {key: value for key, value in
+                   {'career': career, 'career_id': career_id, **data}.items() if value is not None}
+        row = {
+            'user_id': user_id,
+            'interaction_type': interaction_type,
+            'content': career,
+            'interaction_data': json.dumps(payload, default=str) if payload else None,
+            'created_at': datetime.utcnow(),
+        }
+        if self._closed:
+            return self._count('dropped')
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            return self._count('dropped')
+        self._count('logged')
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far; returns False if it did not finish in time."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _count(self, name: str, n: int = 1) -> bool:
+        with self._lock:
+            self.stats[name] += n
+        return False
+
+    def _write(self, rows) -> None:
+        if not rows:
+            return
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(Interaction.__table__.insert(), rows)
+        except Exception:
+            logger.exception("Dropping %d interaction events after a failed insert", len(rows))
+            self._count('failed', len(rows))
+            return
+        with self._lock:
+            self.stats['written'] += len(rows)
+            self.stats['batches'] += 1
+
+    def _run(self) -> None:
+        rows, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+                if len(rows) < self.batch_size:
+                    continue
+            self._write(rows)
+            rows, deadline = [], None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_interaction_logger() -> InteractionLogger:
+    """The process-wide logger, started on first use and flushed at exit."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = InteractionLogger()
+            atexit.register(_logger.close)
+        return _logger
+
+
+def log_interaction(user_id: Optional[int], interaction_type: str, career: Optional[str] = None,
+                    career_id: Optional[int] = None, **data) -> bool:
+    """Record one interaction through the shared write-behind logger."""
+    return get_interaction_logger().log(user_id, interaction_type, career, career_id, **data)
@@ -0,0 +1,121 @@
+"""Versioned schema migrations.
+
+``Base.metadata.create_all`` only creates missing tables, so changes to
+existing tables (new indexes, columns) are applied here. Each migration has a
+version number and runs once, in its own transaction; applied versions are
+recorded in the ``schema_migrations`` table. Migrations must be idempotent
+because a fresh database already gets the current schema from ``create_all``.
+
+    python migrations.py              # apply pending migrations
+    python migrations.py --status     # list applied and pending versions
+    python migrations.py --explain    # query plans of the hot queries
+"""
+import argparse
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _migration_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String, nullable=False),
+    Column('applied_at', DateTime, default=datetime.utcnow),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection, MetaData], None]
+
+
+def _create_indexes(*names: str) -> Callable[[Connection, MetaData], None]:
+    """Migration step creating the named indexes as declared on the models."""
+    def apply(conn: Connection, metadata: MetaData) -> None:
+        declared = {index.name: index for table in metadata.tables.values() for index in table.indexes}
+        for name in names:
+            declared[name].create(conn, checkfirst=True)
+    return apply
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'index hot query columns', _create_indexes(
+        'ix_market_trends_career_date',
+        'ix_interactions_user_created',
+        'ix_assessments_user_created',
+        'ix_user_profiles_user',
+        'ix_career_skill_skill',
+    )),
+]
+
+
+def applied_versions(conn: Connection) -> List[int]:
+    return sorted(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine, metadata: MetaData) -> List[int]:
+    """Apply pending migrations in order and return the versions applied."""
+    _migration_metadata.create_all(engine)
+    with engine.connect() as conn:
+        done = set(applied_versions(conn))
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            # Another process may have applied it since we looked.
+            if conn.execute(select(schema_migrations.c.version).where(
+                    schema_migrations.c.version == migration.version)).first():
+                continue
+            migration.apply(conn, metadata)
+            conn.execute(schema_migrations.insert().values(version=migration.version, name=migration.name))
+        applied.append(migration.version)
+    return applied
+
+
+def explain_hot_queries(engine: Engine) -> None:
+    """Print the database's plan for each query the app runs on a hot path."""
+    from counselor_core import Assessment, Interaction, MarketTrend, UserProfile
+
+    queries = {
+        'market trend of one career': select(MarketTrend).where(MarketTrend.career_id == 1).order_by(MarketTrend.date),
+        'recent interactions of one user': select(Interaction).where(Interaction.user_id == 1)
+        .order_by(Interaction.created_at.desc()).limit(20),
+        'latest assessment of one user': select(Assessment).where(Assessment.user_id == 1)
+        .order_by(Assessment.created_at.desc()).limit(1),
+        'profile of one user': select(UserProfile).where(UserProfile.user_id == 1),
+        'careers requiring one skill': text('SELECT career_id FROM career_skill WHERE skill_id = 1'),
+    }
+    prefix = 'EXPLAIN QUERY PLAN' if engine.dialect.name == 'sqlite' else 'EXPLAIN'
+    with engine.connect() as conn:
+        for label, query in queries.items():
+            sql = str(query.compile(engine, compile_kwargs={'literal_binds': True}))
+            print(f"-- {label}")
+            for row in conn.execute(text(f'{prefix} {sql}')):
+                print('   ', row[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply database schema migrations.')
+    parser.add_argument('--status', action='store_true', help='list applied and pending migrations')
+    parser.add_argument('--explain', action='store_true', help='print query plans of the hot queries')
+    args = parser.parse_args()
+
+    from counselor_core import engine, init_db
+    init_db(seed=False)
+
+    if args.status:
+        with engine.connect() as conn:
+            done = set(applied_versions(conn))
+        for migration in MIGRATIONS:
+            state = 'applied' if migration.version in done else 'pending'
+            print(f"{migration.version:>4}  {state:<8} {migration.name}")
+    if args.explain:
+        explain_hot_queries(engine)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Process-pool recommendation service shared by every Streamlit session.
+
+Streamlit runs each session's script in a thread of one process, so CPU-bound
+recommendation work (TF-IDF transforms, pandas, CF scoring) serializes on the
+GIL. This module keeps one ``ProcessPoolExecutor`` per server process whose
+workers preload the career index once, and exposes drop-in versions of the
+recommenders that submit work to it. The CF model is loaded on a worker's
+first CF request, from the artifact ``bootstrap.py --warm-up`` saves when the
+feedback has not changed since.
+
+Protocol: a request is ``(kind, args, kwargs)`` where ``kind`` names an entry
+in ``_HANDLERS``; the worker answers with the handler's picklable return value
+or re-raises its exception in the caller.
+
+Admission is bounded: at most ``RECOMMENDER_MAX_PENDING`` requests may be queued
+or running, further calls fail fast with ``ServiceBusy``. Each call waits at
+most ``RECOMMENDER_TIMEOUT_SECONDS`` for its answer. Setting
+``RECOMMENDER_WORKERS=0`` runs every handler inline in the calling thread.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+RECOMMENDER_WORKERS = int(os.getenv('RECOMMENDER_WORKERS', '2'))
+RECOMMENDER_MAX_PENDING = int(os.getenv('RECOMMENDER_MAX_PENDING', str(max(RECOMMENDER_WORKERS, 1) * 4)))
+RECOMMENDER_TIMEOUT_SECONDS = float(os.getenv('RECOMMENDER_TIMEOUT_SECONDS', '10'))
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the request queue is full."""
+
+
+def _text(text, top_k=5):
+    from counselor_core import recommend_careers_by_text
+    return recommend_careers_by_text(text, top_k)
+
+
+def _cf(user_id, top_k=5):
+    from counselor_core import recommend_cf_for_user
+    return recommend_cf_for_user(user_id, top_k)
+
+
+def _hybrid(**kwargs):
+    from hybrid_ranker import rank_careers
+    return rank_careers(**kwargs)
+
+
+def _quiz(answers):
+    from career_knowledge import get_personalized_career_insights, process_quiz_results
+    skills, personality = process_quiz_results(answers)
+    return {
+        'skills': skills,
+        'personality': personality,
+        'insights': get_personalized_career_insights(skills, personality),
+    }
+
+
+_HANDLERS = {
+    'text': _text,
+    'cf': _cf,
+    'hybrid': _hybrid,
+    'quiz': _quiz,
+}
+
+
+def _handle(kind, args, kwargs):
+    return _HANDLERS[kind](*args, **kwargs)
+
+
+def _init_worker():
+    """Load the text index once per worker instead of on its first request.
+
+    CF training is left out: it can take longer than ``RECOMMENDER_TIMEOUT_SECONDS``,
+    which the first requests would otherwise spend waiting for the pool to start.
+    """
+    try:
+        import counselor_core
+        counselor_core.warm_up(cf=False, accounts=False)
+    except Exception:
+        # Requests will load lazily and surface the error themselves.
+        pass
+
+
+class RecommendationService:
+    """Bounded front end over a process pool of recommendation workers."""
+
+    def __init__(self, max_workers=RECOMMENDER_WORKERS, max_pending=RECOMMENDER_MAX_PENDING,
+                 timeout=RECOMMENDER_TIMEOUT_SECONDS):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers must not inherit the server's threads or DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def _reset_executor(self, broken):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def call(self, kind, *args, timeout=None, **kwargs):
+        """Run one request and return its result.
+
+        Raises ServiceBusy when the queue is full and
+        ``concurrent.futures.TimeoutError`` when the answer takes too long.
+        """
+        if kind not in _HANDLERS:
+            raise ValueError(f"Unknown recommendation request: {kind}")
+        if self.max_workers <= 0:
+            return _handle(kind, args, kwargs)
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy("Recommendation service is busy, please retry")
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_handle, kind, args, kwargs)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_executor(executor)
+            raise
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the worker is really done, not just until we stop waiting.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise
+        finally:
+            future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """The process-wide service, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RecommendationService()
+            atexit.register(_service.shutdown)
+        return _service
+
+
+def recommend_careers_by_text(text, top_k=5):
+    """``counselor_core.recommend_careers_by_text`` run on the worker pool."""
+    return get_service().call('text', text, top_k)
+
+
+def recommend_cf_for_user(user_id, top_k=5):
+    """``counselor_core.recommend_cf_for_user`` run on the worker pool."""
+    return get_service().call('cf', user_id, top_k)
+
+
+def rank_careers(**kwargs):
+    """``hybrid_ranker.rank_careers`` run on the worker pool."""
+    return get_service().call('hybrid', **kwargs)
+
+
+def score_quiz(answers):
+    """Extract skills and personality from quiz answers and derive insights on the worker pool."""
+    return get_service().call('quiz', answers)
@@ -0,0 +1,197 @@
+"""Login sessions: signed tokens over the ``user_sessions`` table.
+
+A login creates a ``UserSession`` row and hands the browser a token
+``<session id>.<signature>``, where the signature is an HMAC of the id under
+``SECRET_KEY``. The app keeps the token in a browser cookie, never in the URL,
+so a reconnecting or reloaded browser resumes the session without logging in
+again. ``SECRET_KEY`` is required unless ``APP_ENV`` is ``development``.
+
+Resolving a token checks the signature first, so forged or mangled tokens
+never reach the database. Valid sessions are kept with their user's id, name
+and email in an in-process LRU of ``SESSION_CACHE_SIZE`` entries; a cached
+entry is trusted for ``SESSION_CACHE_TTL_SECONDS`` before the row is read
+again, which bounds how long a session revoked from another process stays
+usable here. Sessions expire ``SESSION_TTL_SECONDS`` after login.
+"""
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import delete, or_, select, update
+
+from counselor_core import SessionLocal, User, UserSession
+
+SESSION_TTL_SECONDS = int(os.getenv('SESSION_TTL_SECONDS', str(7 * 24 * 3600)))
+SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', '10000'))
+SESSION_CACHE_TTL_SECONDS = float(os.getenv('SESSION_CACHE_TTL_SECONDS', '300'))
+APP_ENV = os.getenv('APP_ENV', 'production')
+
+logger = logging.getLogger(__name__)
+
+
+def _secret_key() -> bytes:
+    key = os.getenv('SECRET_KEY', '')
+    if key:
+        return key.encode()
+    if APP_ENV != 'development':
+        raise RuntimeError("SECRET_KEY must be set to sign session tokens "
+                           "(APP_ENV=development allows a throwaway key for local runs)")
+    logger.warning("SECRET_KEY is not set; session tokens will not survive a restart or work across servers")
+    return secrets.token_bytes(32)
+
+
+class SessionInfo(NamedTuple):
+    session_id: str
+    user_id: int
+    email: str
+    full_name: str
+    expires_at: datetime
+
+
+class SessionStore:
+    """Issues, resolves and revokes session tokens, with an LRU in front of the table."""
+
+    def __init__(self, secret: bytes, ttl: int = SESSION_TTL_SECONDS, cache_size: int = SESSION_CACHE_SIZE,
+                 cache_ttl: float = SESSION_CACHE_TTL_SECONDS):
+        self.secret = secret
+        self.ttl = ttl
+        self.cache_size = max(cache_size, 1)
+        self.cache_ttl = cache_ttl
+        self._lock = threading.Lock()
+        self._cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'rejected': 0, 'evictions': 0}
+
+    def _sign(self, session_id: str) -> str:
+        digest = hmac.new(self.secret, session_id.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+    def _session_id(self, token: Optional[str]) -> Optional[str]:
+        """The session id of a correctly signed token, else None."""
+        session_id, _, signature = (token or '').partition('.')
+        if session_id and signature and hmac.compare_digest(signature, self._sign(session_id)):
+            return session_id
+        return None
+
+    def _remember(self, info: SessionInfo) -> None:
+        with self._lock:
+            self._cache[info.session_id] = (info, time.monotonic())
+            self._cache.move_to_end(info.session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _forget(self, session_id: str) -> None:
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    def create(self, user_id: int) -> str:
+        """Open a session for ``user_id`` and return its token."""
+        session_id = secrets.token_urlsafe(24)
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+        with SessionLocal() as s:
+            user = s.query(User.email, User.full_name).filter(User.id == user_id).one()
+            s.add(UserSession(id=session_id, user_id=user_id, expires_at=expires_at))
+            s.commit()
+        self._remember(SessionInfo(session_id, user_id, user.email, user.full_name, expires_at))
+        return f'{session_id}.{self._sign(session_id)}'
+
+    def resolve(self, token: Optional[str]) -> Optional[SessionInfo]:
+        """The live session a token names, or None if it is invalid, expired or revoked."""
+        session_id = self._session_id(token)
+        if session_id is None:
+            with self._lock:
+                self._stats['rejected'] += 1
+            return None
+
+        with self._lock:
+            cached = self._cache.get(session_id)
+            if cached is not None and time.monotonic() - cached[1] < self.cache_ttl:
+                if cached[0].expires_at > datetime.utcnow():
+                    self._cache.move_to_end(session_id)
+                    self._stats['hits'] += 1
+                    return cached[0]
+            self._stats['misses'] += 1
+
+        with SessionLocal() as s:
+            row = s.execute(
+                select(UserSession.user_id, User.email, User.full_name, UserSession.expires_at)
+                .join(User, User.id == UserSession.user_id)
+                .where(UserSession.id == session_id, UserSession.revoked_at.is_(None),
+                       UserSession.expires_at > datetime.utcnow(), User.is_active.isnot(False))
+            ).first()
+        if row is None:
+            self._forget(session_id)
+            return None
+        info = SessionInfo(session_id, *row)
+        self._remember(info)
+        return info
+
+    def revoke(self, token: Optional[str]) -> None:
+        """End the session a token names (logout)."""
+        session_id = self._session_id(token)
+        if session_id is None:
+            return
+        self._forget(session_id)
+        with SessionLocal() as s:
+            s.execute(update(UserSession).where(UserSession.id == session_id, UserSession.revoked_at.is_(None))
+                      .values(revoked_at=datetime.utcnow()))
+            s.commit()
+
+    def revoke_user(self, user_id: int) -> None:
+        """End every session of a user, e.g. after a password change."""
+        with self._lock:
+            for session_id in [sid for sid, (info, _) in self._cache.items() if info.user_id == user_id]:
+                del self._cache[session_id]
+        with SessionLocal() as s:
+            s.execute(update(UserSession).where(UserSession.user_id == user_id, UserSession.revoked_at.is_(None))
+                      .values(revoked_at=datetime.utcnow()))
+            s.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired and revoked session rows; returns how many were removed."""
+        with SessionLocal() as s:
+            result = s.execute(delete(UserSession).where(
+                or_(UserSession.expires_at <= datetime.utcnow(), UserSession.revoked_at.isnot(None))
+            ))
+            s.commit()
+        return result.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'cached': len(self._cache)}
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """The process-wide store, created on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(_secret_key())
+        return _store
+
+
+def create_session(user_id: int) -> str:
+    """Open a session for a user who just logged in and return its token."""
+    return get_session_store().create(user_id)
+
+
+def resolve_session(token: Optional[str]) -> Optional[SessionInfo]:
+    """The live session of a token, served from memory when possible."""
+    return get_session_store().resolve(token)
+
+
+def revoke_session(token: Optional[str]) -> None:
+    """Log a token's session out everywhere."""
+    get_session_store().revoke(token)
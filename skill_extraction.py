@@ -0,0 +1,146 @@
+"""Skill extraction from free text (resumes, profile descriptions).
+
+Skills are found with a multi-pattern (Aho–Corasick) matcher compiled over
+the skill lexicon: the field skills of ``COMPREHENSIVE_CAREER_KNOWLEDGE``, the
+``skills_required`` of its careers and the names in the ``skills`` table. The
+automaton works on tokens, so multi-word skills such as "machine learning"
+match as one, word boundaries come for free and a resume is scanned in a
+single pass. The matcher is built on first use and rebuilt when the skills
+catalog version changes.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words, plus '.' and '/' glued between two words ("node.js", "ci/cd") so they
+# must match literally; hyphens and other punctuation separate words.
+_TOKEN = re.compile(r"[a-z0-9+#]+|(?<=[a-z0-9+#])[./](?=[a-z0-9+#])")
+
+
+def _normalize(token: str) -> str:
+    # Light plural folding, applied to patterns and text alike
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, plural-folded tokens the matcher runs on."""
+    return [_normalize(token) for token in _TOKEN.findall(text.lower())]
+
+
+class SkillMatcher:
+    """Token-level Aho–Corasick automaton mapping skill phrases to canonical names."""
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        """``phrases`` yields ``(phrase, canonical name)``; the first name given for a phrase wins."""
+        self.names: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[Tuple[int, int]]] = [[]]
+        seen = set()
+        for phrase, name in phrases:
+            tokens = tokenize(phrase)
+            key = tuple(tokens)
+            if not tokens or key in seen:
+                continue
+            seen.add(key)
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(self.names), len(tokens)))
+            self.names.append(name)
+        # Raw text token -> automaton token, for every token any pattern uses
+        # (plural folding precomputed, so other tokens cost one dict miss).
+        self._vocabulary: Dict[str, str] = {}
+        for token in {token for edges in self._goto for token in edges}:
+            self._vocabulary[token] = token
+            if _normalize(token + 's') == token:
+                self._vocabulary[token + 's'] = token
+        self._fail = self._link()
+
+    def _link(self) -> List[int]:
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())  # depth-1 states fail to the root
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and token not in self._goto[f]:
+                    f = fail[f]
+                fail[nxt] = self._goto[f].get(token, 0)
+                self._out[nxt] = self._out[nxt] + self._out[fail[nxt]]
+        return fail
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Leftmost-longest, non-overlapping matches as ``(start token, end token, name)``."""
+        goto, fail, out, vocabulary = self._goto, self._fail, self._out, self._vocabulary
+        matches = []
+        state = 0
+        for pos, token in enumerate(_TOKEN.findall(text.lower())):
+            token = vocabulary.get(token)
+            if token is None:
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern, length in out[state]:
+                matches.append((pos - length + 1, -length, pattern))
+        matches.sort()  # by start, longest first
+        chosen, covered = [], -1
+        for start, neg_length, pattern in matches:
+            if start > covered:
+                covered = start - neg_length - 1
+                chosen.append((start, covered, self.names[pattern]))
+        return chosen
+
+
+def _lexicon() -> Iterable[Tuple[str, str]]:
+    """(phrase, canonical name) pairs, most authoritative source first."""
+    from career_knowledge import COMPREHENSIVE_CAREER_KNOWLEDGE
+    try:
+        from counselor_core import get_skill_data
+        for name in get_skill_data()['name'].dropna():
+            yield str(name), str(name)
+    except Exception:
+        # No database yet: the knowledge base alone still covers the common skills
+        pass
+    for data in COMPREHENSIVE_CAREER_KNOWLEDGE.values():
+        for career in data.get('careers', []):
+            for skill in career.get('skills_required', []):
+                yield skill, skill
+    for data in COMPREHENSIVE_CAREER_KNOWLEDGE.values():
+        for skill in data.get('skills', []):
+            yield skill, skill
+
+
+def build_skill_matcher() -> SkillMatcher:
+    return SkillMatcher(_lexicon())
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """The shared matcher, rebuilt when the skills catalog changes."""
+    from counselor_core import catalog_cache
+    return catalog_cache.get('skill_matcher', ('skills',), build_skill_matcher)
+
+
+def extract_skills_from_text(text, limit: Optional[int] = 10):
+    """Up to ``limit`` canonical skills mentioned in ``text`` (all with ``limit=None``),
+    most mentioned first, then in order of appearance."""
+    if not text:
+        return []
+    counts: Dict[str, int] = {}
+    for _, _, name in get_skill_matcher().find(text):
+        counts[name] = counts.get(name, 0) + 1
+    skills = sorted(counts, key=lambda name: -counts[name])  # stable: ties keep first-seen order
+    return skills if limit is None else skills[:limit]
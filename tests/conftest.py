@@ -0,0 +1,34 @@
+"""Shared setup: a throwaway SQLite database and artifact directory per test run.
+
+The app modules read their configuration from the environment at import
+time, so it is set here before any of them is imported.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_workdir = tempfile.mkdtemp(prefix='career-counselor-tests-')
+os.environ.update({
+    'DATABASE_URL': f"sqlite:///{os.path.join(_workdir, 'test.db')}",
+    'ARTIFACT_DIR': os.path.join(_workdir, 'artifacts'),
+    'SECRET_KEY': 'test-secret',
+    # Cheap password hashes and immediate catalog-version checks
+    'PASSWORD_SCRYPT_N': '1024',
+    'CATALOG_VERSION_TTL': '0',
+    'RECOMMENDER_WORKERS': '0',
+})
+os.environ.pop('DATABASE_REPLICA_URL', None)
+
+import pytest  # noqa: E402
+
+import counselor_core  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    """Create the schema and seed the sample catalog once."""
+    counselor_core.init_db(seed=True)
+    return counselor_core
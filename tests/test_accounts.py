@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import pytest
+
+import counselor_core as core
+import credential_service
+from credential_service import needs_rehash
+
+
+def _stored_hash(email):
+    with core.SessionLocal() as s:
+        return s.query(core.User.password_hash).filter_by(email=email).scalar()
+
+
+def test_create_account_rejects_duplicate_email():
+    created, user_id, _ = core.create_user_account('Ada', 'ada@example.com', 'secret')
+    assert created and user_id
+    assert core.create_user_account('Ada', 'ada@example.com', 'other')[:2] == (False, None)
+    assert core.verify_user_credentials('ada@example.com', 'secret') == user_id
+    assert core.verify_user_credentials('ada@example.com', 'wrong') is None
+    assert core.get_user_by_email('ada@example.com').full_name == 'Ada'
+
+
+def test_sign_in_gives_up_when_the_hash_pool_is_stuck(monkeypatch):
+    core.create_user_account('Stuck', 'stuck@example.com', 'secret')
+    service = credential_service.CredentialService(max_workers=1, timeout=0.2)
+    monkeypatch.setattr(credential_service, '_service', service)
+    release = threading.Event()
+    service.submit('hashed', release.wait)  # occupies the only worker
+    try:
+        with pytest.raises(FuturesTimeoutError):
+            core.verify_user_credentials('stuck@example.com', 'secret')
+        with pytest.raises(FuturesTimeoutError):
+            core.create_user_account('Late', 'late@example.com', 'secret')
+    finally:
+        release.set()
+        service.shutdown()
+    assert core.get_user_by_email('late@example.com') is None
+
+
+def test_legacy_hash_is_upgraded_on_login():
+    legacy = hashlib.sha256(b'hunter2').hexdigest()
+    with core.SessionLocal() as s:
+        user = core.User(email='legacy@example.com', full_name='Legacy', password_hash=legacy)
+        s.add(user)
+        s.commit()
+        user_id = user.id
+
+    assert core.verify_user_credentials('legacy@example.com', 'wrong') is None
+    assert _stored_hash('legacy@example.com') == legacy
+
+    assert core.verify_user_credentials('legacy@example.com', 'hunter2') == user_id
+    upgraded = _stored_hash('legacy@example.com')
+    assert upgraded.startswith('scrypt$') and not needs_rehash(upgraded)
+    assert core.verify_user_credentials('legacy@example.com', 'hunter2') == user_id
+    assert _stored_hash('legacy@example.com') == upgraded
+
+
+def test_outdated_cost_is_rehashed(monkeypatch):
+    core.create_user_account('Cheap', 'cheap@example.com', 'pw')
+    old = _stored_hash('cheap@example.com')
+    monkeypatch.setattr(credential_service, 'PASSWORD_SCRYPT_N', 2048)
+    assert needs_rehash(old)
+    assert core.verify_user_credentials('cheap@example.com', 'pw')
+    assert _stored_hash('cheap@example.com').startswith('scrypt$2048$')
+
+
+def test_bulk_import_skips_existing_and_repeated_emails():
+    core.create_user_account('Existing', 'existing@uni.edu', 'pw')
+    rows = [{'full_name': f'Student {i}', 'email': f'student{i}@uni.edu', 'password': 'pw'} for i in range(25)]
+    rows += [{'full_name': 'Again', 'email': 'student3@uni.edu', 'password': 'pw'},
+             {'full_name': 'Existing', 'email': 'existing@uni.edu', 'password': 'pw'}]
+    result = core.create_user_accounts(rows, batch_size=10)
+    assert result['created'] == 25
+    assert sorted(result['skipped']) == ['existing@uni.edu', 'student3@uni.edu']
+    assert core.verify_user_credentials('student7@uni.edu', 'pw')
+    assert all(core.email_may_exist(row['email']) for row in rows)
+
+
+def test_email_filter_is_loaded_at_warm_up(monkeypatch):
+    core.create_user_account('Known', 'known@example.com', 'pw')
+    monkeypatch.setattr(core, '_email_filter', None)
+    core.warm_up(cf=False)
+    assert core._email_filter is not None
+    with core.SessionLocal() as s:
+        emails = [email for (email,) in s.query(core.User.email)]
+    assert core._email_filter.might_contain_many(emails).all()
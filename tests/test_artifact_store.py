@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import artifact_store
+from artifact_store import content_key, load_artifact, load_frame, prune_artifacts, save_artifact, save_frame
+
+
+def test_artifact_round_trip_is_memory_mapped():
+    key = content_key('testarrays', b'round trip')
+    arrays = {'vectors': np.arange(12, dtype=np.float32).reshape(3, 4), 'ids': np.array([3, 1, 2])}
+    assert save_artifact(key, arrays, {'rows': 3})
+    loaded, meta = load_artifact(key)
+    assert meta['rows'] == 3
+    assert isinstance(loaded['vectors'], np.memmap)
+    np.testing.assert_array_equal(loaded['vectors'], arrays['vectors'])
+    np.testing.assert_array_equal(loaded['ids'], arrays['ids'])
+
+
+def test_keys_follow_contents():
+    assert content_key('k', b'a', b'b') == content_key('k', b'a', b'b')
+    assert content_key('k', b'a', b'b') != content_key('k', b'ab')
+    assert load_artifact(content_key('k', b'never saved')) is None
+
+
+def test_prune_keeps_newest():
+    keys = [content_key('testprune', str(i).encode()) for i in range(4)]
+    for i, key in enumerate(keys):
+        save_artifact(key, {'x': np.array([i])})
+        os.utime(os.path.join(artifact_store.ARTIFACT_DIR, key), (i + 1, i + 1))
+    prune_artifacts('testprune', keep=2)
+    assert [load_artifact(key) is not None for key in keys] == [False, False, True, True]
+
+
+def test_frame_snapshot_round_trip():
+    frame = pd.DataFrame({
+        'id': np.array([1, 2, 3], dtype=np.int64),
+        'field': pd.Categorical(['Tech', 'Design', 'Tech']),
+        'description': ['Build things', None, 'Ünïcode text'],
+        'avg_salary': [95000.0, np.nan, 60000.0],
+    })
+    key = content_key('testframe', b'round trip')
+    assert save_frame(key, frame, {'catalog_version': 7})
+    loaded, meta = load_frame(key)
+    assert meta['catalog_version'] == 7
+    pd.testing.assert_frame_equal(loaded, frame, check_dtype=False, check_categorical=False)
+    assert isinstance(loaded['field'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from bloom_filter import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(20000, error_rate=0.01)
+    items = [f'user{i}@example.com' for i in range(20000)]
+    bloom.add_many(items[:-1])
+    bloom.add(items[-1])
+    assert bloom.might_contain_many(items).all()
+    assert all(item in bloom for item in items[::97])
+    assert bloom.count == len(items) and not bloom.saturated
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter(20000, error_rate=0.01)
+    bloom.add_many(f'user{i}@example.com' for i in range(20000))
+    others = [f'other{i}@example.com' for i in range(20000)]
+    assert bloom.might_contain_many(others).mean() < 0.03
+
+
+def test_batch_and_single_checks_agree():
+    bloom = BloomFilter(100, error_rate=0.1)
+    bloom.add_many(['a', 'b', 'c'])
+    items = ['a', 'b', 'c'] + [f'x{i}' for i in range(200)]
+    assert bloom.might_contain_many(items).tolist() == [bloom.might_contain(item) for item in items]
+    assert bloom.might_contain_many([]).shape == (0,)
+    assert np.all(bloom.might_contain_many(['a', 'b', 'c']))
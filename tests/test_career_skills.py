@@ -0,0 +1,43 @@
+import pytest
+
+import counselor_core as core
+
+
+@pytest.fixture(scope='module')
+def skill_edges():
+    """Data Scientist needs Python (0.8) and SQL (0.2); Software Engineer needs Python (1.0)."""
+    careers = core.get_career_data().set_index('name')['id']
+    skills = core.get_skill_data().set_index('name')['id']
+    edges = [
+        {'career_id': int(careers['Data Scientist']), 'skill_id': int(skills['Python']), 'importance': 0.8},
+        {'career_id': int(careers['Data Scientist']), 'skill_id': int(skills['SQL']), 'importance': 0.2},
+        {'career_id': int(careers['Software Engineer']), 'skill_id': int(skills['Python']), 'importance': 1.0},
+    ]
+    with core.engine.begin() as conn:
+        conn.execute(core.career_skill.insert(), edges)
+        core.publish_catalog_versions(core.bump_catalog_version(conn, 'skills'))
+    yield
+    with core.engine.begin() as conn:
+        for edge in edges:
+            conn.execute(core.career_skill.delete().where(
+                (core.career_skill.c.career_id == edge['career_id'])
+                & (core.career_skill.c.skill_id == edge['skill_id'])
+            ))
+        core.publish_catalog_versions(core.bump_catalog_version(conn, 'skills'))
+
+
+def test_coverage_follows_career_rows(skill_edges):
+    careers = core.get_career_data()
+    coverage = core.skill_coverage(['python'])
+    by_name = dict(zip(careers['name'], coverage))
+    assert by_name['Software Engineer'] == pytest.approx(1.0)
+    assert by_name['Data Scientist'] == pytest.approx(0.8)
+    assert by_name['UX Designer'] == 0
+
+
+def test_best_covered_careers(skill_edges):
+    best = core.best_covered_careers(['Python'], top_k=2)
+    assert best['name'].tolist() == ['Software Engineer', 'Data Scientist']
+    assert best['coverage'].tolist() == pytest.approx([1.0, 0.8])
+    assert best['missing'].tolist() == [[], ['SQL']]
+    assert core.top_missing_skills(['Python'])['name'].tolist() == ['SQL']
@@ -0,0 +1,139 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import catalog_ingest
+import counselor_core as core
+from conftest import ROOT
+
+
+def _career(name):
+    careers = core.get_career_data()
+    return careers[careers['name'] == name].iloc[0]
+
+
+def _in_fresh_process(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=os.environ.copy(),
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def restore_career():
+    saved = {}
+
+    def remember(name):
+        with core.SessionLocal() as s:
+            career = s.query(core.Career).filter_by(name=name).one()
+            saved[name] = (career.field, career.description)
+
+    yield remember
+    with core.SessionLocal() as s:
+        for name, (field, description) in saved.items():
+            career = s.query(core.Career).filter_by(name=name).one()
+            career.field, career.description = field, description
+        s.commit()
+
+
+def test_same_length_edit_updates_index(restore_career):
+    restore_career('Financial Analyst')
+    assert _career('Financial Analyst')['field'] == 'Finance'
+    with core.SessionLocal() as s:
+        s.query(core.Career).filter_by(name='Financial Analyst').one().field = 'Science'
+        s.commit()
+    assert _career('Financial Analyst')['field'] == 'Science'
+
+
+def test_edit_is_searchable_right_away(restore_career):
+    restore_career('Project Manager')
+    core.get_career_data()
+    version = core.career_index.version
+    with core.SessionLocal() as s:
+        career = s.query(core.Career).filter_by(name='Project Manager').one()
+        career.description = 'Plan and execute giraffe projects'
+        s.commit()
+    top = core.recommend_careers_by_text('giraffe', top_k=1)
+    assert top['name'].iloc[0] == 'Project Manager' and top['similarity_score'].iloc[0] > 0
+    assert core.career_index.version == version + 1
+
+
+def test_fresh_process_sees_same_length_edit(restore_career):
+    restore_career('Graphic Designer')
+    core.get_career_data()  # saves the columnar snapshot and TF-IDF artifact
+    assert core.recommend_careers_by_text('zebras', top_k=1)['similarity_score'].iloc[0] == 0
+    with core.SessionLocal() as s:
+        career = s.query(core.Career).filter_by(name='Graphic Designer').one()
+        assert 'visual' in career.description
+        career.description = career.description.replace('visual', 'zebras')
+        s.commit()
+
+    out = _in_fresh_process(
+        "import counselor_core as c\n"
+        "top = c.recommend_careers_by_text('zebras', top_k=1)\n"
+        "print(top['name'].iloc[0], top['similarity_score'].iloc[0] > 0)\n"
+    )
+    assert out == 'Graphic Designer True'
+
+
+def test_reloads_after_catalog_version_bump_from_elsewhere(restore_career):
+    restore_career('Data Analyst')
+    version = core.career_index.version
+    core.get_career_data()
+    # A Core write bypasses this process's ORM hooks, as a write from another process would
+    table = core.Career.__table__
+    with core.engine.begin() as conn:
+        conn.execute(table.update().where(table.c.name == 'Data Analyst').values(field='Statistics'))
+        core.bump_catalog_version(conn, 'careers')
+    assert _career('Data Analyst')['field'] == 'Statistics'
+    assert core.career_index.version > version
+    assert core.career_index.catalog_version == core.catalog_cache.versions()['careers']
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_blank_numeric_cells_take_the_column_default(tmp_path):
+    careers = _write_csv(tmp_path / 'careers.csv', [
+        {'name': 'Blank Pilot', 'field': 'Aviation', 'avg_salary': '120000', 'growth_rate': '4.5'},
+        {'name': 'Blank Sailor', 'field': 'Maritime', 'avg_salary': '', 'growth_rate': 'n/a'},
+    ])
+    catalog_ingest.ingest_catalog(careers=careers, progress=None)
+    sailor = _career('Blank Sailor')
+    assert (sailor['avg_salary'], sailor['growth_rate']) == (0.0, 0.0)
+    assert _career('Blank Pilot')['avg_salary'] == 120000
+
+
+def test_catalog_ingest_is_idempotent(tmp_path):
+    careers = _write_csv(tmp_path / 'careers.csv', [
+        {'name': 'Ingest Nurse', 'field': 'Healthcare', 'description': 'Care for patients', 'avg_salary': 70000},
+        {'name': 'Ingest Welder', 'field': 'Trades', 'description': 'Join metal parts', 'avg_salary': 50000},
+        {'name': 'Ingest Welder', 'field': 'Trades', 'description': 'Join metal parts', 'avg_salary': 50000},
+    ])
+    career_skills = _write_csv(tmp_path / 'career_skills.csv', [
+        {'career': 'Ingest Nurse', 'skill': 'Patient Care', 'importance': 0.9},
+        {'career': 'Ingest Welder', 'skill': 'Welding', 'importance': 0.8},
+    ])
+
+    def counts():
+        with core.engine.connect() as conn:
+            return tuple(conn.execute(core.select(core.func.count()).select_from(table)).scalar()
+                         for table in (core.Career.__table__, core.Skill.__table__, core.career_skill))
+
+    catalog_ingest.ingest_catalog(careers=careers, career_skills=career_skills, progress=None)
+    first = counts()
+    catalog_ingest.ingest_catalog(careers=careers, career_skills=career_skills, progress=None)
+    assert counts() == first
+    assert _career('Ingest Nurse')['avg_salary'] == 70000
+
+    _write_csv(tmp_path / 'careers.csv', [
+        {'name': 'Ingest Nurse', 'field': 'Healthcare', 'description': 'Care for patients', 'avg_salary': 72000},
+    ])
+    catalog_ingest.ingest_catalog(careers=careers, progress=None)
+    assert counts() == first
+    assert _career('Ingest Nurse')['avg_salary'] == 72000
@@ -0,0 +1,15 @@
+import counselor_core as core
+import recommendation_service
+
+
+def test_workers_warm_only_the_text_index(monkeypatch):
+    calls = []
+    monkeypatch.setattr(core, 'warm_up', lambda **kwargs: calls.append(kwargs))
+    recommendation_service._init_worker()
+    assert calls == [{'cf': False, 'accounts': False}]
+
+
+def test_inline_service_answers_requests():
+    # RECOMMENDER_WORKERS=0 in the tests: handlers run in the calling thread
+    top = recommendation_service.recommend_careers_by_text('analyze financial data', top_k=1)
+    assert top['name'].iloc[0] == 'Financial Analyst'
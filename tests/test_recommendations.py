@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import counselor_core as core
+from career_ann import CareerANNIndex
+
+QUERIES = [
+    'I enjoy analysing data with statistics',
+    'designing user friendly digital experiences',
+    '',
+    'protecting systems from digital threats',
+    'plan and execute projects',
+]
+
+
+@pytest.mark.parametrize('approximate', [False, True])
+def test_batch_matches_single_queries(approximate):
+    frames = core.recommend_careers_by_text_batch(QUERIES, top_k=3, as_frames=True, approximate=approximate)
+    assert len(frames) == len(QUERIES)
+    for text, batch in zip(QUERIES, frames):
+        single = core.recommend_careers_by_text(text, top_k=3, approximate=approximate)
+        if not text:
+            assert batch.empty and single.empty
+            continue
+        assert batch['name'].tolist() == single['name'].tolist()
+        np.testing.assert_allclose(batch['similarity_score'], single['similarity_score'], rtol=1e-5)
+
+
+def test_batch_arrays_follow_career_rows():
+    indices, scores = core.recommend_careers_by_text_batch(['analyze financial data'], top_k=2)
+    careers = core.get_career_data()
+    assert indices.shape == scores.shape == (1, 2)
+    assert careers.iloc[indices[0, 0]]['name'] == 'Financial Analyst'
+    assert scores[0, 0] >= scores[0, 1] > 0
+
+
+def test_top_k_rows_selects_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [1.0, 0.0, 0.2, 0.3]])
+    indices, top = core.top_k_rows(scores, 2)
+    assert indices.tolist() == [[1, 3], [0, 3]]
+    np.testing.assert_allclose(top, [[0.9, 0.7], [1.0, 0.3]])
+    assert core.top_k_rows(scores, 10)[0].shape == (2, 4)
+
+
+def _synthetic_corpus(n_docs, n_topics=50, vocab_size=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f'term{i}' for i in range(vocab_size)])
+    topic_words = rng.integers(0, vocab_size, size=(n_topics, 30))
+    topics = rng.integers(0, n_topics, size=n_docs)
+    words = topic_words[topics[:, None], rng.integers(0, 30, size=(n_docs, 10))]
+    return [' '.join(row) for row in vocab[words]]
+
+
+@pytest.fixture(scope='module')
+def ann_corpus():
+    vectorizer = TfidfVectorizer()
+    vectors = vectorizer.fit_transform(_synthetic_corpus(4000)).tocsr()
+    queries = vectorizer.transform(_synthetic_corpus(100, seed=1))
+    exact = (queries @ vectors.T).toarray()
+    return vectors, queries, exact
+
+
+def _recall(ann_scores, exact, top_k):
+    # Any hit scoring at least the k-th best exact score counts, so ties are not penalised
+    kth_best = -np.partition(-exact, top_k - 1, axis=1)[:, top_k - 1]
+    return np.mean(ann_scores >= kth_best[:, None] - 1e-6)
+
+
+def test_ann_recall_against_exact_search(ann_corpus):
+    vectors, queries, exact = ann_corpus
+    index = CareerANNIndex(n_components=64).build(vectors)
+    indices, scores = index.search(queries, 10)
+    assert _recall(scores, exact, 10) >= 0.9
+    # Scores are exact cosine similarities of the returned rows
+    hit = indices >= 0
+    np.testing.assert_allclose(scores[hit], np.take_along_axis(exact, np.where(hit, indices, 0), 1)[hit], rtol=1e-5)
+
+
+def test_ann_probing_every_list_is_exact(ann_corpus):
+    vectors, queries, exact = ann_corpus
+    index = CareerANNIndex(n_components=64).build(vectors)
+    _, scores = index.search(queries, 10, n_probe=index.centroids.shape[0])
+    assert _recall(scores, exact, 10) == 1.0
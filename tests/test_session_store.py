@@ -0,0 +1,61 @@
+import pytest
+
+import counselor_core as core
+import session_store
+from session_store import SessionStore
+
+
+@pytest.fixture(scope='module')
+def user_id():
+    return core.create_user_account('Session User', 'session@example.com', 'pw')[1]
+
+
+def test_token_resolves_to_user(user_id):
+    store = SessionStore(b'key')
+    info = store.resolve(store.create(user_id))
+    assert (info.user_id, info.email, info.full_name) == (user_id, 'session@example.com', 'Session User')
+
+
+def test_tampered_tokens_are_rejected(user_id):
+    store = SessionStore(b'key')
+    token = store.create(user_id)
+    session_id, _, signature = token.partition('.')
+    flipped = signature[:-1] + ('A' if signature[-1] != 'A' else 'B')
+    assert store.resolve(f'{session_id}.{flipped}') is None
+    assert store.resolve(f'{session_id}x.{signature}') is None
+    assert store.resolve(session_id) is None
+    assert store.resolve(None) is None
+    assert SessionStore(b'other key').resolve(token) is None
+    assert store.stats()['rejected'] == 4  # the other key's rejection counts in the other store
+
+
+def test_expired_session_is_rejected(user_id):
+    store = SessionStore(b'key', ttl=0)
+    assert store.resolve(store.create(user_id)) is None
+
+
+def test_revoked_session_is_rejected_everywhere(user_id):
+    store = SessionStore(b'key')
+    other_process = SessionStore(b'key', cache_ttl=0)
+    token = store.create(user_id)
+    assert other_process.resolve(token) is not None
+    store.revoke(token)
+    assert store.resolve(token) is None
+    assert other_process.resolve(token) is None
+
+
+def test_revoke_user_ends_all_sessions(user_id):
+    store = SessionStore(b'key')
+    tokens = [store.create(user_id) for _ in range(3)]
+    store.revoke_user(user_id)
+    assert all(store.resolve(token) is None for token in tokens)
+    assert store.purge_expired() >= 3
+
+
+def test_secret_key_is_required_outside_development(monkeypatch):
+    monkeypatch.delenv('SECRET_KEY')
+    monkeypatch.setattr(session_store, 'APP_ENV', 'production')
+    with pytest.raises(RuntimeError):
+        session_store._secret_key()
+    monkeypatch.setattr(session_store, 'APP_ENV', 'development')
+    assert len(session_store._secret_key()) == 32
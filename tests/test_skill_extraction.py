@@ -0,0 +1,54 @@
+from skill_extraction import SkillMatcher, extract_skills_from_text, tokenize
+
+PHRASES = [
+    ('machine learning', 'Machine Learning'),
+    ('machine', 'Machine'),
+    ('learning', 'Learning'),
+    ('deep machine learning', 'Deep Machine Learning'),
+    ('node.js', 'Node.js'),
+    ('ci/cd', 'CI/CD'),
+    ('database', 'Databases'),
+    ('SQL', 'SQL'),
+]
+
+
+def _names(text):
+    return [name for _, _, name in SkillMatcher(PHRASES).find(text)]
+
+
+def test_multiword_phrases_match_as_one():
+    assert _names('Built machine learning pipelines') == ['Machine Learning']
+    assert _names('Research in deep machine learning') == ['Deep Machine Learning']
+    assert _names('A machine that keeps learning') == ['Machine', 'Learning']
+
+
+def test_overlapping_matches_are_leftmost_longest():
+    matcher = SkillMatcher(PHRASES)
+    assert matcher.find('deep machine learning') == [(0, 2, 'Deep Machine Learning')]
+    assert matcher.find('machine learning machine') == [(0, 1, 'Machine Learning'), (2, 2, 'Machine')]
+
+
+def test_word_boundaries_and_punctuation():
+    assert _names('Node.js services and CI/CD') == ['Node.js', 'CI/CD']
+    assert _names('nodejs, node js, cicd, mysql, SQLite') == []
+    assert _names('machine-learning') == ['Machine Learning']
+
+
+def test_plurals_fold_to_the_pattern():
+    assert tokenize('Databases') == ['database']
+    assert _names('Relational databases and SQL') == ['Databases', 'SQL']
+
+
+def test_extract_skills_ranks_by_mentions():
+    text = 'SQL reports, SQL tuning and some Python; also machine learning.'
+    skills = extract_skills_from_text(text)
+    assert skills[0] == 'SQL'
+    assert {'Python', 'Machine Learning'} <= set(skills)
+    assert extract_skills_from_text('') == []
+
+
+def test_extract_skills_limit():
+    text = 'SQL, Python and machine learning'
+    assert len(extract_skills_from_text(text, limit=None)) >= 3
+    assert len(extract_skills_from_text(text, limit=2)) == 2
+    assert extract_skills_from_text(text, limit=0) == []